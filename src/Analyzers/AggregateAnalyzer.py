@@ -0,0 +1,45 @@
+import pandas as pd
+from Utils.LoggerUtil import LoggerUtil
+from Utils.ProfilerUtil import ProfilerUtil
+from Analyzers.Analyzer import Analyzer
+from File.SynthesisConfigFile import SynthesisConfigFile
+from Synthesizers.IncrementalAggregator import IncrementalAggregator
+
+logger = LoggerUtil.instance()
+profiler = ProfilerUtil.instance()
+
+
+class AggregateAnalyzer(Analyzer):
+    """
+    A class for predicting leaks of payloads from the aggregate counts of the (poisoned) sensitive dataset, without
+        generating synthetic microdata. In the row-seeded synthesis, an injected payload is synthesized whole if every
+        combination (up to reporting_length) of its values meets the reporting_resolution.
+    """
+
+    def __init__(self, synthesis_config_file: SynthesisConfigFile, aggregator: IncrementalAggregator):
+        """
+        Initializes an AggregateAnalyzer using a synthesis_config_file and an (up to date) IncrementalAggregator of its
+            sensitive dataset.
+        """
+        super().__init__(synthesis_config_file)
+        self.aggregator = aggregator
+
+    @profiler.timed("leak_prediction")
+    def analyze(self, payload: pd.DataFrame):
+        """
+        Predicts whether the given payload leaks in a row-seeded synthesis of the sensitive dataset.
+
+        :param payload: dataframe
+        :return: boolean
+        """
+        return self.aggregator.is_reportable(payload.iloc[0])
+
+    @profiler.timed("leak_prediction")
+    def analyze_batch(self, payloads: list):
+        """
+        Predicts which of the given payloads leak in a row-seeded synthesis of the sensitive dataset.
+
+        :param payloads: list of dataframes
+        :return: list of booleans
+        """
+        return [self.aggregator.is_reportable(payload.iloc[0]) for payload in payloads]
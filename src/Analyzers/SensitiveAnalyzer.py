@@ -1,15 +1,27 @@
+import numpy as np
 import pandas as pd
 from Utils.LoggerUtil import LoggerUtil
+from Utils.ConfigUtil import ConfigUtil
+from Utils.ProfilerUtil import ProfilerUtil
+from Utils.DtypeUtil import DtypeUtil
 from Analyzers.Analyzer import Analyzer
 from File.SensitiveDatasetFile import SensitiveDatasetFile
 
 logger = LoggerUtil.instance()
+config = ConfigUtil.instance()
+profiler = ProfilerUtil.instance()
 
 
 class SensitiveAnalyzer(Analyzer):
 
-    def __init__(self, sensitive_dataset_file: SensitiveDatasetFile):
+    def __init__(self, sensitive_dataset_file: SensitiveDatasetFile, compact=None):
+        """
+        Initializes a SensitiveAnalyzer on the sensitive_dataset_file. If compact is set, the data types determined are
+            the narrowest lossless data types of the columns (see DtypeUtil), rather than their current data types;
+            defaults to the compact_dtypes configuration.
+        """
         super().__init__(sensitive_dataset_file)
+        self.compact = compact if compact is not None else config["SENSITIVE"].getboolean("compact_dtypes")
 
     def __determine_data_types(self, data: pd.DataFrame):
         """
@@ -20,9 +32,9 @@ class SensitiveAnalyzer(Analyzer):
         """
         df = pd.DataFrame(columns=data.columns)
 
-        # Iterate each column, inserting their datatype into the dataframe
+        # Iterate each column, inserting their (compact) datatype into the dataframe
         for col in data.columns:
-            df.loc["type", col] = data[col].dtype
+            df.loc["type", col] = DtypeUtil.compact_dtype(data[col]) if self.compact else data[col].dtype
 
         return df
 
@@ -40,11 +52,27 @@ class SensitiveAnalyzer(Analyzer):
         # Get whether any column takes on NaN values
         df.loc["has_NaN"] = data.isna().any()
 
-        # Get minimum and maximum values and insert them into the dataframe
-        ranges = data.agg(["min", "max"])
+        # Get minimum and maximum values and insert them into the dataframe (categoricals are unordered, and are
+        # therefore ranged as their values)
+        categoricals = [col for col in data.columns if isinstance(data[col].dtype, pd.CategoricalDtype)]
+        data = data.astype({col: object for col in categoricals})
+        objects = [col for col in data.columns if pd.api.types.is_object_dtype(data[col].dtype)]
+        ranges = pd.DataFrame(index=["min", "max"], columns=data.columns)
+        if len(objects) < data.shape[1]:
+            ranges.update(data.drop(objects, axis=1).agg(["min", "max"]))
+
+        # Values of object columns may not be comparable with each other (e.g. strings and numbers), these columns are
+        # therefore ranged by the string representations of their (non-missing) values if needed
+        for col in objects:
+            values = data[col].dropna()
+            if not values.map(type).eq(str).all():
+                values = values.astype(str)
+            if values.shape[0] > 0:
+                ranges[col] = [values.min(), values.max()]
 
         return pd.concat([df, ranges])
 
+    @profiler.timed("sensitive_analysis")
     def analyze(self, data: pd.DataFrame):
         """
         Performs analysis of the given sample on ranges of values and data types.
@@ -55,3 +83,32 @@ class SensitiveAnalyzer(Analyzer):
         df1 = self.__determine_data_types(data)
         df2 = self.__determine_data_ranges(data)
         return pd.concat([df1, df2])
+
+    @staticmethod
+    def schema(sensitive_analysis: pd.DataFrame):
+        """
+        Returns the schema of the analyzed sample; the data type of each column, e.g. for reading datasets later.
+
+        :param sensitive_analysis: dataframe
+        :return: dictionary mapping columns to data types
+        """
+        return dict(sensitive_analysis.loc["type"])
+
+    @staticmethod
+    def histogram(data: pd.DataFrame, col: str):
+        """
+        Returns the histogram of the values of the given column in the sample; the number of occurrences of each value,
+            ascending by value (as floats for numerical columns, as strings otherwise) and without missing values.
+
+        :param data: dataframe
+        :param col: string
+        :return: series
+        """
+        column = data[col]
+        if pd.api.types.is_numeric_dtype(column.dtype) and not pd.api.types.is_bool_dtype(column.dtype):
+            values = pd.to_numeric(column, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+            return pd.Series(values[~np.isnan(values)], dtype=np.float64).value_counts().sort_index()
+
+        # Values of other columns (e.g. strings and categoricals) are ordered by their string representation
+        histogram = column.dropna().astype(object).value_counts()
+        return histogram.sort_index(key=lambda index: index.astype(str))
@@ -1,31 +1,166 @@
+import numpy as np
 import pandas as pd
 from Utils.LoggerUtil import LoggerUtil
+from Utils.ConfigUtil import ConfigUtil
+from Utils.ProfilerUtil import ProfilerUtil
 from Analyzers.Analyzer import Analyzer
 from File.SyntheticDatasetFile import SyntheticDatasetFile
 
 logger = LoggerUtil.instance()
+config = ConfigUtil.instance()
+profiler = ProfilerUtil.instance()
 
 
 class SyntheticAnalyzer(Analyzer):
 
-    def __init__(self, synthetic_dataset_file: SyntheticDatasetFile):
+    def __init__(self, synthetic_dataset_file: SyntheticDatasetFile, streaming=None):
+        """
+        Initializes a SyntheticAnalyzer of the synthetic_dataset_file. If streaming is set (defaulting to the
+            [SYNTHETIC] streaming configuration), leaks are determined by scanning the synthetic dataset in chunks
+            rather than by indexing it as a whole.
+        """
         super().__init__(synthetic_dataset_file)
+        self.streaming = streaming if streaming is not None else config["SYNTHETIC"].getboolean("streaming")
+
+        # Hashed indices of the synthetic dataset's rows, keyed by the columns they are built on
+        self.__indices = {}
 
-    def __determine_leak(self, payload_data: pd.Series):
+    @staticmethod
+    def __normalize(dataset: pd.DataFrame, numerical: pd.Series):
         """
-        Determines if the given payload resulted in a leak in the synthetic dataset.
+        Normalizes the columns of a dataset such that equal values hash equally regardless of their data type.
+        Numerical columns are cast to float64 (with NaN replaced by zero and recorded in a separate mask column), other
+            columns to strings with NaN kept as missing values.
 
-        :param payload_data: series
-        :return: boolean
+        :param dataset: dataframe
+        :param numerical: series of booleans, whether each column is numerical
+        :return: dataframe
+        """
+        normalized = {}
+        for col in dataset.columns:
+            column = dataset[col]
+            if numerical[col]:
+                # Values that are not numbers cannot match a numerical column, and are therefore mapped to infinity
+                values = pd.to_numeric(column, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+                missing = column.isna().to_numpy()
+                values[np.isnan(values) & ~missing] = np.inf
+
+                # Replace NaN by zero (and negative zero by zero) such that all missing values hash equally
+                normalized[col] = np.where(missing, 0.0, values) + 0.0
+                normalized[col + "\0missing"] = missing
+            else:
+                normalized[col] = column.astype(str).where(column.notna(), None)
+
+        return pd.DataFrame(normalized, index=dataset.index)
+
+    @staticmethod
+    def __hash(dataset: pd.DataFrame, numerical: pd.Series):
+        """
+        Hashes each row of the given dataset into a 64-bit integer after normalizing it.
+
+        :param dataset: dataframe
+        :param numerical: series of booleans, whether each column is numerical
+        :return: numpy array
+        """
+        normalized = SyntheticAnalyzer.__normalize(dataset, numerical)
+        return pd.util.hash_pandas_object(normalized, index=False).to_numpy()
+
+    @staticmethod
+    def __numerical(dataset: pd.DataFrame):
+        """
+        Determines whether each column of the given dataset is numerical; i.e. if all of its values are numbers.
+
+        :param dataset: dataframe
+        :return: series of booleans
+        """
+        return pd.Series({col: pd.to_numeric(dataset[col], errors="coerce").notna().sum() == dataset[col].notna().sum()
+                          for col in dataset.columns})
+
+    def __index(self, columns: list):
+        """
+        Returns a hashed index of the synthetic dataset's rows on the given columns, along with whether each column is
+            numerical. The index is built on first use by reading the synthetic dataset, and is None if the synthetic
+            dataset lacks any of the columns.
+
+        :param columns: list of strings
+        :return: tuple of index and series
+        """
+        key = tuple(columns)
+        if key not in self.__indices:
+            # Read the synthetic dataset
+            synthetic_dataset = self._get_file.read(is_resynthesis=True)
+
+            profiler.count("leak_indices")
+            if not set(columns).issubset(synthetic_dataset.columns):
+                self.__indices[key] = (None, None)
+            else:
+                synthetic_dataset = synthetic_dataset[columns]
+                numerical = self.__numerical(synthetic_dataset)
+
+                hashes = self.__hash(synthetic_dataset, numerical)
+                self.__indices[key] = (pd.Index(np.unique(hashes)), numerical)
+
+                logger.debug("Indexed synthetic dataset; " + str(len(hashes)) + " rows, " +
+                             str(len(self.__indices[key][0])) + " distinct")
+
+        return self.__indices[key]
+
+    def __scan(self, payload_data: pd.DataFrame):
         """
-        # Read the synthetic dataset
-        synthetic_dataset = self._get_file.read(is_resynthesis=True)
+        Determines which of the given payload rows resulted in a leak in the synthetic dataset, by streaming it in
+            chunks that only hold the payload's columns (see SyntheticDatasetFile.read_chunks) and stopping as soon as
+            every payload row was found; such that memory is bounded by the chunk_size rather than the synthetic
+            dataset. Whether a column is numerical is decided once for all chunks, from the schema of the synthetic
+            dataset if set or the data types of the payload otherwise; other columns are read as strings.
 
-        # Check if the full row exists in the synthetic dataset
-        exists = synthetic_dataset.apply(lambda row: row.equals(payload_data), axis=1).any()
+        :param payload_data: dataframe
+        :return: numpy array of booleans
+        """
+        columns = list(payload_data.columns)
+        is_leaked = np.zeros(payload_data.shape[0], dtype=bool)
+
+        schema = self._get_file.schema or {}
+        numerical = {}
+        for col in columns:
+            data_type = schema.get(col, payload_data[col].dtype)
+            numerical[col] = pd.api.types.is_numeric_dtype(data_type) and not pd.api.types.is_bool_dtype(data_type)
+        numerical = pd.Series(numerical)
+        dtype = {col: str for col in columns if not numerical[col]}
+
+        for chunk in self._get_file.read_chunks(columns, is_resynthesis=True, dtype=dtype):
+            profiler.count("leak_scan_chunks")
+            if not set(columns).issubset(chunk.columns):
+                break
 
-        return exists
+            # Look up the hashes of the payload rows not found so far in the hashes of the chunk's rows
+            chunk = chunk[columns]
+            hashes = pd.Index(np.unique(self.__hash(chunk, numerical)))
+            is_leaked[~is_leaked] = hashes.get_indexer(self.__hash(payload_data[~is_leaked], numerical)) >= 0
+            if is_leaked.all():
+                break
 
+        return is_leaked
+
+    def __determine_leaks(self, payload_data: pd.DataFrame):
+        """
+        Determines which of the given payload rows resulted in a leak in the synthetic dataset, by looking up the hash of
+            each row in the hashed index of the synthetic dataset's rows (ignoring the negligible chance of collisions),
+            or by scanning the synthetic dataset if streaming is set.
+
+        :param payload_data: dataframe
+        :return: numpy array of booleans
+        """
+        if self.streaming:
+            return self.__scan(payload_data)
+
+        index, numerical = self.__index(list(payload_data.columns))
+        if index is None:
+            return np.zeros(payload_data.shape[0], dtype=bool)
+
+        # Check if the full rows exist in the synthetic dataset
+        return index.get_indexer(self.__hash(payload_data, numerical)) >= 0
+
+    @profiler.timed("leak_check")
     def analyze(self, payload: pd.DataFrame):
         """
         Performs analysis on the synthetic dataset given a payload to determine if leaks has occurred.
@@ -33,5 +168,17 @@ class SyntheticAnalyzer(Analyzer):
         :param payload: dataframe
         :return: boolean
         """
-        payload_data = payload.iloc[0]
-        return self.__determine_leak(payload_data)
+        payload_data = payload.iloc[[0]]
+        return bool(self.__determine_leaks(payload_data)[0])
+
+    @profiler.timed("leak_check")
+    def analyze_batch(self, payloads: list):
+        """
+        Performs analysis on the synthetic dataset given several payloads to determine which of them has leaked,
+            reading and indexing the synthetic dataset only once.
+
+        :param payloads: list of dataframes
+        :return: list of booleans
+        """
+        payload_data = pd.concat([payload.iloc[[0]] for payload in payloads])
+        return [bool(is_leaked) for is_leaked in self.__determine_leaks(payload_data)]
@@ -0,0 +1,176 @@
+import time
+import numpy as np
+import pandas as pd
+from Utils.LoggerUtil import LoggerUtil
+from Utils.ConfigUtil import ConfigUtil
+from File.AttackStateFile import AttackStateFile
+from File.SensitiveDatasetFile import SensitiveDatasetFile
+from File.SynthesisConfigFile import SynthesisConfigFile
+from File.SyntheticDatasetFile import SyntheticDatasetFile
+from Analyzers.SensitiveAnalyzer import SensitiveAnalyzer
+from Synthesizers.SynthesisCache import SynthesisCache
+from Synthesizers.SDSSynthesizerFacade import SDSSynthesizerFacade
+from Synthesizers.SDSInMemorySynthesizer import SDSInMemorySynthesizer
+from Attackers.NaiveAttacker import NaiveAttacker
+from Attackers.MultiTargetAttacker import MultiTargetAttacker
+
+logger = LoggerUtil.instance()
+config = ConfigUtil.instance()
+
+
+class AttackPipeline:
+    """
+    A class for running the pipeline on a sample; writing the sensitive dataset, analyzing it, synthesizing it and
+        attacking a targeted record using the NaiveAttacker (or many targeted records using the MultiTargetAttacker).
+    """
+
+    def __init__(self, k, sensitive_attribute, known_attributes=None, synthesis_config=None):
+        """
+        Initializes an AttackPipeline given the privacy resolution, the sensitive attribute, the known attributes
+            (all non-sensitive attributes if None) and optional overrides of the synthesis configurations.
+        """
+        self.k = k
+        self.sensitive_attribute = sensitive_attribute
+        self.known_attributes = known_attributes
+        self.synthesis_config = synthesis_config if synthesis_config is not None else {}
+
+    @staticmethod
+    def __to_builtin(value):
+        """
+        Converts numpy scalars into the equivalent built-in Python values, such that results can be serialized.
+
+        :param value: object
+        :return: object
+        """
+        return value.item() if isinstance(value, np.generic) else value
+
+    def __prepare(self, sample: pd.DataFrame, attack_state_file: AttackStateFile = None):
+        """
+        Writes the given sample as the sensitive dataset, analyzes it and synthesizes it; returns the sensitive and
+            synthetic dataset files, the sensitive analysis and the synthesizer. If an attack_state_file is given, the
+            results of the synthesis are kept with it, and restored from it when the attack is resumed.
+
+        :param sample: dataframe
+        :param attack_state_file: AttackStateFile
+        :return: tuple of SensitiveDatasetFile, SyntheticDatasetFile, dataframe and SDSSynthesizerFacade
+        """
+        # Whether datasets are held in memory during synthesis, instead of being passed through files
+        in_memory = config["GENERAL"].getboolean("in_memory")
+
+        # Create the file objects (generates directories and files at root)
+        sensitive_dataset_file = SensitiveDatasetFile(in_memory=in_memory)
+        synthetic_dataset_file = SyntheticDatasetFile(in_memory=in_memory)
+
+        # Create sensitive dataset
+        sensitive_dataset_file.write(sample)
+
+        # Perform analysis on the sensitive dataset to determine properties
+        sensitive_analyzer = SensitiveAnalyzer(sensitive_dataset_file)
+        sensitive_analysis = sensitive_analyzer.analyze(sample)
+
+        # Read the datasets with the compact data types of the analysis, if determined
+        if sensitive_analyzer.compact:
+            schema = SensitiveAnalyzer.schema(sensitive_analysis)
+            sensitive_dataset_file.schema = schema
+            synthetic_dataset_file.schema = schema
+
+        # Create synthesis configuration
+        synthesis_config_file = SynthesisConfigFile(sensitive_dataset_file, synthetic_dataset_file)
+        synthesis_config_file.write({"reporting_resolution": self.k, "synthesis_mode": "row_seeded",
+                                     **self.synthesis_config})
+
+        # Create synthetic dataset
+        if in_memory:
+            synthesizer = SDSInMemorySynthesizer(synthesis_config_file)
+        else:
+            synthesizer = SDSSynthesizerFacade(synthesis_config_file)
+        cache = SynthesisCache(cache_dir=attack_state_file.synthesis_dir) if attack_state_file is not None else None
+        synthesizer.synthesize(aggregate=True, generate=True, cache=cache)
+
+        return sensitive_dataset_file, synthetic_dataset_file, sensitive_analysis, synthesizer
+
+    def __result(self, sample: pd.DataFrame, target_index: int, k: int, sensitive_values: list, syntheses: int,
+                 start: float):
+        """
+        Returns the result of the attack on the record at target_index (see run).
+
+        :param sample: dataframe
+        :param target_index: int
+        :param k: int
+        :param sensitive_values: list of objects
+        :param syntheses: int
+        :param start: float, the start time of the attack (see time.perf_counter)
+        :return: dictionary
+        """
+        # The attack succeeded if the true sensitive value is the only value found (NaN if the value is missing)
+        true_value = sample[self.sensitive_attribute].iloc[target_index]
+        is_vulnerable = len(sensitive_values) == 1 and (sensitive_values[0] == true_value or
+                                                        (pd.isna(sensitive_values[0]) and pd.isna(true_value)))
+
+        return {
+            "target_index": target_index,
+            "true_value": self.__to_builtin(true_value),
+            "k": k,
+            "sensitive_values": [self.__to_builtin(value) for value in sensitive_values],
+            "is_vulnerable": bool(is_vulnerable),
+            "syntheses": syntheses,
+            "seconds": round(time.perf_counter() - start, 3)
+        }
+
+    def run(self, sample: pd.DataFrame, target_index=0, k_search=None, value_batch_size=None,
+            attack_state_file: AttackStateFile = None):
+        """
+        Runs the pipeline on the given sample, attacking the record at target_index, and returns the result of the
+            attack; the targeted record's position and true sensitive value, the found k and sensitive value(s), whether
+            the true sensitive value was uniquely found, the number of syntheses and the wall time in seconds.
+        Files are generated in the directories at the configured root_dir. If an attack_state_file is given, the
+            progress of the attack is recorded in it, resuming the attack it holds (see NaiveAttacker).
+
+        :param sample: dataframe
+        :param target_index: int
+        :param k_search: string
+        :param value_batch_size: int
+        :param attack_state_file: AttackStateFile
+        :return: dictionary
+        """
+        start = time.perf_counter()
+        sensitive_dataset_file, synthetic_dataset_file, sensitive_analysis, synthesizer = \
+            self.__prepare(sample, attack_state_file)
+
+        # Perform attack-loop to bruteforce k and the sensitive value by data poisoning
+        naive_attacker = NaiveAttacker(sensitive_dataset_file, synthetic_dataset_file, sensitive_analysis, synthesizer,
+                                       attack_state_file=attack_state_file)
+        result = naive_attacker.attack_loop(sensitive_col=self.sensitive_attribute, known_cols=self.known_attributes,
+                                            k_search=k_search, value_batch_size=value_batch_size,
+                                            target_index=target_index)
+        if result is None:
+            raise ValueError("sensitive_attribute=" + self.sensitive_attribute + " cannot be attacked")
+        sensitive_values, k = result
+
+        return self.__result(sample, target_index, k, sensitive_values, synthesizer.rounds, start)
+
+    def run_targets(self, sample: pd.DataFrame, target_indices: list, k_search=None):
+        """
+        Runs the pipeline on the given sample, attacking the records at target_indices at once using the
+            MultiTargetAttacker, and returns the result of the attack of each target (see run); the number of
+            syntheses and the wall time are those of the whole attack, shared by the targets.
+
+        :param sample: dataframe
+        :param target_indices: list of ints
+        :param k_search: string
+        :return: list of dictionaries
+        """
+        start = time.perf_counter()
+        sensitive_dataset_file, synthetic_dataset_file, sensitive_analysis, synthesizer = self.__prepare(sample)
+
+        # Perform the attack on all targets, sharing the syntheses of k and of the sensitive values
+        multi_target_attacker = MultiTargetAttacker(sensitive_dataset_file, synthetic_dataset_file, sensitive_analysis,
+                                                    synthesizer)
+        result = multi_target_attacker.attack_targets(self.sensitive_attribute, target_indices,
+                                                      known_cols=self.known_attributes, k_search=k_search)
+        if result is None:
+            raise ValueError("sensitive_attribute=" + self.sensitive_attribute + " cannot be attacked")
+        sensitive_values, k = result
+
+        return [self.__result(sample, target_index, k, values, synthesizer.rounds, start)
+                for target_index, values in zip(target_indices, sensitive_values)]
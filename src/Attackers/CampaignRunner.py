@@ -0,0 +1,156 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+from Utils.LoggerUtil import LoggerUtil
+from Utils.ConfigUtil import ConfigUtil
+from Utils.ProfilerUtil import ProfilerUtil
+from Utils.WorkspaceUtil import WorkspaceUtil
+from File.CampaignReportFile import CampaignReportFile
+from Attackers.AttackPipeline import AttackPipeline
+
+logger = LoggerUtil.instance()
+config = ConfigUtil.instance()
+profiler = ProfilerUtil.instance()
+
+# The sample attacked by the workers of the current process pool (set once per worker by the pool's initializer)
+_sample = None
+
+
+class CampaignRunner:
+    """
+    A class for attack campaigns; attacking many targeted records of the same sample, each in its own process and
+        workspace, and aggregating the results into a single report to measure how many records are vulnerable.
+        In multi-target campaigns, the targets are instead divided between the processes, each attacking its targets
+        at once (see MultiTargetAttacker).
+    """
+
+    def __init__(self, k, sensitive_attribute, known_attributes=None, workers=None, k_search=None,
+                 value_batch_size=None, multi_target=None):
+        """
+        Initializes a CampaignRunner given the privacy resolution, the sensitive attribute, the known attributes (all
+            non-sensitive attributes if None) and the number of worker processes (the number of cores if None).
+        If multi_target is set, each worker attacks its share of the targets at once; defaults to the multi_target
+            configuration.
+        Throws: ValueError, if multi_target is set along with a value_batch_size, speculative_workers or value_buckets
+            greater than one; multi-target campaigns probe a single potential value per target and round.
+        """
+        self.k = k
+        self.sensitive_attribute = sensitive_attribute
+        self.known_attributes = known_attributes
+        self.workers = workers if workers is not None else os.cpu_count()
+        self.k_search = k_search
+        self.value_batch_size = value_batch_size
+        self.multi_target = multi_target if multi_target is not None else config["ATTACK"].getboolean("multi_target")
+
+        if self.multi_target:
+            options = {"value_batch_size": value_batch_size if value_batch_size is not None else
+                       config["ATTACK"].getint("value_batch_size"),
+                       "speculative_workers": config["ATTACK"].getint("speculative_workers"),
+                       "value_buckets": config["ATTACK"].getint("value_buckets")}
+            unsupported = [name + "=" + str(value) for name, value in options.items() if value > 1]
+            if len(unsupported) > 0:
+                raise ValueError(", ".join(unsupported) + " cannot be used in multi-target campaigns, which probe a "
+                                 "single potential value per target and round")
+
+    @staticmethod
+    def _initialize_worker(sample: pd.DataFrame):
+        """
+        Initializes a worker process of the pool with the sample to attack.
+
+        :param sample: dataframe
+        """
+        global _sample
+        _sample = sample
+
+    @staticmethod
+    def _attack_target(pipeline: AttackPipeline, campaign: str, target_index: int, k_search, value_batch_size):
+        """
+        Attacks a single targeted record of the worker's sample in a workspace of its own, and returns the result.
+
+        :param pipeline: AttackPipeline
+        :param campaign: string
+        :param target_index: int
+        :param k_search: string
+        :param value_batch_size: int
+        :return: dictionary
+        """
+        profiler.reset()
+        WorkspaceUtil.isolate(campaign, "target_" + str(target_index))
+        return pipeline.run(_sample, target_index=target_index, k_search=k_search, value_batch_size=value_batch_size)
+
+    @staticmethod
+    def _attack_targets(pipeline: AttackPipeline, campaign: str, target_indices: list, k_search):
+        """
+        Attacks several targeted records of the worker's sample at once in a workspace of its own, and returns the
+            result of each target.
+
+        :param pipeline: AttackPipeline
+        :param campaign: string
+        :param target_indices: list of ints
+        :param k_search: string
+        :return: list of dictionaries
+        """
+        profiler.reset()
+        WorkspaceUtil.isolate(campaign, "targets_" + str(target_indices[0]))
+        return pipeline.run_targets(_sample, target_indices, k_search=k_search)
+
+    def run(self, sample: pd.DataFrame, targets=None):
+        """
+        Attacks the records at the given positions of the sample (all records if None) using a pool of worker
+            processes, writes the aggregated results to a CampaignReportFile and returns them.
+
+        :param sample: dataframe
+        :param targets: list of int
+        :return: dataframe
+        """
+        if targets is None:
+            targets = range(sample.shape[0])
+        targets = list(targets)
+
+        # Divide the cores between the workers, such that SDS's own parallel jobs do not oversubscribe them
+        parallel_jobs = max(1, (os.cpu_count() or 1) // self.workers)
+        pipeline = AttackPipeline(self.k, self.sensitive_attribute, self.known_attributes,
+                                  synthesis_config={"parallel_jobs": parallel_jobs})
+
+        campaign = "Campaign_" + config["GENERAL"]["name"]
+        logger.info("Starting campaign; attacking " + str(len(targets)) + " targets using " + str(self.workers) +
+                    " workers")
+
+        start = time.perf_counter()
+        results = []
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=CampaignRunner._initialize_worker,
+                                 initargs=(sample,)) as executor:
+            if self.multi_target:
+                # Divide the targets between the workers, each attacking its share at once
+                shares = [share.tolist() for share in np.array_split(np.array(targets, dtype=int), self.workers)
+                          if len(share) > 0]
+                futures = {executor.submit(CampaignRunner._attack_targets, pipeline, campaign, share,
+                                           self.k_search): share for share in shares}
+            else:
+                futures = {executor.submit(CampaignRunner._attack_target, pipeline, campaign, target_index,
+                                           self.k_search, self.value_batch_size): [target_index]
+                           for target_index in targets}
+
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                    results += result if isinstance(result, list) else [result]
+                except Exception as exception:
+                    logger.error("Failed to attack targets " + str(futures[future]) + "; " + repr(exception))
+                    results += [{"target_index": target_index, "error": repr(exception)}
+                                for target_index in futures[future]]
+
+        report = pd.DataFrame(results).sort_values("target_index").reset_index(drop=True)
+        elapsed = time.perf_counter() - start
+
+        # Write the report to the campaign's file
+        CampaignReportFile().write(report)
+
+        vulnerable = int(report["is_vulnerable"].fillna(False).sum()) if "is_vulnerable" in report else 0
+        logger.info("Completed campaign; " + str(vulnerable) + " of " + str(len(targets)) + " targets vulnerable (" +
+                    str(round(100 * vulnerable / max(1, len(targets)), 2)) + "%), in " + str(round(elapsed, 2)) +
+                    " seconds (" + str(round(len(targets) / elapsed, 2)) + " targets per second)")
+
+        return report
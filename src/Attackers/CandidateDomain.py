@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+from Utils.LoggerUtil import LoggerUtil
+from Utils.ConfigUtil import ConfigUtil
+from Analyzers.SensitiveAnalyzer import SensitiveAnalyzer
+
+logger = LoggerUtil.instance()
+config = ConfigUtil.instance()
+
+
+class CandidateDomain:
+    """
+    A class for the domain of potential sensitive values of a column, as analyzed in the sensitive dataset. Integral
+        numerical columns are enumerated as the range of integers between their minimum and maximum ('range'), unless
+        the range is wider than MAX_RANGE; other columns (floats, strings and categoricals) are enumerated as their
+        distinct observed values ('observed'). The values are held as a single numpy array of the column's value type,
+        along with their number of occurrences in the sensitive dataset, such that the number of candidates is driven
+        by the cardinality of the domain rather than its numerical range.
+
+    Methods: keys(), sort(), outside(), quantiles()
+    """
+    # The domains in which candidates can be enumerated
+    KINDS = ("range", "observed")
+
+    # The maximum number of values of range domains, beyond which the observed values are enumerated instead
+    MAX_RANGE = 1 << 20
+
+    def __init__(self, sensitive_analysis: pd.DataFrame, sensitive_dataset: pd.DataFrame, sensitive_col: str,
+                 kind=None):
+        """
+        Initializes the CandidateDomain of the sensitive_col, given the sensitive dataset (before any injections). The
+            kind of domain defaults to the value_domain configuration, and falls back to 'observed' for columns whose
+            values are not integral.
+        """
+        if kind is None:
+            kind = config["ATTACK"]["value_domain"]
+        if kind not in self.KINDS:
+            raise ValueError("kind=" + str(kind) + " must be either 'range' or 'observed'")
+
+        data_type = sensitive_analysis.at["type", sensitive_col]
+        self.sensitive_col = sensitive_col
+        self.is_numerical = pd.api.types.is_numeric_dtype(data_type) and not pd.api.types.is_bool_dtype(data_type)
+        self.value_type = np.int64 if pd.api.types.is_integer_dtype(data_type) else np.float64
+
+        # Get the number of occurrences of each observed value, ascending by value
+        histogram = SensitiveAnalyzer.histogram(sensitive_dataset, sensitive_col)
+
+        # Determine whether the domain can be enumerated as a range of integers
+        if kind == "range" and self.is_numerical and histogram.shape[0] > 0:
+            observed = histogram.index.to_numpy(dtype=np.float64)
+            minimum = self.value_type(sensitive_analysis.at["min", sensitive_col])
+            maximum = self.value_type(sensitive_analysis.at["max", sensitive_col])
+            if not np.array_equal(observed, np.floor(observed)) or maximum - minimum + 1 > self.MAX_RANGE:
+                kind = "observed"
+        elif kind == "range":
+            kind = "observed"
+        self.kind = kind
+
+        if kind == "range":
+            self.values = np.arange(minimum, maximum + 1)
+            self.counts = histogram.reindex(self.values.astype(np.float64), fill_value=0).to_numpy(dtype=np.int64)
+        else:
+            self.values = histogram.index.to_numpy(dtype=self.value_type if self.is_numerical else object)
+            self.counts = histogram.to_numpy(dtype=np.int64)
+
+        logger.debug("Determined domain of sensitive column; " + sensitive_col + " has " + str(len(self.values)) +
+                     " " + kind + " values")
+
+    def keys(self, values):
+        """
+        Returns the keys by which the given values are matched to the values of the domain (e.g. the values read from
+            the synthetic dataset); floats for numerical domains, strings otherwise.
+
+        :param values: list or array of objects
+        :return: index
+        """
+        if self.is_numerical:
+            return pd.Index(pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype=np.float64))
+        return pd.Index(pd.Series(values, dtype=object).astype(str))
+
+    def sort(self, values):
+        """
+        Returns the given values of the domain in the order of the domain.
+
+        :param values: list of objects
+        :return: list of objects
+        """
+        positions = pd.Index(self.keys(self.values)).get_indexer(self.keys(values))
+        return [value for _, value in sorted(zip(positions.tolist(), values), key=lambda pair: pair[0])]
+
+    def outside(self):
+        """
+        Returns a value outside the domain, e.g. to inject payloads that cannot collide with records of the sensitive
+            dataset; one below the minimum of numerical domains, or a string that is not a value of other domains.
+
+        :return: object
+        """
+        if self.is_numerical:
+            return self.value_type(self.values.min()) - 1 if len(self.values) > 0 else self.value_type(-1)
+
+        keys = set(self.keys(self.values))
+        value = "OUTSIDE_DOMAIN"
+        while value in keys:
+            value += "_"
+        return value
+
+    @staticmethod
+    def quantiles(weights, parts: int):
+        """
+        Splits the positions of the given weights into (at most) parts contiguous buckets of approximately equal total
+            weight, e.g. equal prior probability; uniform weights are split into buckets of equal size, as are weights
+            that would not be split at all (e.g. concentrated on the first position). Returns the start and stop
+            positions of each non-empty bucket.
+
+        :param weights: list or array of numerical
+        :param parts: int
+        :return: list of tuples of ints
+        """
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.sum() <= 0:
+            weights = np.ones(weights.shape[0])
+
+        cumulative = np.cumsum(weights)
+        bounds = np.searchsorted(cumulative, cumulative[-1] * np.arange(1, parts) / parts, side="right") \
+            if weights.shape[0] > 0 else np.array([], dtype=np.intp)
+        bounds = [0] + sorted(set(bound for bound in bounds.tolist() if 0 < bound < weights.shape[0])) + \
+            [weights.shape[0]]
+        buckets = [(start, stop) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+        if len(buckets) < 2 <= min(parts, weights.shape[0]) and np.any(weights != weights[0]):
+            return CandidateDomain.quantiles(np.ones(weights.shape[0]), parts)
+        return buckets
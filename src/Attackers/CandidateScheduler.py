@@ -0,0 +1,247 @@
+import numpy as np
+import pandas as pd
+from Utils.LoggerUtil import LoggerUtil
+from Utils.ConfigUtil import ConfigUtil
+from Analyzers.SensitiveAnalyzer import SensitiveAnalyzer
+from Attackers.CandidateDomain import CandidateDomain
+
+logger = LoggerUtil.instance()
+config = ConfigUtil.instance()
+
+
+class CandidateScheduler:
+    """
+    A class for scheduling the potential sensitive values of a target, enumerated from the domain of the sensitive
+        column (see CandidateDomain). The prior probability of each value is estimated from the histogram of the
+        sensitive column in the sensitive dataset, and from the values of the synthetic dataset (those of the rows
+        matching the known data of the target, or all rows if none match). Values are either probed in the order of the
+        domain ('range'), or by descending prior probability ('prior'), in which case values that do not occur in the
+        sensitive dataset (and therefore cannot be the target's) are skipped.
+    As leaks are observed, the confidence that the true value is among the leaked values is updated, such that probing
+        can stop once it reaches the target confidence (see confidence()).
+
+    Methods: uses_priors(), encode(), candidates(), priors(), sort(), observe(), confidence(), is_confident()
+    """
+    # The orders in which candidates can be probed
+    ORDERS = ("range", "prior")
+
+    def __init__(self, sensitive_analysis: pd.DataFrame, sensitive_dataset: pd.DataFrame,
+                 synthetic_dataset: pd.DataFrame, known_data: pd.Series, sensitive_col: str, order=None,
+                 target_confidence=None, domain=None, encoded_synthetic=None):
+        """
+        Initializes a CandidateScheduler for the target with the given known_data, given the sensitive (before any
+            injections) and synthetic datasets. The order and target_confidence default to the candidate_order and
+            value_confidence configurations; probing stops early only if target_confidence is below one. The domain
+            defaults to the CandidateDomain of the sensitive column in the sensitive dataset. The synthetic dataset may be
+            None (see uses_priors), in which case the priors are estimated from the sensitive dataset alone. The known
+            columns of the synthetic dataset are matched as encoded by encode(), which the schedulers of many targets
+            can share (encoding the target's known columns if encoded_synthetic is None).
+        """
+        if order is None:
+            order = config["ATTACK"]["candidate_order"]
+        if order not in self.ORDERS:
+            raise ValueError("order=" + str(order) + " must be either 'range' or 'prior'")
+        if target_confidence is None:
+            target_confidence = config["ATTACK"].getfloat("value_confidence")
+        self.order = order
+        self.target_confidence = target_confidence
+
+        # Determine the domain of values, as the bruteforce would iterate it
+        if domain is None:
+            domain = CandidateDomain(sensitive_analysis, sensitive_dataset, sensitive_col)
+        self.domain = domain
+        values = domain.values
+
+        # Estimate the prior probability of each value of the domain, matching synthetic values by their keys
+        priors = self.__normalize(domain.counts)
+        synthetic_histogram = self.__synthetic_histogram(synthetic_dataset, known_data, sensitive_col,
+                                                         encoded_synthetic)
+        if synthetic_histogram.sum() > 0:
+            synthetic_counts = synthetic_histogram.groupby(domain.keys(synthetic_histogram.index)).sum()
+            synthetic_priors = synthetic_counts.reindex(domain.keys(values), fill_value=0).to_numpy()
+            priors = self.__normalize(priors + self.__normalize(synthetic_priors) * (priors > 0))
+
+        if order == "prior":
+            # Skip the gaps in the observed support, and probe the most likely values first (ties in the range's order)
+            supported = np.flatnonzero(priors > 0)
+            ranking = supported[np.argsort(-priors[supported], kind="stable")]
+            values, priors = values[ranking], priors[ranking]
+
+        self.__candidates = values
+        self.__priors = priors
+        self.__positions = domain.keys(values)
+
+        # Whether each candidate was probed and leaked
+        self.__probed = np.zeros(len(values), dtype=bool)
+        self.__leaked = np.zeros(len(values), dtype=bool)
+
+        logger.debug("Scheduled candidates; " + str(len(values)) + " potential values in " + order + " order")
+
+    @staticmethod
+    def uses_priors(order=None, target_confidence=None, buckets=None):
+        """
+        Checks whether the prior probabilities of the candidates inform the attack; to probe them by descending prior
+            probability, to stop once confident, or to weigh the quantile buckets of a bucketed search. The order,
+            target_confidence and buckets default to the candidate_order, value_confidence and value_buckets
+            configurations. Otherwise the synthetic dataset need not be read to schedule the candidates.
+
+        :param order: string
+        :param target_confidence: float
+        :param buckets: int
+        :return: boolean
+        """
+        if order is None:
+            order = config["ATTACK"]["candidate_order"]
+        if target_confidence is None:
+            target_confidence = config["ATTACK"].getfloat("value_confidence")
+        if buckets is None:
+            buckets = config["ATTACK"].getint("value_buckets")
+        return order == "prior" or target_confidence < 1 or buckets > 1
+
+    @staticmethod
+    def __known_values(known_data: pd.Series, sensitive_col: str):
+        """
+        Returns the values of the target on its known columns (skipping the sensitive column and unknown values).
+
+        :param known_data: series
+        :param sensitive_col: string
+        :return: series
+        """
+        known_data = known_data.drop(sensitive_col)
+        return known_data[[not pd.isna(value) and not (isinstance(value, str) and value == "N")
+                           for value in known_data]]
+
+    @staticmethod
+    def encode(synthetic_dataset: pd.DataFrame, columns):
+        """
+        Encodes the given columns of the synthetic dataset (those it holds) for matching the known values of targets;
+            the values of each column are factorized by their string representation (as types may differ), such that
+            each target compares integer codes and the columns are only converted once for many targets.
+
+        :param synthetic_dataset: dataframe
+        :param columns: list of strings
+        :return: dictionary of tuples of a numpy array of codes and an index of strings
+        """
+        return {col: pd.factorize(synthetic_dataset[col].astype(str)) for col in columns
+                if col in synthetic_dataset.columns}
+
+    @staticmethod
+    def __normalize(weights: np.ndarray):
+        """
+        Normalizes the given weights into probabilities (all zero if the weights are).
+
+        :param weights: numpy array
+        :return: numpy array
+        """
+        weights = weights.astype(np.float64)
+        total = weights.sum()
+        return weights / total if total > 0 else weights
+
+    @staticmethod
+    def __synthetic_histogram(synthetic_dataset: pd.DataFrame, known_data: pd.Series, sensitive_col: str,
+                              encoded_synthetic=None):
+        """
+        Returns the histogram of the sensitive column's values in the synthetic rows matching the known data of the
+            target (ignoring the unknown "N" values), or in all synthetic rows if none match. The histogram is empty if
+            the synthetic dataset lacks the sensitive column.
+
+        :param synthetic_dataset: dataframe
+        :param known_data: series
+        :param sensitive_col: string
+        :param encoded_synthetic: dictionary, the encoded known columns of the synthetic dataset (see encode)
+        :return: series
+        """
+        if synthetic_dataset is None or sensitive_col not in synthetic_dataset.columns:
+            return pd.Series(dtype=np.float64)
+
+        # Match the synthetic rows on the codes of the target's known values
+        known_values = CandidateScheduler.__known_values(known_data, sensitive_col)
+        if encoded_synthetic is None:
+            encoded_synthetic = CandidateScheduler.encode(synthetic_dataset, known_values.index)
+        is_matching = np.ones(synthetic_dataset.shape[0], dtype=bool)
+        for col, value in known_values.items():
+            if col not in encoded_synthetic:
+                continue
+            codes, uniques = encoded_synthetic[col]
+            is_matching &= codes == uniques.get_indexer([str(value)])[0]
+
+        if is_matching.any():
+            synthetic_dataset = synthetic_dataset[is_matching]
+        return SensitiveAnalyzer.histogram(synthetic_dataset, sensitive_col)
+
+    def candidates(self):
+        """
+        Returns the potential values in the order they are to be probed.
+
+        :return: numpy array
+        """
+        return self.__candidates
+
+    def __locate(self, values):
+        """
+        Returns the positions of the given values among the candidates (skipping values that are not candidates).
+
+        :param values: list or array of objects
+        :return: numpy array
+        """
+        positions = self.__positions.get_indexer(self.domain.keys(values))
+        return positions[positions >= 0]
+
+    def priors(self, values):
+        """
+        Returns the prior probabilities of the given values (zero for values that are not candidates).
+
+        :param values: list or array of objects
+        :return: numpy array
+        """
+        positions = self.__positions.get_indexer(self.domain.keys(values))
+        if len(self.__priors) < 1:
+            return np.zeros(len(positions))
+        return np.where(positions >= 0, self.__priors[positions], 0.0)
+
+    def sort(self, values):
+        """
+        Returns the given values in the order of the domain (see CandidateDomain.sort).
+
+        :param values: list of objects
+        :return: list of objects
+        """
+        return self.domain.sort(values)
+
+    def observe(self, values, leaked_values):
+        """
+        Records that the given values were probed, of which the leaked_values leaked.
+
+        :param values: list of objects
+        :param leaked_values: list of objects
+        """
+        self.__probed[self.__locate(values)] = True
+        if len(leaked_values) > 0:
+            self.__leaked[self.__locate(leaked_values)] = True
+
+    def confidence(self):
+        """
+        Returns the posterior probability that the true value is among the leaked values. The true value always leaks
+            when probed, while other values leak at a rate estimated from the probes so far (by the rule of succession,
+            assuming one of the leaks is the true value); the confidence is thus p(L) / (p(L) + f * p(U)), for the prior
+            probabilities p of the leaked (L) and unprobed (U) values and the estimated rate f of other leaks.
+
+        :return: float
+        """
+        leaks = int(self.__leaked.sum())
+        if leaks < 1:
+            return 0.0
+        leaked_mass = self.__priors[self.__leaked].sum()
+        unprobed_mass = self.__priors[~self.__probed].sum()
+        leak_rate = leaks / (int(self.__probed.sum()) + 1)
+        if leaked_mass + leak_rate * unprobed_mass <= 0:
+            return 0.0
+        return float(leaked_mass / (leaked_mass + leak_rate * unprobed_mass))
+
+    def is_confident(self):
+        """
+        Checks whether the target confidence is reached, such that the remaining values need not be probed.
+
+        :return: boolean
+        """
+        return self.target_confidence < 1 and self.confidence() >= self.target_confidence
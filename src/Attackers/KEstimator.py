@@ -0,0 +1,89 @@
+import math
+import numpy as np
+import pandas as pd
+from Utils.LoggerUtil import LoggerUtil
+from Utils.ProfilerUtil import ProfilerUtil
+from File.SynthesisConfigFile import SynthesisConfigFile
+from Synthesizers.IncrementalAggregator import IncrementalAggregator
+
+logger = LoggerUtil.instance()
+profiler = ProfilerUtil.instance()
+
+
+class KEstimator:
+    """
+    A class for estimating k (the privacy resolution) from the reportable aggregates of a synthesis, without poisoning.
+        SDS reports the count c of each combination of attribute values (up to reporting_length) with c >= k, rounded
+        down to a multiple of k. The reported counts r alone imply that k divides each r (and thus their greatest
+        common divisor), with k <= min(r). Given the exact counts of the sensitive dataset, each reported count further
+        implies r = c - c % k, and each unreported combination implies k > c; which usually leaves a single candidate.
+
+    Methods: estimate()
+    """
+
+    def __init__(self, synthesis_config_file: SynthesisConfigFile):
+        """
+        Initializes a KEstimator using the columns and reporting_length of the current configurations of the
+            synthesis_config_file.
+        """
+        self.synthesis_config_file = synthesis_config_file
+
+    def __counts(self, sensitive_dataset: pd.DataFrame, selections: pd.Series):
+        """
+        Returns the exact counts of all combinations of attribute values in the sensitive dataset, or None if they
+            cannot be matched to the given reported selections (e.g. values are formatted differently than by SDS).
+
+        :param sensitive_dataset: dataframe
+        :param selections: series of strings
+        :return: series, counts indexed by selection
+        """
+        aggregator = IncrementalAggregator(self.synthesis_config_file)
+        aggregator.fit(sensitive_dataset)
+        counts = aggregator.counts().set_index("selections")["count"]
+
+        # Every reported combination occurs in the sensitive dataset
+        if not selections.isin(counts.index).all():
+            logger.debug("Failed to match the aggregates to the sensitive dataset; estimating K from the counts only")
+            return None
+        return counts
+
+    @profiler.timed("k_estimation")
+    def estimate(self, aggregates: pd.DataFrame, sensitive_dataset: pd.DataFrame = None):
+        """
+        Returns the candidates for k consistent with the given reportable aggregates (selections and counts), and with
+            the exact counts of the sensitive dataset they were synthesized from (before any injections) if given; in
+            ascending order. Returns None if no candidate is consistent (e.g. the aggregates are noisy).
+
+        :param aggregates: dataframe
+        :param sensitive_dataset: dataframe
+        :return: list of ints
+        """
+        aggregates = aggregates[aggregates["count"] > 0]
+        if aggregates.shape[0] < 1:
+            return None
+
+        # The candidates divide every reported count
+        reported = aggregates["count"].to_numpy(dtype=np.int64)
+        divisor = math.gcd(*reported.tolist())
+        candidates = np.array(sorted({d for i in range(1, math.isqrt(divisor) + 1) if divisor % i == 0
+                                      for d in (i, divisor // i)}), dtype=np.int64)
+
+        counts = self.__counts(sensitive_dataset, aggregates["selections"]) if sensitive_dataset is not None else None
+        if counts is not None:
+            # Reported counts are the exact counts rounded down to a multiple of k
+            exact = counts.reindex(aggregates["selections"]).to_numpy(dtype=np.int64)
+            is_consistent = np.array([np.array_equal(exact - exact % d, reported) for d in candidates], dtype=bool)
+
+            # Unreported combinations are below k
+            unreported = counts[~counts.index.isin(aggregates["selections"])]
+            if unreported.shape[0] > 0:
+                is_consistent &= candidates > unreported.max()
+            candidates = candidates[is_consistent]
+
+        if len(candidates) < 1:
+            logger.warning("Failed to estimate K; no value is consistent with the aggregates")
+            return None
+
+        logger.info("Estimated K from the aggregates; " + str(len(candidates)) + " candidate(s) in [" +
+                    str(candidates[0]) + ", " + str(candidates[-1]) + "]")
+        return candidates.tolist()
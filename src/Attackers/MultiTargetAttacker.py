@@ -0,0 +1,188 @@
+import numpy as np
+import pandas as pd
+from Utils.LoggerUtil import LoggerUtil
+from Utils.ProfilerUtil import ProfilerUtil
+from Attackers.NaiveAttacker import NaiveAttacker
+from Attackers.PayloadBuilder import PayloadBuilder
+from Attackers.CandidateDomain import CandidateDomain
+from Attackers.CandidateScheduler import CandidateScheduler
+
+logger = LoggerUtil.instance()
+profiler = ProfilerUtil.instance()
+
+
+class MultiTargetAttacker(NaiveAttacker):
+    """
+    A class for attacking many targeted records of the same SDS synthesized dataset at once. k is determined once, after
+        which each round injects the payloads of a potential value of each of many targets (each with its own known
+        data), and the leaks of all payloads are attributed to their targets from a single synthetic dataset.
+    The payloads of two targets collide in the aggregates if they take the same potential value and a combination of
+        it with the known values of one target (up to reporting_length) is shared by the other; i.e. if the targets
+        agree on a known column, the reporting_length is one or either target knows no column. Colliding payloads
+        could make one another reportable (and leak), and are therefore scheduled into separate rounds.
+
+    Methods: attack_targets(), determine_sensitive_values()
+    """
+
+    def __collisions(self, known_data: list, sensitive_col):
+        """
+        Returns whether the payloads of each pair of targets collide in the aggregates when taking the same potential
+            value of the sensitive_col.
+
+        :param known_data: list of series
+        :param sensitive_col: string
+        :return: numpy array of booleans of shape (targets, targets)
+        """
+        targets = len(known_data)
+        is_agreeing = np.zeros((targets, targets), dtype=bool)
+        is_knowing = np.zeros(targets, dtype=bool)
+
+        # Compare the known values of the targets per column (as strings, as types may differ)
+        for col in known_data[0].index.drop(sensitive_col):
+            values = [data[col] for data in known_data]
+            is_known = np.array([not pd.isna(value) and not (isinstance(value, str) and value == "N")
+                                 for value in values], dtype=bool)
+            codes = pd.factorize(pd.Series([str(value) for value in values], dtype=object))[0]
+            is_agreeing |= (codes[:, None] == codes[None, :]) & is_known[:, None] & is_known[None, :]
+            is_knowing |= is_known
+
+        # Without combinations of known values, payloads only collide on the potential value itself
+        reporting_length = self.synthesizer.synthesis_config_file.configure({})["reporting_length"]
+        if reporting_length < 2:
+            is_agreeing[:, :] = True
+        return is_agreeing | ~is_knowing[:, None] | ~is_knowing[None, :]
+
+    @staticmethod
+    def __schedule_round(active: list, keys: list, probed: list, collisions: np.ndarray):
+        """
+        Schedules the payloads of a round; each active target probes its first unprobed potential value whose payload
+            does not collide with the payloads scheduled before it, if any. Returns the target and position of the
+            potential value of each payload.
+
+        :param active: list of ints, the targets with unprobed potential values
+        :param keys: list of indices, the keys of the potential values of each target (see CandidateDomain.keys)
+        :param probed: list of numpy arrays of booleans, whether each potential value of each target was probed
+        :param collisions: numpy array of booleans of shape (targets, targets)
+        :return: list of tuples of ints
+        """
+        scheduled = {}
+        assignments = []
+        for target in active:
+            for position in np.flatnonzero(~probed[target]):
+                key = keys[target][position]
+                if not any(collisions[target, other] for other in scheduled.get(key, [])):
+                    scheduled.setdefault(key, []).append(target)
+                    assignments.append((target, position))
+                    break
+        return assignments
+
+    def determine_sensitive_values(self, sensitive_col, known_data: list, k, schedulers: list):
+        """
+        A method for determining the sensitive values of many targets, given k and the sensitive attribute. Each round
+            probes a potential value of each of the targets whose payloads do not collide (see __schedule_round), in the
+            order of the target's CandidateScheduler; a target is done once its scheduler is confident or all its
+            potential values are probed.
+
+        :param sensitive_col: string
+        :param known_data: list of series
+        :param k: int
+        :param schedulers: list of CandidateSchedulers
+        :return: list of lists of objects
+        """
+        logger.info("Commencing attack; Injecting poisoned data to find the sensitive values of " +
+                    str(len(known_data)) + " targets...")
+
+        # Ensure that k > 1 - otherwise the sensitive values should already be leaked
+        if k < 2:
+            logger.warning("Potential error; Found K=" + str(k) + ", the sensitive values should already be leaked...")
+            return [[] for _ in known_data]
+
+        # Keep track of the number of syntheses used to find the sensitive values
+        initial_rounds = self.synthesizer.rounds
+
+        collisions = self.__collisions(known_data, sensitive_col)
+        builders = [PayloadBuilder(self.sensitive_analysis, data, sensitive_col) for data in known_data]
+        candidates = [scheduler.candidates() for scheduler in schedulers]
+        keys = [scheduler.domain.keys(values) for scheduler, values in zip(schedulers, candidates)]
+        probed = [np.zeros(len(values), dtype=bool) for values in candidates]
+        leaked = [[] for _ in known_data]
+
+        active = [target for target in range(len(known_data)) if len(candidates[target]) > 0]
+        payload_count = 0
+        while len(active) > 0:
+            assignments = self.__schedule_round(active, keys, probed, collisions)
+
+            # Inject the payloads of all scheduled targets at once, and attribute their leaks to the targets
+            values = [candidates[target][position] for target, position in assignments]
+            payloads = [builders[target].build([value], k - 1) for (target, _), value in zip(assignments, values)]
+            leaks = self.probe_payloads(pd.concat(payloads), payloads, values)
+            payload_count += len(payloads)
+
+            for (target, position), value, is_leaked in zip(assignments, values, leaks):
+                probed[target][position] = True
+                schedulers[target].observe([value], [value] if is_leaked else [])
+                if is_leaked:
+                    leaked[target].append(value)
+
+            logger.debug("Probed " + str(len(payloads)) + " payloads of " + str(len(active)) + " targets in a round")
+            active = [target for target in active if not probed[target].all() and not schedulers[target].is_confident()]
+
+        profiler.count("multi_target_payloads", payload_count)
+
+        # Report the values found in the order of the domain; if none are found, it must be because it is NaN
+        sensitive_values = [scheduler.sort(values) if len(values) > 0 else [np.nan]
+                            for scheduler, values in zip(schedulers, leaked)]
+
+        logger.info("Successful attack; found the sensitive values of " + str(len(known_data)) + " targets using " +
+                    str(self.synthesizer.rounds - initial_rounds) + " syntheses (" + str(payload_count) +
+                    " payloads)")
+        return sensitive_values
+
+    def attack_targets(self, sensitive_col, target_indices: list, known_cols=None, k_search=None):
+        """
+        A method that combines preparation, determination of k and determination of the sensitive values of the
+            records at the given positions of the sensitive dataset (at least one); k is determined once using the
+            known data of the first target. Returns the sensitive values found per target, in the order of
+            target_indices, along with k.
+
+        :param sensitive_col: string
+        :param target_indices: list of ints
+        :param known_cols: list of strings
+        :param k_search: string, the search used to determine k (see determine_k)
+        :return: tuple of list of lists and int
+        """
+        # Assure that the sensitive_col was analyzed (its candidates are enumerated from its domain, of any type)
+        if sensitive_col not in self.sensitive_analysis.columns:
+            logger.error("Failed to run attack_targets; sensitive_col=" + sensitive_col +
+                         " is not a column of the sample")
+            return
+
+        self.sensitive_dataset_store.materialize()
+        sensitive_dataset = self.sensitive_dataset_file.read()
+        known_data = [self.known_data(sensitive_dataset.iloc[target_index], sensitive_col, known_cols)
+                      for target_index in target_indices]
+
+        logger.info("Starting attack_targets; sensitive_col=" + sensitive_col + ", " + str(len(known_data)) +
+                    " targets")
+
+        # Schedule the potential sensitive values of each target before injecting any payloads; the synthetic dataset is
+        # only read if the priors inform the attack (no buckets are probed), and its known columns are encoded once
+        domain = CandidateDomain(self.sensitive_analysis, sensitive_dataset, sensitive_col)
+        synthetic_dataset, encoded_synthetic = None, None
+        if CandidateScheduler.uses_priors(buckets=1):
+            synthetic_dataset = self.synthetic_dataset_file.read()
+            encoded_synthetic = CandidateScheduler.encode(synthetic_dataset, known_data[0].index.drop(sensitive_col))
+        schedulers = [CandidateScheduler(self.sensitive_analysis, sensitive_dataset, synthetic_dataset, data,
+                                         sensitive_col, domain=domain, encoded_synthetic=encoded_synthetic)
+                      for data in known_data]
+
+        # Determine K and the potential sensitive values of all targets
+        with profiler.stage("determine_k"):
+            k = self.determine_k(sensitive_col, known_data[0], search=k_search, domain=domain)
+        with profiler.stage("determine_sensitive_value"):
+            sensitive_values = self.determine_sensitive_values(sensitive_col, known_data, k, schedulers)
+
+        logger.info("Completed attack_targets; found K=" + str(k) + ", " +
+                    str(sum(len(values) == 1 for values in sensitive_values)) + " of " + str(len(known_data)) +
+                    " targets with a single sensitive value")
+        return sensitive_values, k
@@ -1,12 +1,27 @@
+import json
 import numpy as np
 import pandas as pd
 from Utils.LoggerUtil import LoggerUtil
+from Utils.ConfigUtil import ConfigUtil
+from Utils.ProfilerUtil import ProfilerUtil
+from File.ProfileFile import ProfileFile
+from File.AttackStateFile import AttackStateFile
 from Analyzers.SyntheticAnalyzer import SyntheticAnalyzer
+from Analyzers.AggregateAnalyzer import AggregateAnalyzer
+from Attackers.PayloadBuilder import PayloadBuilder
+from Attackers.CandidateDomain import CandidateDomain
+from Attackers.KEstimator import KEstimator
+from Attackers.CandidateScheduler import CandidateScheduler
+from Attackers.SpeculativeProber import SpeculativeProber
 from File.SyntheticDatasetFile import SyntheticDatasetFile
 from File.SensitiveDatasetFile import SensitiveDatasetFile
+from File.SensitiveDatasetStore import SensitiveDatasetStore
 from Synthesizers.SDSSynthesizerFacade import SDSSynthesizerFacade
+from Synthesizers.IncrementalAggregator import IncrementalAggregator
 
 logger = LoggerUtil.instance()
+config = ConfigUtil.instance()
+profiler = ProfilerUtil.instance()
 
 
 class NaiveAttacker:
@@ -15,113 +30,600 @@ class NaiveAttacker:
     """
 
     def __init__(self, sensitive_dataset_file: SensitiveDatasetFile, synthetic_dataset_file: SyntheticDatasetFile,
-                 sensitive_analysis: pd.DataFrame, synthesizer: SDSSynthesizerFacade):
+                 sensitive_analysis: pd.DataFrame, synthesizer: SDSSynthesizerFacade, leak_prediction=None,
+                 confirm_leaks=None, attack_state_file: AttackStateFile = None, speculative_workers=None,
+                 confirm_negatives=None):
+        """
+        Initializes a NaiveAttacker on the (synthesized) sensitive dataset. If leak_prediction is set, leaks are
+            predicted from the aggregate counts of the sensitive dataset instead of synthesizing each round. If
+            confirm_leaks is set, the rounds where a leak is predicted are synthesized to confirm it; rounds where no
+            leak is predicted are only synthesized for the fraction confirm_negatives of them (evenly spread), such
+            that missed leaks can be detected. All default to the configurations.
+        If an attack_state_file is given, the progress of the attack is recorded in it after each round, and the rounds
+            already recorded in it (by an interrupted attack) are replayed without synthesizing.
+        If speculative_workers is greater than one, potential sensitive values are probed in parallel by as many worker
+            processes (see SpeculativeProber); defaults to the configurations.
+        """
         self.sensitive_dataset_file = sensitive_dataset_file
+        self.sensitive_dataset_store = SensitiveDatasetStore(sensitive_dataset_file)
         self.synthetic_dataset_file = synthetic_dataset_file
         self.sensitive_analysis = sensitive_analysis
         self.synthesizer = synthesizer
 
+        if leak_prediction is None:
+            leak_prediction = config["ATTACK"].getboolean("leak_prediction")
+        if confirm_leaks is None:
+            confirm_leaks = config["ATTACK"].getboolean("confirm_leaks")
+        self.confirm_leaks = confirm_leaks
+        if confirm_negatives is None:
+            confirm_negatives = config["ATTACK"].getfloat("confirm_negatives")
+        if not 0 <= confirm_negatives <= 1:
+            raise ValueError("confirm_negatives=" + str(confirm_negatives) + " must be between 0 and 1")
+        self.confirm_negatives = confirm_negatives
+
+        # The fraction of a round of predicted non-leaks owed a confirmation
+        self.__negative_credit = 0.0
+        if speculative_workers is None:
+            speculative_workers = config["ATTACK"].getint("speculative_workers")
+        self.speculative_workers = speculative_workers
+
+        # Maintain the aggregates of the sensitive dataset as payloads are injected and rolled back
+        self.aggregate_analyzer = None
+        if leak_prediction:
+            aggregator = IncrementalAggregator(synthesizer.synthesis_config_file)
+            aggregator.fit(sensitive_dataset_file.read())
+            self.sensitive_dataset_store.subscribe(aggregator.update)
+            self.aggregate_analyzer = AggregateAnalyzer(synthesizer.synthesis_config_file, aggregator)
+
+        # The state of the attack, and the number of its recorded rounds replayed so far
+        self.attack_state_file = attack_state_file
+        self.__state = {"rounds": []}
+        if attack_state_file is not None and attack_state_file.exists():
+            self.__state = attack_state_file.read()
+            self.__state.setdefault("rounds", [])
+        self.__replayed = 0
+
+        # The builder of the payloads of the current target (built on first use)
+        self.__builder = None
+
+    @staticmethod
+    def __to_builtin(value):
+        """
+        Converts numpy scalars into the equivalent built-in Python values, such that they can be recorded.
+
+        :param value: object
+        :return: object
+        """
+        return value.item() if isinstance(value, np.generic) else value
+
+    def __record(self, **progress):
+        """
+        Updates the state of the attack with the given progress, and writes it to the attack_state_file (if any).
+
+        :param progress: keyword arguments
+        """
+        self.__state.update(progress)
+        if self.attack_state_file is not None:
+            self.attack_state_file.write(self.__state)
+
+    def __replay(self, values: list, phase: str):
+        """
+        Returns the leaks of the next recorded round if it has not been replayed yet (None otherwise), resuming the
+            synthesis rounds of the synthesizer at the recorded round.
+        Throws: ValueError, if the recorded round probed other values (i.e. the attack diverged from the recorded one).
+
+        :param values: list of objects
+        :param phase: string
+        :return: list of booleans
+        """
+        if self.__replayed >= len(self.__state["rounds"]):
+            return None
+
+        recorded = self.__state["rounds"][self.__replayed]
+        if recorded["phase"] != phase or json.dumps(recorded["values"]) != json.dumps(values) or \
+                recorded["injected_rows"] != self.sensitive_dataset_store.rows:
+            raise ValueError("The attack diverged from the recorded attack at round " + str(self.__replayed) +
+                             "; probed " + str(values) + " (" + phase + "), recorded " + str(recorded["values"]) +
+                             " (" + recorded["phase"] + ")")
+
+        self.__replayed += 1
+        self.synthesizer.resume(recorded["synthesis_round"])
+        profiler.count("replayed_rounds")
+        return recorded["leaks"]
+
+    def recorded_task(self, values: list):
+        """
+        Returns the values that leaked and the number of syntheses used by the speculative task probing the given
+            values (see SpeculativeProber), if an interrupted attack recorded it; None otherwise.
+        Throws: ValueError, if the recorded task probed the values on another version of the sensitive dataset (i.e.
+            the attack diverged from the recorded one).
+
+        :param values: list of objects
+        :return: tuple of list and int
+        """
+        values = [self.__to_builtin(value) for value in values]
+        for recorded in self.__state.get("tasks", []):
+            if json.dumps(recorded["values"]) != json.dumps(values):
+                continue
+            if recorded["injected_rows"] != self.sensitive_dataset_store.rows:
+                raise ValueError("The attack diverged from the recorded attack; probed " + str(values) +
+                                 " speculatively on " + str(self.sensitive_dataset_store.rows) + " injected rows, "
+                                 "recorded on " + str(recorded["injected_rows"]))
+            profiler.count("replayed_tasks")
+            return recorded["leaked_values"], recorded["syntheses"]
+        return None
+
+    def record_task(self, values: list, leaked_values: list, syntheses: int):
+        """
+        Records the values that leaked and the number of syntheses used by a completed speculative task probing the
+            given values in the attack state, such that a resumed attack does not probe them again.
+
+        :param values: list of objects
+        :param leaked_values: list of objects
+        :param syntheses: int
+        """
+        self.__state.setdefault("tasks", []).append({
+            "values": [self.__to_builtin(value) for value in values],
+            "leaked_values": [self.__to_builtin(value) for value in leaked_values],
+            "injected_rows": self.sensitive_dataset_store.rows, "syntheses": syntheses})
+        self.__record()
+
     def __inject(self, data):
         """
-        Injects dataframe into the sensitive dataset by writing to the sensitive dataset (always appends), and returns
-            number of rows injected.
+        Injects dataframe into the sensitive dataset by applying it as a delta on the sensitive dataset store (written
+            to the sensitive dataset before the next synthesis), and returns number of rows injected.
 
         :param data: dataframe
         :return: integer
         """
-        self.sensitive_dataset_file.write(data, include_header=False)
-        return data.shape[0]
+        return self.sensitive_dataset_store.apply(data)
 
-    def __construct_payload(self, known_data, sensitive_col, value, repetitions):
+    def __attack_round(self, payloads: list, phase: str, values: list):
+        """
+        Performs an attack round; resynthesizes the (poisoned) sensitive dataset and analyzes the synthesized dataset
+            using the SyntheticAnalyzer to determine which of the given payloads leaked.
+        If leaks are predicted, the leaks are instead predicted from the aggregates using the AggregateAnalyzer, only
+            resynthesizing to confirm predicted leaks (if confirm_leaks is set) and a fraction confirm_negatives of the
+            rounds where no leak is predicted.
+        Rounds recorded by a resumed attack are replayed instead, and new rounds are recorded in the attack state.
+
+        :param payloads: list of dataframes
+        :param phase: string, the phase of the attack (recorded by the profiler)
+        :param values: list of objects, the potential sensitive values of the payloads
+        :return: list of booleans
+        """
+        values = [self.__to_builtin(value) for value in values]
+        leaks = self.__replay(values, phase)
+        if leaks is None:
+            leaks = self.__probe(payloads, phase)
+            self.__state["rounds"].append({"phase": phase, "values": values, "leaks": leaks,
+                                           "injected_rows": self.sensitive_dataset_store.rows,
+                                           "synthesis_round": self.synthesizer.rounds})
+            self.__replayed += 1
+            self.__record()
+        return leaks
+
+    def __probe(self, payloads: list, phase: str):
         """
-        A method for constructing payloads for later injection based on known_data and a potential value.
-        The payload is repeated repitition number of times before returning the complete dataframe.
+        Determines which of the given payloads leak (see __attack_round).
+
+        :param payloads: list of dataframes
+        :param phase: string
+        :return: list of booleans
+        """
+        with profiler.stage("attack_round", phase=phase, round=self.synthesizer.rounds):
+            predicted_leaks = None
+            if self.aggregate_analyzer is not None:
+                # Bring the aggregates to the current version and predict the leaks
+                self.sensitive_dataset_store.publish()
+                predicted_leaks = self.aggregate_analyzer.analyze_batch(payloads)
+                profiler.count("predicted_rounds")
+                if not self.confirm_leaks:
+                    return predicted_leaks
+
+                # Confirm the rounds without predicted leaks evenly, at the rate of confirm_negatives
+                if not any(predicted_leaks):
+                    self.__negative_credit += self.confirm_negatives
+                    if self.__negative_credit < 1:
+                        return predicted_leaks
+                    self.__negative_credit -= 1
+                    profiler.count("confirmed_negative_rounds")
+
+            # Bring the sensitive dataset to the current version and apply synthesis
+            self.sensitive_dataset_store.materialize()
+            self.synthesizer.resynthesize()
+
+            # Analyze the synthesized dataset to determine if a leak of the payloads occurred
+            leaks = SyntheticAnalyzer(self.synthetic_dataset_file).analyze_batch(payloads)
+            if predicted_leaks is not None and predicted_leaks != leaks:
+                logger.debug("Mispredicted leaks; predicted " + str(predicted_leaks) + ", synthesized " + str(leaks))
+                profiler.count("mispredicted_rounds")
+                if any(leak and not predicted for leak, predicted in zip(leaks, predicted_leaks)):
+                    logger.warning("Missed leaks; the aggregates predicted no leak of payloads that leaked")
+                    profiler.count("missed_leak_rounds")
+            return leaks
+
+    def __payload_builder(self, known_data, sensitive_col):
+        """
+        Returns the PayloadBuilder constructing payloads for later injection based on known_data, with potential values
+            for the sensitive_col; built once per target and reused by the subsequent rounds.
 
         :param known_data: list of strings
         :param sensitive_col: string
-        :param value: numerical
-        :param repetitions: int
-        :return: dataframe
-        """
-        # Get properties identified in the sensitive dataset during the sensitive analysis
-        data_types = self.sensitive_analysis.loc["type"]
-
-        payload = {}
-        for index in known_data.index:
-            # Get the data type of 'column' from sensitive_analysis_df_types
-            data_type = data_types[index]
-
-            # If the index is the sensitive column, we do not just insert the value, instead we insert a potential value
-            # To simulate that the sensitive value is unknown
-            if index == sensitive_col:
-                # Insert a guess for the sensitive attribute
-                payload[sensitive_col] = value
-                continue
-            elif known_data[index] == "N":
-                # If we are using only QIs the value "N" indicates that the value for this column should not be included
-                payload[index] = np.NaN
-                continue
+        :return: PayloadBuilder
+        """
+        builder = self.__builder
+        if builder is None or builder.known_data is not known_data or builder.sensitive_col != sensitive_col:
+            builder = PayloadBuilder(self.sensitive_analysis, known_data, sensitive_col)
+            self.__builder = builder
+        return builder
+
+    def __probe_k(self, known_data, sensitive_col, value, count, checkpoints):
+        """
+        Brings the number of injected (identical) payload rows to count, resynthesizes and returns whether the payload
+            leaked. The sensitive dataset is rolled back to the closest checkpoint at or below count, such that only
+            the missing rows are injected; checkpoints maps injection counts to checkpoints and is updated in place.
+
+        :param known_data: list of strings
+        :param sensitive_col: string
+        :param value: object
+        :param count: int
+        :param checkpoints: dictionary
+        :return: boolean
+        """
+        # Roll back to the closest checkpoint, discarding checkpoints invalidated by the rollback
+        closest = max(injections for injections in checkpoints if injections <= count)
+        self.sensitive_dataset_store.rollback(checkpoints[closest])
+        for injections in [injections for injections in checkpoints if injections > closest]:
+            del checkpoints[injections]
+
+        # Inject the remaining rows to reach count and checkpoint the result
+        builder = self.__payload_builder(known_data, sensitive_col)
+        payload = builder.build([value], 1)
+        if count > closest:
+            self.__inject(builder.build([value], count - closest))
+            checkpoints[count] = self.sensitive_dataset_store.checkpoint()
+
+        # Apply synthesis and analyze the synthesized dataset to determine if a leak of the payload occurred
+        return self.__attack_round([payload], "k", [value])[0]
+
+    def __search_k(self, sensitive_col, known_data, value, candidates=None):
+        """
+        Determines k by growing the number of injections exponentially until a leak occurs, then bisecting between
+            the last injection count that did not leak and the first that did. Assumes that leaks are monotonic in the
+            number of injections, which gives the same k as the linear search using O(log k) syntheses.
+        If candidates for k are given (e.g. estimated from the aggregates, see KEstimator), the candidates are bisected
+            instead, and the smallest leaking candidate is confirmed by probing one injection less; a single candidate
+            is thus confirmed in two syntheses. Should the candidates be wrong, the search continues as without them.
+        The sensitive dataset is left with k injected rows, as after the linear search.
 
-            if data_type == np.dtype(np.object):
-                # If the data type is object, no casting is required
-                payload[index] = known_data[index]
+        :param sensitive_col: string
+        :param known_data: list of strings
+        :param value: object
+        :param candidates: list of ints
+        :return: int
+        """
+        checkpoints = {0: self.sensitive_dataset_store.checkpoint()}
+
+        # The largest number of injections known not to leak, and the smallest known to leak (None until found)
+        lower, upper = 0, None
+        if candidates:
+            candidates = sorted(candidates)
+            if self.__probe_k(known_data, sensitive_col, value, candidates[-1], checkpoints):
+                # Bisect the candidates for the smallest that leaks
+                low, high = -1, len(candidates) - 1
+                while high - low > 1:
+                    middle = (low + high) // 2
+                    if self.__probe_k(known_data, sensitive_col, value, candidates[middle], checkpoints):
+                        high = middle
+                    else:
+                        low = middle
+                lower, upper = candidates[low] if low >= 0 else 0, candidates[high]
+
+                # Confirm that one injection less does not leak, otherwise k lies between the candidates
+                if upper - 1 > lower:
+                    if self.__probe_k(known_data, sensitive_col, value, upper - 1, checkpoints):
+                        upper -= 1
+                    else:
+                        lower = upper - 1
             else:
-                # Cast values from target_data to the appropriate data type and insert into payload
-                casted_values = known_data[index].astype(data_type).tolist()
-                payload[index] = casted_values
+                lower = candidates[-1]
+
+        # Grow the number of injections exponentially until the payload leaks
+        if upper is None:
+            upper = max(1, lower * 2)
+            while not self.__probe_k(known_data, sensitive_col, value, upper, checkpoints):
+                lower, upper = upper, upper * 2
+
+        # Bisect (lower, upper] - lower never leaked, upper always leaked
+        while upper - lower > 1:
+            middle = (lower + upper) // 2
+            if self.__probe_k(known_data, sensitive_col, value, middle, checkpoints):
+                upper = middle
+            else:
+                lower = middle
+
+        # Leave exactly k injected rows in the sensitive dataset
+        if max(checkpoints) != upper:
+            closest = max(injections for injections in checkpoints if injections <= upper)
+            self.sensitive_dataset_store.rollback(checkpoints[closest])
+            self.__inject(self.__payload_builder(known_data, sensitive_col).build([value], upper - closest))
+
+        return upper
 
-        # Create a dataframe from the payload repeated k times
-        payload_df = pd.DataFrame([payload])
-        payload_df = pd.concat([payload_df] * repetitions, ignore_index=True)
+    def estimate_k(self):
+        """
+        Returns the candidates for k estimated from the reportable aggregates of the first synthesis (see KEstimator),
+            given the current version of the sensitive dataset (which should not hold injections yet); None if the
+            synthesizer did not keep the aggregates or no candidate is consistent with them.
 
-        # Create injection label; 'i'k
-        payload_df.rename(index=lambda i: f'i{i}', inplace=True)
+        :return: list of ints
+        """
+        aggregates = self.synthesizer.aggregates()
+        if aggregates is None:
+            logger.warning("Failed to estimate K; the aggregates of the first synthesis are not available")
+            return None
 
-        return payload_df
+        self.sensitive_dataset_store.materialize()
+        estimator = KEstimator(self.synthesizer.synthesis_config_file)
+        return estimator.estimate(aggregates, self.sensitive_dataset_file.read())
 
-    def determine_k(self, sensitive_col, known_data):
+    def determine_k(self, sensitive_col, known_data, search=None, domain=None):
         """
         A method for determining k (the privacy resolution) used by the underlying synthesizer to synthesize a dataset.
+        The search is either 'linear' (one injection per synthesis), 'binary' (exponential growth and bisection) or
+            'aggregate' (the candidates estimated from the aggregates of the first synthesis, confirmed by poisoning;
+            see KEstimator), defaulting to the k_search configuration. The aggregate search falls back to the binary
+            search if the synthesizer did not keep the aggregates, or no candidate is consistent with them.
+        The payloads take a value outside the domain of the sensitive column; if the CandidateDomain is None, it is
+            determined from the current version of the sensitive dataset (which should not hold injections yet).
 
         :param sensitive_col: string
         :param known_data: list of strings
+        :param search: string
+        :param domain: CandidateDomain
         :return: int
         """
         logger.info("Commencing attack; Injecting poisoned data to find K...")
 
-        # Get properties of the sensitive column found during the SensitiveAnalysis
-        data_type = self.sensitive_analysis.at["type", sensitive_col]
-        minimum = self.sensitive_analysis.at["min", sensitive_col]
-        val_outside_domain = np.dtype(data_type).type(minimum) - 1
-
-        # Accumulators and flags used to identify leaks and thresholds
-        is_leaked = False
-        injection_count = 0
-
-        # Determine k
-        while not is_leaked:
-            # Construct a payload with NaN values to not interfere.
-            # Inject it into the dataset and keep track of the number of injections
-            payload = self.__construct_payload(known_data, sensitive_col, val_outside_domain, 1)
-            injection_count += self.__inject(pd.DataFrame(payload, columns=self.sensitive_analysis.columns))
+        if search is None:
+            search = config["ATTACK"]["k_search"]
+        if search not in ("linear", "binary", "aggregate"):
+            raise ValueError("search=" + str(search) + " must be either 'linear', 'binary' or 'aggregate'")
+
+        # Get a value outside the domain of the sensitive column, such that payloads do not collide with records
+        if domain is None:
+            self.sensitive_dataset_store.materialize()
+            domain = CandidateDomain(self.sensitive_analysis, self.sensitive_dataset_file.read(), sensitive_col)
+        val_outside_domain = domain.outside()
+
+        # Keep track of the number of syntheses used to find k
+        initial_rounds = self.synthesizer.rounds
+
+        if search == "aggregate":
+            injection_count = self.__search_k(sensitive_col, known_data, val_outside_domain,
+                                              candidates=self.estimate_k())
+        elif search == "binary":
+            injection_count = self.__search_k(sensitive_col, known_data, val_outside_domain)
+        else:
+            # Accumulators and flags used to identify leaks and thresholds
+            is_leaked = False
+            injection_count = 0
 
-            # Apply synthesis
-            self.synthesizer.resynthesize()
+            # Determine k
+            while not is_leaked:
+                # Construct a payload with NaN values to not interfere.
+                # Inject it into the dataset and keep track of the number of injections
+                payload = self.__payload_builder(known_data, sensitive_col).build([val_outside_domain], 1)
+                injection_count += self.__inject(payload)
 
-            # Analyze the synthesized dataset using the SyntheticAnalyser to determine if a leak of the payload occurred
-            is_leaked = SyntheticAnalyzer(self.synthetic_dataset_file).analyze(payload)
+                # Apply synthesis and analyze the synthesized dataset to determine if a leak of the payload occurred
+                is_leaked = self.__attack_round([payload], "k", [val_outside_domain])[0]
 
         # The value of k is the number of identical injections that resulted in a leak
-        logger.info("Successful attack; found K=" + str(injection_count))
+        logger.info("Successful attack; found K=" + str(injection_count) + " using " +
+                    str(self.synthesizer.rounds - initial_rounds) + " syntheses (" + search + " search)")
         return injection_count
 
-    def determine_sensitive_value(self, sensitive_col, known_data, k):
+    def probe_payloads(self, block, payloads: list, values: list):
+        """
+        Injects the block of payloads (e.g. of several targets) in a single round, resynthesizes and returns whether
+            each of the payloads leaked, given the potential value of each payload. The sensitive dataset is rolled back
+            afterwards, such that payloads do not pile up.
+
+        :param block: dataframe, the rows of all payloads
+        :param payloads: list of dataframes, the payloads of the block (see PayloadBuilder.split)
+        :param values: list of objects
+        :return: list of booleans
+        """
+        checkpoint = self.sensitive_dataset_store.checkpoint()
+
+        # Inject the payloads of all potential values at once
+        self.__inject(block)
+
+        # Apply synthesis and determine which of the payloads leaked from a single read of the synthetic dataset
+        leaks = self.__attack_round(payloads, "value", values)
+
+        self.sensitive_dataset_store.rollback(checkpoint)
+        return leaks
+
+    def __probe_values(self, values, block, k):
+        """
+        Injects the block of payloads for all given potential values in a single round, resynthesizes and returns the
+            values whose payload leaked (see probe_payloads).
+
+        :param values: list of objects
+        :param block: dataframe, the payloads of the values (see PayloadBuilder.build)
+        :param k: int
+        :return: list of objects
+        """
+        leaks = self.probe_payloads(block, PayloadBuilder.split(block, k - 1), values)
+        return [value for value, is_leaked in zip(values, leaks) if is_leaked]
+
+    def __group_test(self, values, block, k, weights=None, parts=2, isolate=False):
+        """
+        Determines which of the given potential values leak by adaptive group testing; all values are probed in a
+            single round, and if the round is ambiguous (several payloads leaked) the values are split in parts (halves
+            by default) of equal weight and each part containing a leaked value is probed again, until each leak is
+            attributed to a single value. The values are weighted uniformly if weights is None.
+        If isolate is set, any leak of a round probing several values is ambiguous, such that each leak is confirmed by
+            a round probing its value alone (as payloads of many values may leak one another).
+
+        :param values: list of objects
+        :param block: dataframe, the payloads of the values (see PayloadBuilder.build)
+        :param k: int
+        :param weights: array of numerical
+        :param parts: int
+        :param isolate: boolean
+        :return: list of objects
+        """
+        leaked_values = self.__probe_values(values, block, k)
+        if len(leaked_values) < (1 if isolate else 2) or len(values) < 2:
+            return leaked_values
+
+        # Split the ambiguous batch (and its payloads), only probing the parts that may contain a leak
+        weights = np.ones(len(values)) if weights is None else np.asarray(weights)
+        potential_sensitive_values = []
+        for start, stop in CandidateDomain.quantiles(weights, parts):
+            part = values[start:stop]
+            if any(value in leaked_values for value in part):
+                potential_sensitive_values += self.__group_test(part, block.iloc[start * (k - 1):stop * (k - 1)], k,
+                                                                weights[start:stop], parts, isolate)
+
+        return potential_sensitive_values
+
+    def probe_bucket(self, sensitive_col, known_data, values, k, parts, weights=None):
+        """
+        Probes a bucket of potential values of the sensitive column in a single synthesis, on top of the current version
+            of the sensitive dataset, and returns those whose payload (repeated k - 1 times) leaked; the bucket is
+            refined into parts quantile buckets (given the weights of the values) while any of its values leaked, until
+            each leak is confirmed by a value probed alone.
+
+        :param sensitive_col: string
+        :param known_data: list of strings
+        :param values: list of objects
+        :param k: int
+        :param parts: int
+        :param weights: array of numerical
+        :return: list of objects
+        """
+        block = self.__payload_builder(known_data, sensitive_col).build(values, k - 1)
+        return self.__group_test(values, block, k, weights, max(2, parts), isolate=True)
+
+    def probe_candidates(self, sensitive_col, known_data, values, k, batch_size=1, scheduler=None, buckets=1):
+        """
+        Probes the given potential values of the sensitive column, on top of the current version of the sensitive
+            dataset, and returns those whose payload (repeated k - 1 times) leaked. If batch_size is greater than one,
+            batch_size values are probed per synthesis using group testing, otherwise each value is probed in a
+            synthesis of its own. If a CandidateScheduler is given, the probes are reported to it, and probing stops
+            once it is confident.
+        If buckets is greater than one, the values are instead split into as many quantile buckets (of equal prior
+            probability, given the scheduler), each probed in a single synthesis and refined into as many quantile
+            buckets while any of their values leaked, until each leak is confirmed by a value probed alone (see
+            probe_bucket).
+
+        :param sensitive_col: string
+        :param known_data: list of strings
+        :param values: list or array of objects
+        :param k: int
+        :param batch_size: int
+        :param scheduler: CandidateScheduler
+        :param buckets: int
+        :return: list of objects
+        """
+        potential_sensitive_values = []
+        builder = self.__payload_builder(known_data, sensitive_col)
+
+        if buckets > 1:
+            # Determine the sensitive values by group testing quantile buckets of the values
+            weights = scheduler.priors(values) if scheduler is not None else np.ones(len(values))
+            for start, stop in CandidateDomain.quantiles(weights, buckets):
+                bucket = list(values[start:stop])
+                leaked_values = self.probe_bucket(sensitive_col, known_data, bucket, k, buckets, weights[start:stop])
+                potential_sensitive_values += leaked_values
+
+                # Stop once the scheduler is confident the true value has leaked
+                if scheduler is not None:
+                    scheduler.observe(bucket, leaked_values)
+                    if scheduler.is_confident():
+                        break
+            return potential_sensitive_values
+
+        # Construct the payloads of the range in blocks (of whole batches), each repeated k - 1 times
+        for block_values, block in builder.blocks(values, k - 1, multiple=max(1, batch_size)):
+            if batch_size > 1:
+                # Determine the sensitive values by group testing batches of the block
+                for start in range(0, len(block_values), batch_size):
+                    batch = list(block_values[start:start + batch_size])
+                    batch_block = block.iloc[start * (k - 1):(start + len(batch)) * (k - 1)]
+                    leaked_values = self.__group_test(batch, batch_block, k)
+                    potential_sensitive_values += leaked_values
+
+                    # Stop once the scheduler is confident the true value has leaked
+                    if scheduler is not None:
+                        scheduler.observe(batch, leaked_values)
+                        if scheduler.is_confident():
+                            return potential_sensitive_values
+                continue
+
+            # Determine the sensitive values by bruteforce
+            checkpoint = self.sensitive_dataset_store.checkpoint()
+            for potential_sensitive_value, payload in zip(block_values, PayloadBuilder.split(block, k - 1)):
+                # Inject the payload with the potential value, the injection_count will always increment by k
+                self.__inject(payload)
+
+                # Apply synthesis and analyze the synthesized dataset to determine if a leak of the payload occurred
+                is_leaked = self.__attack_round([payload], "value", [potential_sensitive_value])[0]
+
+                # Roll back the payload, such that the sensitive dataset stays at the base and k injected rows
+                self.sensitive_dataset_store.rollback(checkpoint)
+
+                # If the payload resulted in a leak, add the guessed sensitive value to the result
+                if is_leaked:
+                    potential_sensitive_values.append(potential_sensitive_value)
+
+                # Stop once the scheduler is confident the true value has leaked
+                if scheduler is not None:
+                    scheduler.observe([potential_sensitive_value], [potential_sensitive_value] if is_leaked else [])
+                    if scheduler.is_confident():
+                        return potential_sensitive_values
+
+        return potential_sensitive_values
+
+    def schedule_candidates(self, sensitive_col, known_data, buckets=None):
+        """
+        Returns a CandidateScheduler of the potential sensitive values of the target, given the current version of the
+            sensitive dataset (which should not hold injections yet) and the synthetic dataset of the first synthesis.
+            The synthetic dataset is only read if the priors inform the attack (see CandidateScheduler.uses_priors),
+            given the number of buckets of a bucketed search (defaults to the value_buckets configuration).
+
+        :param sensitive_col: string
+        :param known_data: list of strings
+        :param buckets: int
+        :return: CandidateScheduler
+        """
+        self.sensitive_dataset_store.materialize()
+        synthetic_dataset = self.synthetic_dataset_file.read() if CandidateScheduler.uses_priors(buckets=buckets) \
+            else None
+        return CandidateScheduler(self.sensitive_analysis, self.sensitive_dataset_file.read(), synthetic_dataset,
+                                  known_data, sensitive_col)
+
+    def determine_sensitive_value(self, sensitive_col, known_data, k, batch_size=None, scheduler=None, buckets=None):
         """
         A method for determining the sensitive value of the target record, given k and the sensitive attribute.
+        If batch_size is greater than one, batch_size potential values are probed per synthesis using group testing,
+            otherwise each potential value is probed in a synthesis of its own; defaults to the value_batch_size
+            configuration. If buckets is greater than one, the potential values are instead probed in quantile buckets
+            refined while ambiguous (see probe_candidates); defaults to the value_buckets configuration.
+        The potential values are probed in the order of the given CandidateScheduler, stopping once it is confident;
+            if None, it is scheduled from the current version of the sensitive dataset (see schedule_candidates).
 
         :param sensitive_col: string
         :param known_data: list of strings
         :param k: int
+        :param batch_size: int
+        :param scheduler: CandidateScheduler
+        :param buckets: int
         :return: list of object
         """
         logger.info("Commencing attack; Injecting poisoned data to find sensitive value(s)...")
@@ -131,43 +633,65 @@ class NaiveAttacker:
             logger.warn("Potential error; Found K=" + str(k) + ", the sensitive value should already be leaked...")
             return []
 
-        # Get properties of the sensitive column found during the SensitiveAnalysis
-        data_type = self.sensitive_analysis.at["type", sensitive_col]
-        minimum = self.sensitive_analysis.at["min", sensitive_col]
-        maximum = self.sensitive_analysis.at["max", sensitive_col]
-        minimum = np.dtype(data_type).type(minimum)
-        maximum = np.dtype(data_type).type(maximum)
-
-        potential_sensitive_values = []
+        if batch_size is None:
+            batch_size = int(config["ATTACK"]["value_batch_size"])
+        if buckets is None:
+            buckets = config["ATTACK"].getint("value_buckets")
 
-        # Determine the range of values to iterate during the bruteforce
-        sensitive_range = np.arange(minimum, maximum + 1)
+        # Keep track of the number of syntheses used to find the sensitive value(s)
+        initial_rounds = self.synthesizer.rounds
 
-        # Determine the sensitive values by bruteforce
-        for potential_sensitive_value in sensitive_range:
-            # Construct a payload with potential value (we use minimum as the accumulator)
-            # Inject it into the dataset, the injection_count will always increment by k
-            payload = self.__construct_payload(known_data, sensitive_col, potential_sensitive_value, k - 1)
-            self.__inject(pd.DataFrame(payload, columns=self.sensitive_analysis.columns))
+        # Determine the values to iterate during the bruteforce, in the order of the scheduler
+        if scheduler is None:
+            scheduler = self.schedule_candidates(sensitive_col, known_data, buckets=buckets)
+        candidates = scheduler.candidates()
 
-            # Apply synthesis
-            self.synthesizer.resynthesize()
-
-            # Analyze the synthesized dataset using the SyntheticAnalyser to determine if a leak of the payload occurred
-            is_leaked = SyntheticAnalyzer(self.synthetic_dataset_file).analyze(payload)
+        if self.speculative_workers > 1:
+            # Probe the candidates in parallel (the completed tasks are recorded in the attack state)
+            potential_sensitive_values = SpeculativeProber(self, self.speculative_workers).probe(
+                sensitive_col, known_data, candidates, k, batch_size=batch_size, scheduler=scheduler, buckets=buckets)
+        else:
+            potential_sensitive_values = self.probe_candidates(sensitive_col, known_data, candidates, k,
+                                                               batch_size=batch_size, scheduler=scheduler,
+                                                               buckets=buckets)
 
-            # If the payload resulted in a leak, add the guessed sensitive value to the result
-            if is_leaked:
-                potential_sensitive_values.append(potential_sensitive_value)
+        # Report the values found in the order of the domain, regardless of the order they were probed in
+        potential_sensitive_values = scheduler.sort(potential_sensitive_values)
 
         # If we found no potential sensitive values, it must be because it is NaN
         if len(potential_sensitive_values) < 1:
             potential_sensitive_values.append(np.nan)
 
-        logger.info("Successful attack; found sensitive value(s): " + str(potential_sensitive_values))
+        logger.info("Successful attack; found sensitive value(s): " + str(potential_sensitive_values) + " using " +
+                    str(self.synthesizer.rounds - initial_rounds) + " syntheses (" + str(len(candidates)) +
+                    " candidates, " + str(round(100 * scheduler.confidence(), 2)) + "% confidence)")
         return potential_sensitive_values
 
-    def attack_loop(self, sensitive_col, known_cols=None):
+    @staticmethod
+    def known_data(record: pd.Series, sensitive_col, known_cols=None):
+        """
+        Returns the data of the targeted record known to the attacker; its values on the known columns (all columns if
+            None) and the sensitive column, with the value "N" on the unknown columns.
+
+        :param record: series, the targeted record of the sensitive dataset
+        :param sensitive_col: string
+        :param known_cols: list of strings
+        :return: series
+        """
+        if known_cols is None or len(known_cols) == len(record.index):
+            # We use all non-sensitive columns (the sensitive column is discarded later)
+            return record.astype(object)
+
+        # We use all data on known columns (intended to be the QIs)
+        target_data = record.astype(object)
+
+        # Get and modify the values on the unknown columns to NaN
+        unknown_cols = [col for col in target_data.index if col not in known_cols and col != sensitive_col]
+        target_data.loc[unknown_cols] = "N"
+
+        return pd.Series(target_data)
+
+    def attack_loop(self, sensitive_col, known_cols=None, k_search=None, value_batch_size=None, target_index=0):
         """
         A method that combines preperation, determination of k, construction of payloads and determination of the
             sensitive attribute. Given a sensitive attribute and the known columns, conducts the bruteforce attack to
@@ -175,33 +699,33 @@ class NaiveAttacker:
 
         :param sensitive_col:
         :param known_cols:
+        :param k_search: string, the search used to determine k (see determine_k)
+        :param value_batch_size: int, the number of potential values probed per synthesis (see
+            determine_sensitive_value)
+        :param target_index: int, the position of the targeted record in the sensitive dataset
         :return:
         """
-        # Assure that the sensitive_col is an incremental type
-        sensitive_type = self.sensitive_analysis[sensitive_col].loc["type"]
-        if sensitive_type == np.object:
-            logger.error("Failed to run attack_loop; sensitive_col=" + sensitive_col + " is of an invalid type")
+        # Assure that the sensitive_col was analyzed (its candidates are enumerated from its domain, of any type)
+        if sensitive_col not in self.sensitive_analysis.columns:
+            logger.error("Failed to run attack_loop; sensitive_col=" + sensitive_col + " is not a column of the sample")
             return
 
-        if known_cols is None or len(known_cols) == len(self.sensitive_analysis.columns):
-            # We use all non-sensitive columns (the sensitive column is discarded later)
-            known_data = self.sensitive_dataset_file.read().iloc[0]
-        else:
-            # We use all data on known columns (intended to be the QIs)
-            target_data = self.sensitive_dataset_file.read().iloc[0]
-
-            # Get and modify the values on the unknown columns to NaN
-            unknown_cols = [col for col in target_data.index if col not in known_cols and col != sensitive_col]
-            target_data.loc[unknown_cols] = "N"
-
-            known_data = pd.Series(target_data)
+        known_data = self.known_data(self.sensitive_dataset_file.read().iloc[target_index], sensitive_col, known_cols)
 
         logger.info("Starting attack_loop; sensitive_col=" + sensitive_col + ", known data of target: " +
                         str(dict(known_data.drop(sensitive_col, axis=0))))
 
+        # Schedule the potential sensitive values before injecting any payloads
+        scheduler = self.schedule_candidates(sensitive_col, known_data)
+
         # Determine K and potential sensitive values
-        k = self.determine_k(sensitive_col, known_data)
-        sensitive_values = self.determine_sensitive_value(sensitive_col, known_data, k)
+        with profiler.stage("determine_k"):
+            k = self.determine_k(sensitive_col, known_data, search=k_search, domain=scheduler.domain)
+        self.__record(k=k)
+        with profiler.stage("determine_sensitive_value"):
+            sensitive_values = self.determine_sensitive_value(sensitive_col, known_data, k,
+                                                              batch_size=value_batch_size, scheduler=scheduler)
+        self.__record(sensitive_values=[self.__to_builtin(value) for value in sensitive_values], completed=True)
 
         # Determine the implied certainty of having found the correct sensitive value
         num_potential_sensitive_values = len(sensitive_values)
@@ -213,4 +737,9 @@ class NaiveAttacker:
                     str(sensitive_values) + ", implying a " + str(certainty) + "% certainty." +
                     " Leaked " + str(num_potential_sensitive_values - 1) + " other entries during the attack.")
 
+        # Summarize the profile of the attack, and export it if configured to
+        profiler.log_summary()
+        if config["PROFILING"]["export_format"] != "none":
+            ProfileFile().write(trace_format=config["PROFILING"]["export_format"])
+
         return sensitive_values, k
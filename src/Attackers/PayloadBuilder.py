@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+from Utils.LoggerUtil import LoggerUtil
+from Utils.ProfilerUtil import ProfilerUtil
+
+logger = LoggerUtil.instance()
+profiler = ProfilerUtil.instance()
+
+
+class PayloadBuilder:
+    """
+    A class for constructing the payloads injected when attacking a targeted record. A typed template row is built once
+        from the known data of the target, from which blocks of payloads (one or more potential sensitive values, each
+        repeated a number of times) are produced by taking the template row repeatedly; a single allocation per column,
+        regardless of the number of rows.
+
+    Methods: build(), blocks(), split()
+    """
+    # The maximum number of rows of the blocks produced by blocks()
+    BLOCK_ROWS = 1 << 16
+
+    def __init__(self, sensitive_analysis: pd.DataFrame, known_data: pd.Series, sensitive_col: str):
+        """
+        Initializes a PayloadBuilder for the target with the given known_data, using the data types identified by the
+            sensitive_analysis. The value of the sensitive_col is replaced by the potential values of each payload.
+        """
+        self.sensitive_col = sensitive_col
+        self.known_data = known_data
+        self.__template = self.__construct_template(sensitive_analysis, known_data, sensitive_col)
+
+        # The index labels of payloads, keyed by the number of repetitions
+        self.__labels = {}
+
+    @staticmethod
+    def __construct_template(sensitive_analysis: pd.DataFrame, known_data: pd.Series, sensitive_col: str):
+        """
+        Constructs the template row of the payloads; the known values of the target cast to the data types of their
+            columns, and NaN for the columns that are not known (the value "N") and the sensitive column.
+
+        :param sensitive_analysis: dataframe
+        :param known_data: series
+        :param sensitive_col: string
+        :return: dataframe
+        """
+        # Get properties identified in the sensitive dataset during the sensitive analysis
+        data_types = sensitive_analysis.loc["type"]
+
+        template = {}
+        for index in known_data.index:
+            # Get the data type of 'column' from sensitive_analysis_df_types
+            data_type = data_types[index]
+
+            # If the index is the sensitive column, the value is inserted per payload later
+            # To simulate that the sensitive value is unknown
+            if index == sensitive_col:
+                template[sensitive_col] = np.nan
+                continue
+            elif isinstance(known_data[index], str) and known_data[index] == "N":
+                # If we are using only QIs the value "N" indicates that the value for this column should not be included
+                template[index] = np.nan
+                continue
+
+            if not pd.api.types.is_numeric_dtype(data_type):
+                # If the data type is not numerical (e.g. object or categorical), no casting is required
+                template[index] = known_data[index]
+            elif isinstance(data_type, pd.api.extensions.ExtensionDtype):
+                # Cast values to nullable data types (e.g. Int8) through pandas, as numpy does not support them
+                template[index] = pd.array([known_data[index]], dtype=data_type).tolist()[0]
+            else:
+                # Cast values from target_data to the appropriate data type and insert into template
+                template[index] = np.array(known_data[index]).astype(data_type).tolist()
+
+        return pd.DataFrame([template], columns=sensitive_analysis.columns)
+
+    def __index(self, repetitions: int, count: int):
+        """
+        Returns the index of a block of count payloads repeated repetitions times; each payload labelled by injection
+            'i'k.
+
+        :param repetitions: int
+        :param count: int
+        :return: index
+        """
+        if repetitions not in self.__labels:
+            self.__labels[repetitions] = np.array(["i" + str(i) for i in range(repetitions)], dtype=object)
+        return pd.Index(np.tile(self.__labels[repetitions], count))
+
+    @profiler.timed("payload_construction")
+    def build(self, values, repetitions: int):
+        """
+        Constructs a block of payloads, one per potential value of the sensitive column, each repeated repetitions
+            times (consecutively, in the order of values).
+
+        :param values: list or array of objects
+        :param repetitions: int
+        :return: dataframe
+        """
+        values = np.asarray(values)
+        block = self.__template.take(np.zeros(values.shape[0] * repetitions, dtype=np.intp))
+        block[self.sensitive_col] = np.repeat(values, repetitions)
+        block.index = self.__index(repetitions, values.shape[0])
+        return block
+
+    def blocks(self, values, repetitions: int, multiple=1):
+        """
+        Constructs the payloads of a (possibly large) range of potential values in blocks of at most BLOCK_ROWS rows,
+            yielding the values of each block along with the block. The number of values per block is a multiple of
+            multiple (at least multiple), e.g. such that blocks hold whole batches.
+
+        :param values: list or array of objects
+        :param repetitions: int
+        :param multiple: int
+        :return: generator of tuples of array and dataframe
+        """
+        values = np.asarray(values)
+        step = max(multiple, self.BLOCK_ROWS // max(1, repetitions) // multiple * multiple)
+        for start in range(0, values.shape[0], step):
+            yield values[start:start + step], self.build(values[start:start + step], repetitions)
+
+    @staticmethod
+    def split(block: pd.DataFrame, repetitions: int):
+        """
+        Splits a block into its payloads (views of the block), each of repetitions rows.
+
+        :param block: dataframe
+        :param repetitions: int
+        :return: list of dataframes
+        """
+        return [block.iloc[start:start + repetitions] for start in range(0, block.shape[0], repetitions)]
@@ -0,0 +1,233 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+from Utils.LoggerUtil import LoggerUtil
+from Utils.ConfigUtil import ConfigUtil
+from Utils.ProfilerUtil import ProfilerUtil
+from Utils.WorkspaceUtil import WorkspaceUtil
+from File.SensitiveDatasetFile import SensitiveDatasetFile
+from File.SynthesisConfigFile import SynthesisConfigFile
+from File.SyntheticDatasetFile import SyntheticDatasetFile
+from Attackers.CandidateDomain import CandidateDomain
+
+logger = LoggerUtil.instance()
+config = ConfigUtil.instance()
+profiler = ProfilerUtil.instance()
+
+# The arguments of the attacker probing candidates in the workers of the current process pool (set once per worker by
+# the pool's initializer), the attacker itself (created by the worker's first task) and the arguments of its probes
+_attacker_arguments = None
+_attacker = None
+_probe_arguments = None
+
+
+class SpeculativeProber:
+    """
+    A class for probing the potential sensitive values of a target speculatively in parallel; each worker process holds
+        its own copy of the (poisoned) sensitive dataset, synthesis configurations and output directory, and probes the
+        candidates it is given independently of the other workers. Probing can be cancelled early once enough leaking
+        candidates are found. The cores are divided between the workers, such that SDS's own parallel jobs do not
+        oversubscribe them.
+
+    Methods: probe()
+    """
+    # The synthesis configurations specific to the files of an attacker, which are not copied to the workers
+    LOCAL_CONFIGS = ("sensitive_microdata_path", "output_dir", "prefix")
+
+    # The file the sensitive dataset is handed to the workers by, in the workspace of the workers
+    SENSITIVE_DATASET_FILENAME = "sensitive_dataset.pkl"
+
+    def __init__(self, attacker, workers=None, max_leaks=None):
+        """
+        Initializes a SpeculativeProber for the given NaiveAttacker with the number of worker processes and the number
+            of leaking candidates after which probing is cancelled (never if 0); defaulting to the speculative_workers
+            and speculative_max_leaks configurations.
+        """
+        self.attacker = attacker
+        if workers is None:
+            workers = config["ATTACK"].getint("speculative_workers")
+        self.workers = max(1, min(workers, os.cpu_count() or 1))
+        self.max_leaks = max_leaks if max_leaks is not None else config["ATTACK"].getint("speculative_max_leaks")
+
+    @staticmethod
+    def _initialize_worker(workspace: str, attacker_type: type, synthesizer_type: type, sensitive_dataset_path: str,
+                           schema, sensitive_analysis: pd.DataFrame, synthesis_config: dict, in_memory: bool,
+                           probe_arguments: tuple):
+        """
+        Initializes a worker process of the pool with the arguments of an attacker of its own; in a workspace of its
+            own, on a copy of the sensitive dataset (read from the pickle at sensitive_dataset_path) and with a copy of
+            the synthesis configurations. The attacker is created by the worker's first task (see _worker_attacker).
+
+        :param workspace: string
+        :param attacker_type: type of NaiveAttacker
+        :param synthesizer_type: type of SDSSynthesizerFacade
+        :param sensitive_dataset_path: string
+        :param schema: dictionary, the schema of the dataset files (None if not set)
+        :param sensitive_analysis: dataframe
+        :param synthesis_config: dictionary
+        :param in_memory: boolean
+        :param probe_arguments: tuple, the sensitive column, known data, k, batch size and number of buckets of the
+            probes
+        """
+        global _attacker_arguments, _attacker, _probe_arguments
+        _attacker_arguments = (workspace, attacker_type, synthesizer_type, sensitive_dataset_path, schema,
+                               sensitive_analysis, synthesis_config, in_memory)
+        _attacker = None
+        _probe_arguments = probe_arguments
+
+    @staticmethod
+    def _worker_attacker():
+        """
+        Returns the attacker of the worker process, creating it on first use from the arguments given by the pool's
+            initializer and synthesizing once; such that only workers given a task synthesize, and the initial
+            synthesis is counted along with their first task.
+
+        :return: NaiveAttacker
+        """
+        global _attacker
+        if _attacker is not None:
+            return _attacker
+
+        workspace, attacker_type, synthesizer_type, sensitive_dataset_path, schema, sensitive_analysis, \
+            synthesis_config, in_memory = _attacker_arguments
+        WorkspaceUtil.isolate(workspace, "worker_" + str(os.getpid()))
+
+        sensitive_dataset_file = SensitiveDatasetFile(in_memory=in_memory)
+        synthetic_dataset_file = SyntheticDatasetFile(in_memory=in_memory)
+        sensitive_dataset_file.schema = schema
+        synthetic_dataset_file.schema = schema
+        sensitive_dataset_file.write(pd.read_pickle(sensitive_dataset_path))
+
+        synthesis_config_file = SynthesisConfigFile(sensitive_dataset_file, synthetic_dataset_file)
+        synthesis_config_file.write(synthesis_config)
+        synthesizer = synthesizer_type(synthesis_config_file)
+        synthesizer.synthesize(aggregate=True, generate=True)
+
+        _attacker = attacker_type(sensitive_dataset_file, synthetic_dataset_file, sensitive_analysis, synthesizer,
+                                  speculative_workers=1)
+        return _attacker
+
+    @staticmethod
+    def _probe(values: list, weights: list):
+        """
+        Probes the given potential values using the worker's attacker, as a single bucket (given the weights of the
+            values) if buckets are probed, and returns the values that leaked along with the number of syntheses used
+            (including the initial synthesis of the worker for its first task).
+
+        :param values: list of objects
+        :param weights: list of numerical
+        :return: tuple of list and int
+        """
+        profiler.reset()
+        sensitive_col, known_data, k, batch_size, buckets = _probe_arguments
+        rounds = _attacker.synthesizer.rounds if _attacker is not None else 0
+        attacker = SpeculativeProber._worker_attacker()
+        if buckets > 1:
+            leaked_values = attacker.probe_bucket(sensitive_col, known_data, values, k, buckets, weights)
+        else:
+            leaked_values = attacker.probe_candidates(sensitive_col, known_data, values, k, batch_size=batch_size)
+        return leaked_values, attacker.synthesizer.rounds - rounds
+
+    def probe(self, sensitive_col, known_data, values, k, batch_size=1, scheduler=None, buckets=1):
+        """
+        Probes the given potential values of the target's sensitive column in parallel, batch_size values per synthesis
+            (see NaiveAttacker.probe_candidates), and returns the values that leaked in the order of values. The
+            syntheses of the workers (including their initial synthesis) are added to the rounds of the attacker's
+            synthesizer. If a CandidateScheduler is given, the completed tasks are reported to it, and the pending
+            tasks are cancelled once it is confident.
+        Completed tasks are recorded in the attack state of the attacker; tasks recorded by an interrupted attack are
+            replayed rather than probed again (see NaiveAttacker.recorded_task).
+        If buckets is greater than one, each task is instead a quantile bucket of the values (given the scheduler),
+            probed by the worker (see NaiveAttacker.probe_bucket).
+
+        :param sensitive_col: string
+        :param known_data: list of strings
+        :param values: list of objects
+        :param k: int
+        :param batch_size: int
+        :param scheduler: CandidateScheduler
+        :param buckets: int
+        :return: list of objects
+        """
+        attacker = self.attacker
+        synthesis_config_file = attacker.synthesizer.synthesis_config_file
+
+        # The workers start from the current version of the sensitive dataset (including the injections of k)
+        attacker.sensitive_dataset_store.materialize()
+        sensitive_dataset = attacker.sensitive_dataset_file.read()
+        sensitive_dataset.index.name = "ID"
+        synthesis_config = {key: value for key, value in synthesis_config_file.config_template.items()
+                            if key not in self.LOCAL_CONFIGS}
+
+        # Divide the cores between the workers, such that SDS's own parallel jobs do not oversubscribe them
+        synthesis_config["parallel_jobs"] = max(1, (os.cpu_count() or 1) // self.workers)
+
+        weights = scheduler.priors(values) if scheduler is not None else np.ones(len(values))
+        step = max(1, batch_size)
+        if buckets > 1:
+            bounds = CandidateDomain.quantiles(weights, buckets)
+        else:
+            bounds = [(start, start + step) for start in range(0, len(values), step)]
+        batches = [(list(values[start:stop]), weights[start:stop]) for start, stop in bounds]
+        logger.info("Probing speculatively; " + str(len(values)) + " potential values in " + str(len(batches)) +
+                    " tasks using " + str(self.workers) + " workers")
+
+        workspace = "Speculation_" + config["GENERAL"]["name"]
+        sensitive_dataset_path = os.path.join(WorkspaceUtil.root_dir(), workspace, self.SENSITIVE_DATASET_FILENAME)
+        initargs = (workspace, type(attacker), type(attacker.synthesizer), sensitive_dataset_path,
+                    attacker.sensitive_dataset_file.schema, attacker.sensitive_analysis, synthesis_config,
+                    attacker.sensitive_dataset_file.in_memory, (sensitive_col, known_data, k, step, buckets))
+
+        leaks, syntheses, cancelled = {}, 0, 0
+
+        def complete(index, leaked_values, task_syntheses):
+            # Report a completed task, and return whether enough leaking candidates are found or the scheduler is
+            # confident
+            nonlocal syntheses
+            leaks[index] = leaked_values
+            syntheses += task_syntheses
+            if scheduler is not None:
+                scheduler.observe(batches[index][0], leaked_values)
+            return 0 < self.max_leaks <= sum(len(leaked) for leaked in leaks.values()) or \
+                (scheduler is not None and scheduler.is_confident())
+
+        # Replay the tasks recorded by an interrupted attack, only submitting the others to the workers
+        pending, is_done = [], False
+        for index, batch in enumerate(batches):
+            recorded = attacker.recorded_task(batch[0])
+            if recorded is None:
+                pending.append(index)
+            else:
+                is_done |= complete(index, *recorded)
+        if is_done:
+            cancelled, pending = len(pending), []
+
+        if len(pending) > 0:
+            # Hand the sensitive dataset to the workers by a file, rather than pickling it into the arguments of each
+            os.makedirs(os.path.dirname(sensitive_dataset_path), exist_ok=True)
+            sensitive_dataset.to_pickle(sensitive_dataset_path)
+            executor = ProcessPoolExecutor(max_workers=min(self.workers, len(pending)),
+                                           initializer=SpeculativeProber._initialize_worker,
+                                           initargs=initargs)
+            try:
+                futures = {executor.submit(SpeculativeProber._probe, *batches[index]): index for index in pending}
+                for future in as_completed(futures):
+                    leaked_values, task_syntheses = future.result()
+                    attacker.record_task(batches[futures[future]][0], leaked_values, task_syntheses)
+
+                    # Cancel the pending tasks once enough leaking candidates are found, or the scheduler is confident
+                    if complete(futures[future], leaked_values, task_syntheses):
+                        cancelled = sum(future.cancel() for future in futures)
+                        break
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+                os.remove(sensitive_dataset_path)
+
+        attacker.synthesizer.resume(attacker.synthesizer.rounds + syntheses)
+        profiler.count("speculative_syntheses", syntheses)
+        if cancelled > 0:
+            logger.info("Cancelled speculative probing; found " + str(sum(len(leaked) for leaked in leaks.values())) +
+                        " leaking values, skipping " + str(cancelled) + " tasks")
+
+        return [value for index in sorted(leaks) for value in leaks[index]]
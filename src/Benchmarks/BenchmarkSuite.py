@@ -0,0 +1,242 @@
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from Utils.LoggerUtil import LoggerUtil
+from Utils.ConfigUtil import ConfigUtil
+from Utils.ProfilerUtil import ProfilerUtil
+from Utils.SamplerUtil import SamplerUtil
+from Utils.WorkspaceUtil import WorkspaceUtil
+from File.SensitiveDatasetFile import SensitiveDatasetFile
+from File.SynthesisConfigFile import SynthesisConfigFile
+from File.SyntheticDatasetFile import SyntheticDatasetFile
+from Analyzers.SensitiveAnalyzer import SensitiveAnalyzer
+from Analyzers.SyntheticAnalyzer import SyntheticAnalyzer
+from Attackers.NaiveAttacker import NaiveAttacker
+from Attackers.PayloadBuilder import PayloadBuilder
+from Synthesizers.KAnonymitySynthesizer import KAnonymitySynthesizer
+from Benchmarks.NISTDataGenerator import NISTDataGenerator
+
+logger = LoggerUtil.instance()
+config = ConfigUtil.instance()
+profiler = ProfilerUtil.instance()
+
+
+class BenchmarkSuite:
+    """
+    A class for benchmarking the startup of the CLI and of workers, and the stages of the pipeline (sampling, analyses,
+        payload construction and the attack-loop) at several sizes, on generated NIST-shaped data and using the
+        KAnonymitySynthesizer, such that neither the SDS libraries nor the NIST dataset are required. Results can be
+        saved as a baseline, and compared against one to detect regressions.
+    Run from the src directory: python -m Benchmarks.BenchmarkSuite [--save-baseline] [--compare]
+
+    Methods: run(), save(), compare()
+    """
+    # The (n, m, k) sizes benchmarked; the number of rows, columns and the privacy resolution
+    SIZES = [(1000, 6, 4), (5000, 8, 8), (20000, 10, 12)]
+
+    # The sensitive attribute attacked (among the first 6 columns of the generated data)
+    SENSITIVE_ATTRIBUTE = "MSP"
+
+    # The number of rows of the generated dataset sampled from
+    DATASET_ROWS = 100000
+
+    # The number of potential values of the payload range benchmarked
+    RANGE_SIZE = 1000
+
+    # The reference baseline of the results, tracked next to the suite
+    BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+    # The commands whose startup (in a fresh interpreter) is benchmarked; the CLI, and the imports of a campaign worker
+    STARTUP_COMMANDS = {"startup_cli": ["SDS-attack-pipeline.py", "--help"],
+                        "startup_worker": ["-c", "from Attackers.CampaignRunner import CampaignRunner"]}
+
+    def __init__(self, sizes=None, repeats=5, seed=0):
+        """
+        Initializes a BenchmarkSuite given the sizes to benchmark (SIZES if None), the number of repeats of each
+            benchmark and the seed of the generated data and samples.
+        """
+        self.sizes = sizes if sizes is not None else self.SIZES
+        self.repeats = repeats
+        self.seed = seed
+
+    def __measure(self, function, setup=None):
+        """
+        Measures the wall time of function over the configured number of repeats, calling setup (untimed) before each
+            repeat and passing its result to function. Returns the minimum and median in seconds.
+
+        :param function: function
+        :param setup: function
+        :return: dictionary
+        """
+        timings = []
+        for _ in range(self.repeats):
+            arguments = setup() if setup is not None else None
+            start = time.perf_counter()
+            function(arguments)
+            timings.append(time.perf_counter() - start)
+        return {"min": min(timings), "median": statistics.median(timings)}
+
+    def __setup_attack(self, sample, k):
+        """
+        Writes the sample as sensitive dataset held in memory, analyzes and synthesizes it using the
+            KAnonymitySynthesizer, and returns the resulting NaiveAttacker.
+
+        :param sample: dataframe
+        :param k: int
+        :return: NaiveAttacker
+        """
+        sensitive_dataset_file = SensitiveDatasetFile(in_memory=True)
+        synthetic_dataset_file = SyntheticDatasetFile(in_memory=True)
+        sensitive_dataset_file.write(sample)
+        sensitive_analysis = SensitiveAnalyzer(sensitive_dataset_file).analyze(sample)
+
+        synthesis_config_file = SynthesisConfigFile(sensitive_dataset_file, synthetic_dataset_file)
+        synthesizer = KAnonymitySynthesizer(synthesis_config_file)
+        synthesizer.synthesis_config_file.write({"reporting_resolution": k, "synthesis_mode": "row_seeded"})
+        synthesizer.synthesize(aggregate=True, generate=True)
+
+        return NaiveAttacker(sensitive_dataset_file, synthetic_dataset_file, sensitive_analysis, synthesizer)
+
+    def __benchmark_startup(self):
+        """
+        Runs the startup benchmarks, each in a fresh interpreter from the src directory, and returns the timings by
+            benchmark name.
+
+        :return: dictionary
+        """
+        src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return {name: self.__measure(lambda _, arguments=arguments: subprocess.run(
+                    [sys.executable] + arguments, cwd=src_dir, check=True, stdout=subprocess.DEVNULL))
+                for name, arguments in self.STARTUP_COMMANDS.items()}
+
+    def __benchmark_size(self, n, m, k):
+        """
+        Runs every benchmark at the given size and returns the timings by benchmark name.
+
+        :param n: int
+        :param m: int
+        :param k: int
+        :return: dictionary
+        """
+        results = {}
+
+        sampler = SamplerUtil()
+        results["sample"] = self.__measure(lambda _: sampler.sample(n=n, m=m, streaming=False, cache=False))
+        results["sample_streaming"] = self.__measure(lambda _: sampler.sample(n=n, m=m, streaming=True, cache=False))
+        results["sample_cached"] = self.__measure(lambda _: sampler.sample(n=n, m=m, cache=True))
+        sample = sampler.sample(n=n, m=m, seed=self.seed).reset_index(drop=True)
+
+        sensitive_dataset_file = SensitiveDatasetFile(in_memory=True)
+        sensitive_dataset_file.write(sample)
+        results["sensitive_analysis"] = self.__measure(
+            lambda _: SensitiveAnalyzer(sensitive_dataset_file).analyze(sample))
+
+        # Payload construction and leak checks on the synthesized sample, for the first record as target
+        attacker = self.__setup_attack(sample, k)
+        known_data = sample.iloc[0]
+        value = known_data[self.SENSITIVE_ATTRIBUTE]
+        results["payload_construction"] = self.__measure(
+            lambda _: PayloadBuilder(attacker.sensitive_analysis, known_data, self.SENSITIVE_ATTRIBUTE).build([value], k))
+
+        # A block of payloads for a range of RANGE_SIZE potential values, from a builder constructed once per target
+        builder = PayloadBuilder(attacker.sensitive_analysis, known_data, self.SENSITIVE_ATTRIBUTE)
+        results["payload_range_construction"] = self.__measure(
+            lambda _: builder.build(range(self.RANGE_SIZE), k))
+
+        payload = builder.build([value], k)
+        attacker.synthesizer.resynthesize()
+        results["synthetic_analysis"] = self.__measure(
+            lambda _: SyntheticAnalyzer(attacker.synthetic_dataset_file).analyze(payload))
+
+        # The full attack-loop, on a freshly synthesized sample each repeat
+        results["attack_loop"] = self.__measure(
+            lambda naive_attacker: naive_attacker.attack_loop(sensitive_col=self.SENSITIVE_ATTRIBUTE),
+            setup=lambda: self.__setup_attack(sample, k))
+
+        return results
+
+    def run(self):
+        """
+        Runs the benchmarks at every configured size, in a workspace of their own on generated data, and returns the
+            timings by benchmark name and size.
+
+        :return: dictionary
+        """
+        WorkspaceUtil.isolate("Benchmark")
+        dataset_path = os.path.join(config["GENERAL"]["root_dir"], "nist_generated.csv")
+        NISTDataGenerator(seed=self.seed).write(dataset_path, self.DATASET_ROWS)
+        config["SENSITIVE"]["dataset_path"] = dataset_path
+
+        # Disable the profiler such that only the pipeline itself is measured
+        profiler.enabled = False
+
+        results = self.__benchmark_startup()
+        for n, m, k in self.sizes:
+            logger.info("Benchmarking n=" + str(n) + ", m=" + str(m) + ", k=" + str(k))
+            for name, timing in self.__benchmark_size(n, m, k).items():
+                results[name + "[n=" + str(n) + ",m=" + str(m) + ",k=" + str(k) + "]"] = timing
+        return results
+
+    @staticmethod
+    def save(results: dict, path: str):
+        """
+        Saves the results as a baseline at path (JSON).
+
+        :param results: dictionary
+        :param path: string
+        """
+        with open(path, "w") as file:
+            json.dump(results, file, indent=2)
+        logger.info("Saved benchmark baseline; " + path)
+
+    @staticmethod
+    def compare(results: dict, path: str, tolerance=0.25):
+        """
+        Compares the results against the baseline at path, and returns the names of the benchmarks whose median is
+            more than tolerance (a fraction) slower than in the baseline.
+
+        :param results: dictionary
+        :param path: string
+        :param tolerance: float
+        :return: list of strings
+        """
+        with open(path, "r") as file:
+            baseline = json.load(file)
+
+        regressions = []
+        for name, timing in results.items():
+            if name not in baseline:
+                continue
+            ratio = timing["median"] / max(baseline[name]["median"], 1e-9)
+            if ratio > 1 + tolerance:
+                regressions.append(name)
+                logger.warning("Regression; " + name + " is " + str(round(ratio, 2)) + "x the baseline median")
+        return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmarks of the pipeline using a stand-in synthesizer.")
+    parser.add_argument("--repeats", type=int, default=5, help="number of repeats of each benchmark")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the generated data")
+    parser.add_argument("--save-baseline", nargs="?", const=BenchmarkSuite.BASELINE_PATH,
+                        help="path to save the results as a baseline at")
+    parser.add_argument("--compare", nargs="?", const=BenchmarkSuite.BASELINE_PATH,
+                        help="path to a baseline to compare the results against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown relative to the baseline, as a fraction")
+    arguments = parser.parse_args()
+
+    benchmark_results = BenchmarkSuite(repeats=arguments.repeats, seed=arguments.seed).run()
+    for benchmark_name, benchmark_timing in benchmark_results.items():
+        print(benchmark_name + ": min " + str(round(benchmark_timing["min"], 5)) + "s, median " +
+              str(round(benchmark_timing["median"], 5)) + "s")
+
+    if arguments.save_baseline is not None:
+        BenchmarkSuite.save(benchmark_results, arguments.save_baseline)
+    if arguments.compare is not None:
+        if len(BenchmarkSuite.compare(benchmark_results, arguments.compare, arguments.tolerance)) > 0:
+            sys.exit(1)
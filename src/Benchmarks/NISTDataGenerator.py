@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+
+class NISTDataGenerator:
+    """
+    A class for generating synthetic datasets shaped like the NIST diverse communities data excerpts (national), i.e.
+        with the same columns, domains and 'N' markers for missing values, for use where the NIST dataset is not
+        available (e.g. benchmarks). Values are drawn independently per column (with a few dependencies on age), so the
+        data is only realistic in shape.
+
+    Methods: generate(), write()
+    """
+    # Columns of the NIST excerpts and the (inclusive) ranges of their integer domains
+    DOMAINS = {
+        "PUMA": (1, 30), "AGEP": (0, 99), "SEX": (1, 2), "MSP": (1, 6), "HISP": (1, 24), "RAC1P": (1, 9),
+        "NOC": (0, 12), "NPF": (1, 20), "HOUSING_TYPE": (1, 3), "OWN_RENT": (0, 2), "DENSITY": (1, 4),
+        "INDP": (170, 9920), "INDP_CAT": (0, 19), "EDU": (1, 12), "PINCP": (-10000, 1000000), "PINCP_DECILE": (0, 9),
+        "POVPIP": (0, 501), "DVET": (1, 5), "DREM": (1, 2), "DPHY": (1, 2), "DEYE": (1, 2), "PWGTP": (1, 500),
+        "WGTP": (1, 500)
+    }
+
+    # Columns only applicable to adults (missing, 'N', for records below the age of 16)
+    ADULT_COLUMNS = ("MSP", "INDP", "INDP_CAT", "EDU", "PINCP", "PINCP_DECILE", "DVET", "DREM")
+
+    def __init__(self, seed=None):
+        """
+        Initializes a NISTDataGenerator using an optional seed for reproducibility.
+        """
+        self.seed = seed
+
+    def generate(self, n: int):
+        """
+        Generates a dataset of n records, with missing values as NaN.
+
+        :param n: integer
+        :return: dataframe
+        """
+        rng = np.random.default_rng(self.seed)
+
+        data = {}
+        for col, (minimum, maximum) in self.DOMAINS.items():
+            if col in ("PINCP", "INDP", "POVPIP"):
+                # Wide ranged columns are skewed, and take on a limited number of distinct values
+                values = np.round(rng.lognormal(mean=0.0, sigma=1.0, size=n) * (maximum - minimum) / 20 + minimum, -2)
+                data[col] = np.clip(values, minimum, maximum).astype(np.int64)
+            else:
+                # Small domains are skewed towards their smallest values
+                weights = 1.0 / np.arange(1, maximum - minimum + 2)
+                data[col] = rng.choice(np.arange(minimum, maximum + 1), size=n, p=weights / weights.sum())
+        data["AGEP"] = rng.integers(0, 100, size=n)
+
+        dataset = pd.DataFrame(data)
+        dataset.loc[dataset["AGEP"] < 16, list(self.ADULT_COLUMNS)] = np.nan
+        return dataset
+
+    def write(self, path: str, n: int):
+        """
+        Generates a dataset of n records and writes it to a CSV file at path, with missing values as 'N' (as in the
+            NIST excerpts).
+
+        :param path: string
+        :param n: integer
+        """
+        self.generate(n).to_csv(path, index=False, na_rep="N")
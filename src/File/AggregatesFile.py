@@ -0,0 +1,91 @@
+import os.path
+import pandas as pd
+from File.File import File
+from Utils.LoggerUtil import LoggerUtil
+from Utils.ConfigUtil import ConfigUtil
+from Utils.ProfilerUtil import ProfilerUtil
+
+logger = LoggerUtil.instance()
+config = ConfigUtil.instance()
+profiler = ProfilerUtil.instance()
+
+
+class AggregatesFile(File):
+    """
+    AggregatesFile a concrete File class, allowing reading and writing of the reportable aggregates of the first
+        synthesis (TSV files written by SDS next to the synthetic microdata); the counts of the combinations of
+        attribute values meeting the reporting_resolution, rounded down to a multiple of it.
+    """
+
+    def __init__(self, in_memory=False, existing_path=None):
+        """
+        Initializes an AggregatesFile object using a TSV file extension, next to the synthetic dataset unless an
+            existing_path is given (e.g. the aggregates in the output directory of a synthesis in memory).
+        If in_memory is set, aggregates written to the object are held in memory and never written to the file.
+        """
+        if existing_path is None:
+            existing_path = config["GENERAL"]["root_dir"] + "SyntheticDataset" + os.path.sep \
+                + config["GENERAL"]["name"] + "_reportable_aggregates" + ".tsv"
+        super().__init__(existing_path=existing_path)
+
+        self.in_memory = in_memory
+
+        # The aggregates written to the object, if any
+        self.__dataframe = None
+
+    def exists(self):
+        """
+        Checks if aggregates have been written to the object or the file.
+
+        :return: boolean
+        """
+        if self.in_memory:
+            return self.__dataframe is not None
+        return self.__dataframe is not None or os.path.isfile(self.path)
+
+    @profiler.timed("aggregates_read")
+    def read(self):
+        """
+        Reads the AggregatesFile and returns the aggregates as a pandas dataframe of selections (formatted as
+            'column:value;...') and counts; other rows of the file (e.g. the totals reported by SDS) are skipped.
+
+        :return: dataframe
+        """
+        if self.__dataframe is not None:
+            logger.debug("Performed read on aggregates; in memory")
+            return self.__dataframe
+
+        # Check if the file exists
+        self._exists()
+
+        # The selections are the first column of the file, and the (protected) counts the last
+        dataframe = pd.read_csv(self.path, sep="\t", dtype=str, keep_default_na=False)
+        dataframe = pd.DataFrame({"selections": dataframe.iloc[:, 0],
+                                  "count": pd.to_numeric(dataframe.iloc[:, -1], errors="coerce")})
+        dataframe = dataframe[dataframe["selections"].str.contains(":", regex=False) & dataframe["count"].notna()]
+        dataframe = dataframe.astype({"count": "int64"}).reset_index(drop=True)
+
+        logger.debug("Performed read on aggregates; " + self.path + ". Read " + str(dataframe.shape[0]) + " rows")
+        return dataframe
+
+    @profiler.timed("aggregates_write")
+    def write(self, dataframe: pd.DataFrame):
+        """
+        Writes the given aggregates (selections and counts), keeping them in memory for later reads and writing them to
+            the TSV file unless in_memory is set.
+
+        :param dataframe: pandas dataframe
+        """
+        self.__dataframe = dataframe
+
+        if self.in_memory:
+            logger.debug("Performed write on aggregates; in memory. Wrote " + str(dataframe.shape[0]) + " rows")
+            return
+
+        os.makedirs(self._directory, exist_ok=True)
+        dataframe.to_csv(self.path, sep="\t", index=False)
+
+        logger.debug("Performed write on aggregates; " + self.path + ". Wrote " + str(dataframe.shape[0]) + " rows")
+
+    def change_file(self):
+        pass
@@ -0,0 +1,85 @@
+import os
+import json
+import shutil
+from File.File import File
+from Utils.LoggerUtil import LoggerUtil
+from Utils.ConfigUtil import ConfigUtil
+from Utils.ProfilerUtil import ProfilerUtil
+
+logger = LoggerUtil.instance()
+config = ConfigUtil.instance()
+profiler = ProfilerUtil.instance()
+
+
+class AttackStateFile(File):
+    """
+    AttackStateFile a concrete File class, allowing reading and writing of the progress of an attack (JSON files), such
+        that an interrupted attack can be resumed. Writes are atomic; the file always holds either the previous or the
+        new state, even if the process is killed mid-write.
+    The results of the first synthesis of the attack are kept next to the file in synthesis_dir (see SynthesisCache),
+        such that a resumed attack restores them instead of synthesizing again.
+    """
+
+    def __init__(self):
+        """
+        Initializes an AttackStateFile object using a JSON file extension. Unlike other Files, an existing state is kept
+            (not truncated), such that it can be resumed.
+        """
+        directory = os.path.join(config["GENERAL"]["root_dir"], "AttackState")
+        os.makedirs(directory, exist_ok=True)
+        super().__init__(existing_path=os.path.join(directory, config["GENERAL"]["name"] + ".json"))
+        self.synthesis_dir = os.path.join(directory, config["GENERAL"]["name"] + "_synthesis")
+
+    def exists(self):
+        """
+        Checks if a state has been written to the file.
+
+        :return: boolean
+        """
+        return os.path.isfile(self.path)
+
+    def read(self):
+        """
+        Reads the JSON file and returns the state of the attack as a dictionary.
+
+        :return: dictionary
+        """
+        # Check if the file exists
+        self._exists()
+
+        with open(self.path, "r") as file:
+            state = json.load(file)
+
+        logger.debug("Performed read on attack state; " + self.path)
+        return state
+
+    @profiler.timed("state_write")
+    def write(self, state: dict):
+        """
+        Writes the state of the attack by overwriting the file atomically; the state is written and flushed to a
+            temporary file, which then replaces the file.
+
+        :param state: dictionary
+        """
+        temporary_path = self.path + "." + str(os.getpid()) + ".tmp"
+        with open(temporary_path, "w") as file:
+            json.dump(state, file, default=str)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, self.path)
+
+        logger.debug("Performed write on attack state; " + self.path + ". Recorded " + str(len(state.get("rounds", [])))
+                     + " rounds")
+
+    def reset(self, state: dict):
+        """
+        Starts a new attack with the given state, discarding the results of the first synthesis kept for a previous
+            attack.
+
+        :param state: dictionary
+        """
+        shutil.rmtree(self.synthesis_dir, ignore_errors=True)
+        self.write(state)
+
+    def change_file(self):
+        pass
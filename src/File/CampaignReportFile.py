@@ -0,0 +1,50 @@
+import pandas as pd
+from File.File import File
+from Utils.LoggerUtil import LoggerUtil
+from Utils.ConfigUtil import ConfigUtil
+
+logger = LoggerUtil.instance()
+config = ConfigUtil.instance()
+
+
+class CampaignReportFile(File):
+    """
+    CampaignReportFile a concrete File class, allowing reading and writing of attack campaign reports (CSV files).
+    """
+
+    def __init__(self):
+        """
+        Initializes a CampaignReportFile object using a CSV file extension.
+        """
+        super().__init__(file_extension=".csv")
+
+    def read(self):
+        """
+        Reads a CSV and returns its content as a pandas dataframe.
+
+        :return: dataframe
+        """
+        # Check if the file exists
+        self._exists()
+
+        dataframe = pd.read_csv(self.path)
+
+        logger.debug("Performed read on campaign report; " + self.path)
+        return dataframe
+
+    def write(self, dataframe: pd.DataFrame):
+        """
+        Writes a given dataframe onto an existing CSV by overwriting existing data.
+
+        :param dataframe: pandas dataframe
+        """
+        # Check if the file exists
+        self._exists()
+
+        dataframe.to_csv(self.path, index=False)
+
+        logger.debug("Performed write on campaign report; " + self.path + ". Wrote " + str(dataframe.shape[0]) +
+                     " rows")
+
+    def change_file(self):
+        pass
@@ -0,0 +1,220 @@
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+from File.File import File
+from Utils.LoggerUtil import LoggerUtil
+from Utils.ConfigUtil import ConfigUtil
+from Utils.ProfilerUtil import ProfilerUtil
+
+logger = LoggerUtil.instance()
+config = ConfigUtil.instance()
+profiler = ProfilerUtil.instance()
+
+
+class DatasetCacheFile(File):
+    """
+    DatasetCacheFile a concrete File class, allowing a CSV dataset to be converted once into a columnar cache (a raw
+        binary file per column, read through memory maps) and read back by columns and rows without parsing the CSV.
+    The cache is described by a JSON file keyed by the source's path, size, modification time and hash; it is rebuilt
+        when the source changes. Each source has a directory of its own, named by its basename and a hash of its absolute
+        path, such that sources of the same name in other directories do not share a cache.
+    """
+
+    def __init__(self, dataset_path: str, chunk_size=100000):
+        """
+        Initializes a DatasetCacheFile object for the CSV dataset at dataset_path, in the configured cache_dir (or next
+            to the dataset if not set).
+        """
+        self.dataset_path = os.path.abspath(dataset_path)
+        self.chunk_size = chunk_size
+
+        cache_dir = config["SENSITIVE"]["cache_dir"] or os.path.dirname(self.dataset_path)
+        name = os.path.basename(self.dataset_path).rsplit(".", 1)[0]
+        path_hash = hashlib.blake2b(self.dataset_path.encode(), digest_size=8).hexdigest()
+        directory = os.path.join(cache_dir, name + "_" + path_hash + "_cache")
+        os.makedirs(directory, exist_ok=True)
+        super().__init__(existing_path=os.path.join(directory, name + ".json"))
+
+        # The description of the cache; its source, columns and row count (None until read or written)
+        self.__meta = None
+
+    def __hash_source(self):
+        """
+        Hashes the content of the source dataset.
+
+        :return: string
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        with open(self.dataset_path, "rb") as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def __column_path(self, index: int):
+        """
+        Returns the path of the binary file holding the column at index.
+
+        :param index: int
+        :return: string
+        """
+        return self._directory + self._filename + "_" + str(index) + ".bin"
+
+    def is_valid(self):
+        """
+        Checks if the cache exists and matches the source dataset; by path, size and modification time, falling back on
+            the hash of the source if only the modification time differs (e.g. the source was touched or copied).
+
+        :return: boolean
+        """
+        if not os.path.isfile(self.path):
+            return False
+        with open(self.path, "r") as file:
+            meta = json.load(file)
+
+        stat = os.stat(self.dataset_path)
+        if meta["source"] != self.dataset_path or meta["size"] != stat.st_size:
+            return False
+        if meta["mtime_ns"] != stat.st_mtime_ns:
+            if meta["hash"] != self.__hash_source():
+                return False
+
+            # Record the new modification time, such that the source is not hashed again
+            meta["mtime_ns"] = stat.st_mtime_ns
+            self.__write_meta(meta)
+
+        self.__meta = meta
+        return True
+
+    def __write_meta(self, meta: dict):
+        """
+        Writes the description of the cache, replacing the previous one atomically.
+
+        :param meta: dictionary
+        """
+        temporary_path = self.path + "." + str(os.getpid()) + ".tmp"
+        with open(temporary_path, "w") as file:
+            json.dump(meta, file)
+        os.replace(temporary_path, self.path)
+
+    @profiler.timed("cache_write")
+    def write(self):
+        """
+        Converts the source dataset into the cache, reading it in chunks; numerical columns are stored as floats
+            (marked as integers if they only hold integers, as read_csv would parse them), other columns as codes into
+            their categories (with -1 for missing values).
+        """
+        stat = os.stat(self.dataset_path)
+        header = list(pd.read_csv(self.dataset_path, nrows=0).columns)
+        head = pd.read_csv(self.dataset_path, na_values='N', nrows=self.chunk_size)
+        is_numerical = [pd.api.types.is_numeric_dtype(head[col]) for col in header]
+        dtypes = {col: np.float64 if numerical else object for col, numerical in zip(header, is_numerical)}
+
+        # Write each column to a temporary file of its own, such that concurrent builds do not collide
+        suffix = "." + str(os.getpid()) + ".tmp"
+        files = [open(self.__column_path(index) + suffix, "wb") for index in range(len(header))]
+        categories = [{} for _ in header]
+        is_integer = list(is_numerical)
+
+        rows = 0
+        try:
+            for chunk in pd.read_csv(self.dataset_path, dtype=dtypes, na_values='N', chunksize=self.chunk_size):
+                for index, col in enumerate(header):
+                    values = chunk[col].to_numpy()
+                    if is_numerical[index]:
+                        is_integer[index] = is_integer[index] and bool(np.all(np.mod(values, 1) == 0))
+                        files[index].write(values.astype(np.float64).tobytes())
+                    else:
+                        # Encode values into the categories seen so far, adding unseen values
+                        is_missing = pd.isna(values)
+                        codes = np.full(values.shape[0], -1, dtype=np.int32)
+                        for value in pd.unique(values[~is_missing]):
+                            categories[index].setdefault(value, len(categories[index]))
+                        codes[~is_missing] = [categories[index][value] for value in values[~is_missing]]
+                        files[index].write(codes.tobytes())
+                rows += chunk.shape[0]
+        finally:
+            for file in files:
+                file.close()
+
+        for index in range(len(header)):
+            os.replace(self.__column_path(index) + suffix, self.__column_path(index))
+
+        self.__meta = {
+            "source": self.dataset_path, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+            "hash": self.__hash_source(), "rows": rows,
+            "columns": [{"name": col, "numerical": is_numerical[index], "integer": is_integer[index],
+                         "categories": list(categories[index])} for index, col in enumerate(header)]
+        }
+        self.__write_meta(self.__meta)
+
+        logger.info("Cached dataset; " + self.dataset_path + " as " + str(rows) + " rows by " + str(len(header)) +
+                    " columns at " + self._directory)
+
+    def load(self):
+        """
+        Ensures the cache matches the source dataset, (re)building it if not.
+        """
+        if not self.is_valid():
+            self.write()
+
+    @property
+    def rows(self):
+        """
+        A getter for the number of rows of the cached dataset.
+
+        :return: int
+        """
+        if self.__meta is None:
+            self.load()
+        return self.__meta["rows"]
+
+    @property
+    def columns(self):
+        """
+        A getter for the names of the cached columns, in the order of the source dataset.
+
+        :return: list of strings
+        """
+        if self.__meta is None:
+            self.load()
+        return [column["name"] for column in self.__meta["columns"]]
+
+    @profiler.timed("cache_read")
+    def read(self, columns=None, positions=None):
+        """
+        Reads the given columns (all if None) at the given row positions (all if None) from the cache, only touching
+            the pages holding them. The positions are kept as index.
+
+        :param columns: list of strings
+        :param positions: numpy array of integers
+        :return: dataframe
+        """
+        columns = columns if columns is not None else self.columns
+
+        data = {}
+        for col in columns:
+            index = self.columns.index(col)
+            column = self.__meta["columns"][index]
+            dtype = np.float64 if column["numerical"] else np.int32
+            mapped = np.memmap(self.__column_path(index), dtype=dtype, mode="r", shape=(self.rows,))
+            values = np.array(mapped if positions is None else mapped[positions])
+
+            if not column["numerical"]:
+                # Decode the categories, mapping -1 to missing values
+                categories = np.array(column["categories"] + [np.nan], dtype=object)
+                values = categories[values]
+            elif column["integer"]:
+                values = values.astype(np.int64)
+            data[col] = values
+
+        index = np.arange(self.rows) if positions is None else positions
+        dataframe = pd.DataFrame(data, index=pd.Index(index, name="ID"))
+
+        logger.debug("Performed read on dataset cache; " + str(dataframe.shape[0]) + " rows by " +
+                     str(dataframe.shape[1]) + " columns")
+        return dataframe
+
+    def change_file(self):
+        pass
@@ -0,0 +1,54 @@
+import json
+from File.File import File
+from Utils.LoggerUtil import LoggerUtil
+from Utils.ConfigUtil import ConfigUtil
+from Utils.ProfilerUtil import ProfilerUtil
+
+logger = LoggerUtil.instance()
+config = ConfigUtil.instance()
+
+
+class ProfileFile(File):
+    """
+    ProfileFile a concrete File class, allowing reading and writing of the profiles recorded by ProfilerUtil (JSON files,
+        either as a summary with events or in the Chrome trace format).
+    """
+
+    def __init__(self):
+        """
+        Initializes a ProfileFile object using a JSON file extension.
+        """
+        super().__init__(file_extension=".json")
+
+    def read(self):
+        """
+        Reads a JSON file and returns its content as a dictionary.
+
+        :return: dictionary
+        """
+        # Check if the file exists
+        self._exists()
+
+        # Open and read the file
+        file = open(self.path, "r")
+        data = json.load(file)
+        file.close()
+
+        logger.debug("Performed read on profile; " + self.path)
+        return data
+
+    def write(self, trace_format="json"):
+        """
+        Writes the profile recorded by ProfilerUtil onto an existing JSON file by overwriting existing data.
+
+        :param trace_format: string, either 'json' or 'chrome'
+        """
+        # Check if the file exists
+        self._exists()
+
+        ProfilerUtil.instance().export(self.path, trace_format=trace_format)
+
+        logger.debug("Performed write on profile; " + self.path)
+
+    def change_file(self):
+        pass
@@ -1,10 +1,14 @@
+import os
 import pandas as pd
 from File.File import File
 from Utils.LoggerUtil import LoggerUtil
 from Utils.ConfigUtil import ConfigUtil
+from Utils.ProfilerUtil import ProfilerUtil
+from Utils.DtypeUtil import DtypeUtil
 
 logger = LoggerUtil.instance()
 config = ConfigUtil.instance()
+profiler = ProfilerUtil.instance()
 
 
 class SensitiveDatasetFile(File):
@@ -12,42 +16,119 @@ class SensitiveDatasetFile(File):
     SensitiveDatasetFile a concrete File class, allowing reading and writing to sensitive datasets (CSV files).
     """
 
-    def __init__(self):
+    def __init__(self, in_memory=False):
         """
         Initializes a SensitiveDatasetFile object using a CSV file extension.
+        If in_memory is set, the dataset is held in memory and never written to the file.
         """
         super().__init__(file_extension=".csv")
         self.__dataset_path = config["SENSITIVE"]["dataset_path"]
+        self.in_memory = in_memory
 
+        # The data types the dataset is read with (e.g. the compact data types of SensitiveAnalyzer), if set
+        self.schema = None
+
+        # The dataframes written to the dataset when held in memory, and their concatenation (cached until next write)
+        self.__chunks = []
+        self.__dataframe = None
+
+        # Number of rows written to the file, and the file size (or number of chunks, when held in memory) after each
+        # write keyed by that number of rows
+        self.__row_count = 0
+        self.__offsets = {0: 0}
+
+    @profiler.timed("sensitive_read")
     def read(self):
         """
-        Reads a CSV and returns its content as a pandas dataframe.
+        Reads a CSV (or the dataset held in memory) and returns its content as a pandas dataframe, with the data types
+            of the schema if set.
 
         :return: dataframe
         """
+        if self.in_memory:
+            if self.__dataframe is None:
+                self.__dataframe = pd.concat(self.__chunks).reset_index(drop=True)
+                if self.schema is not None:
+                    self.__dataframe = DtypeUtil.apply(self.__dataframe, self.schema)
+
+            logger.debug("Performed read on sample; in memory")
+            return self.__dataframe.copy()
+
         # Check if the file exists
         self._exists()
 
-        dataframe = pd.read_csv(self.path)
+        # Parse floats exactly as they were written, such that values (e.g. of float domains) survive the file
+        dataframe = pd.read_csv(self.path, float_precision="round_trip").drop("ID", axis=1)
+        if self.schema is not None:
+            dataframe = DtypeUtil.apply(dataframe, self.schema)
 
         logger.debug("Performed read on sample; " + self.path)
-        return dataframe.drop("ID", axis=1)
+        return dataframe
 
+    @profiler.timed("sensitive_write")
     def write(self, dataframe: pd.DataFrame, include_header=True):
         """
-        Writes a given dataframe onto an existing CSV by appending to it.
+        Writes a given dataframe onto an existing CSV (or the dataset held in memory) by appending to it.
 
         :param include_header: boolean
         :param dataframe: pandas dataframe
         """
-        # Check if the sample exists
-        self._exists()
+        if self.in_memory:
+            self.__chunks.append(dataframe)
+            self.__dataframe = None
+            offset = len(self.__chunks)
+        else:
+            # Check if the sample exists
+            self._exists()
+
+            # Write the dataframe to the file
+            dataframe.to_csv(self.path, mode='a', header=include_header)
+            offset = os.path.getsize(self.path)
 
-        # Write the dataframe to the file
-        dataframe.to_csv(self.path, mode='a', header=include_header)
+        # Record the size of the file after the write, so that it can be rolled back to this point later
+        self.__row_count += dataframe.shape[0]
+        self.__offsets[self.__row_count] = offset
 
         logger.debug("Performed write on sample; " + self.path + ". Appended " +
                      str(dataframe.shape[0]) + " rows")
 
+    def checkpoint(self):
+        """
+        Returns a checkpoint of the current state of the file, which can later be given to rollback.
+        The checkpoint is the number of rows written to the file so far.
+
+        :return: integer
+        """
+        return self.__row_count
+
+    @profiler.timed("sensitive_rollback")
+    def rollback(self, checkpoint: int):
+        """
+        Rolls the file back to a previous checkpoint by truncating all rows written after it.
+        Throws: ValueError, if the checkpoint does not correspond to a previous write (or was already rolled back).
+
+        :param checkpoint: integer
+        """
+        if checkpoint not in self.__offsets:
+            raise ValueError("checkpoint=" + str(checkpoint) + " does not correspond to a write on " + self.path)
+
+        if self.in_memory:
+            # Drop the chunks written after the checkpoint
+            self.__chunks = self.__chunks[:self.__offsets[checkpoint]]
+            self.__dataframe = None
+        else:
+            # Check if the sample exists
+            self._exists()
+
+            # Truncate the file to its size at the checkpoint
+            os.truncate(self.path, self.__offsets[checkpoint])
+
+        # Forget the offsets of later writes
+        self.__offsets = {rows: offset for rows, offset in self.__offsets.items() if rows <= checkpoint}
+        removed = self.__row_count - checkpoint
+        self.__row_count = checkpoint
+
+        logger.debug("Performed rollback on sample; " + self.path + ". Removed " + str(removed) + " rows")
+
     def change_file(self):
         pass
@@ -0,0 +1,133 @@
+import pandas as pd
+from Utils.LoggerUtil import LoggerUtil
+from Utils.ProfilerUtil import ProfilerUtil
+from File.SensitiveDatasetFile import SensitiveDatasetFile
+
+logger = LoggerUtil.instance()
+profiler = ProfilerUtil.instance()
+
+
+class SensitiveDatasetStore:
+    """
+    A class for versioning the (poisoned) sensitive dataset; the base sample is kept in the SensitiveDatasetFile, and
+        injected rows are kept as a stack of deltas on top of it. Deltas are only materialized into the file when a
+        synthesis needs it, such that checkpoints, rollbacks and applies in between cost no IO, and the base is never
+        rewritten.
+
+    Methods: checkpoint(), rollback(), apply(), materialize(), subscribe(), publish()
+    """
+
+    def __init__(self, sensitive_dataset_file: SensitiveDatasetFile):
+        """
+        Initializes a SensitiveDatasetStore on top of the current content of the sensitive_dataset_file (the base).
+        """
+        self.sensitive_dataset_file = sensitive_dataset_file
+
+        # The stack of deltas as (identifier, dataframe) pairs, and the identifier of the next delta
+        self.__deltas = []
+        self.__next_identifier = 0
+
+        # The deltas currently materialized in the file as (identifier, file checkpoint after the delta) pairs, on top
+        # of the checkpoint of the base
+        self.__materialized = []
+        self.__base = sensitive_dataset_file.checkpoint()
+
+        # Functions called with the dataframes added and removed since they were last called, along with the
+        # (identifier, dataframe) pairs of the deltas they have seen
+        self.__subscribers = []
+
+    @property
+    def rows(self):
+        """
+        A getter for the number of injected rows in the current version (excluding the base).
+
+        :return: int
+        """
+        return sum(delta.shape[0] for _, delta in self.__deltas)
+
+    def checkpoint(self):
+        """
+        Returns a checkpoint of the current version, which can later be given to rollback.
+        The checkpoint is the number of deltas applied on top of the base.
+
+        :return: integer
+        """
+        return len(self.__deltas)
+
+    def rollback(self, checkpoint: int):
+        """
+        Rolls the current version back to a previous checkpoint by discarding all deltas applied after it.
+        Throws: ValueError, if the checkpoint is ahead of the current version.
+
+        :param checkpoint: integer
+        """
+        if checkpoint < 0 or checkpoint > len(self.__deltas):
+            raise ValueError("checkpoint=" + str(checkpoint) + " is not a previous version of the sensitive dataset")
+        self.__deltas = self.__deltas[:checkpoint]
+
+    def apply(self, delta: pd.DataFrame):
+        """
+        Applies a delta (rows to inject) on top of the current version, and returns the number of rows injected.
+
+        :param delta: dataframe
+        :return: integer
+        """
+        self.__deltas.append((self.__next_identifier, delta))
+        self.__next_identifier += 1
+        profiler.count("injected_rows", delta.shape[0])
+        return delta.shape[0]
+
+    def __shared(self, seen: list):
+        """
+        Returns the number of deltas at the bottom of the stack shared by the current version and the given deltas.
+
+        :param seen: list of tuples, starting with the identifiers of the deltas
+        :return: int
+        """
+        shared = 0
+        while shared < min(len(seen), len(self.__deltas)) and seen[shared][0] == self.__deltas[shared][0]:
+            shared += 1
+        return shared
+
+    def subscribe(self, callback):
+        """
+        Subscribes a function to the changes of the store, called on each materialization or publish with the lists of
+            dataframes added and removed since its last call (e.g. IncrementalAggregator.update). The subscriber is
+            assumed to reflect the current version when subscribing.
+
+        :param callback: function taking the keyword arguments added and removed
+        """
+        self.__subscribers.append((callback, list(self.__deltas)))
+
+    def publish(self):
+        """
+        Brings the subscribers to the current version without writing to the file, calling each with the dataframes
+            added and removed since its last call.
+        """
+        for index, (callback, seen) in enumerate(self.__subscribers):
+            shared = self.__shared(seen)
+            removed = [delta for _, delta in seen[shared:]]
+            added = [delta for _, delta in self.__deltas[shared:]]
+            if len(removed) > 0 or len(added) > 0:
+                callback(added=added, removed=removed)
+            self.__subscribers[index] = (callback, list(self.__deltas))
+
+    @profiler.timed("sensitive_materialize")
+    def materialize(self):
+        """
+        Brings the SensitiveDatasetFile (and the subscribers) to the current version; rolling the file back to the last
+            delta it shares with the current version, and appending the deltas applied since.
+        """
+        # Roll the file back to the shared deltas, and append the remaining ones
+        shared = self.__shared(self.__materialized)
+        if shared < len(self.__materialized):
+            self.sensitive_dataset_file.rollback(self.__materialized[shared - 1][1] if shared > 0 else self.__base)
+            self.__materialized = self.__materialized[:shared]
+        for identifier, delta in self.__deltas[shared:]:
+            self.sensitive_dataset_file.write(delta, include_header=False)
+            self.__materialized.append((identifier, self.sensitive_dataset_file.checkpoint()))
+
+        self.publish()
+
+        logger.debug("Materialized sensitive dataset; " + str(len(self.__deltas)) + " deltas (" + str(self.rows) +
+                     " rows) on top of the base, of which " + str(len(self.__deltas) - shared) + " were written")
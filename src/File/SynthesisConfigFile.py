@@ -2,11 +2,13 @@ import json
 from File.File import File
 from Utils.LoggerUtil import LoggerUtil
 from Utils.ConfigUtil import ConfigUtil
+from Utils.ProfilerUtil import ProfilerUtil
 from File.SensitiveDatasetFile import SensitiveDatasetFile
 from File.SyntheticDatasetFile import SyntheticDatasetFile
 
 logger = LoggerUtil.instance()
 config = ConfigUtil.instance()
+profiler = ProfilerUtil.instance()
 
 
 class SynthesisConfigFile(File):
@@ -50,6 +52,7 @@ class SynthesisConfigFile(File):
             "report_pages": {}
         }
 
+    @profiler.timed("config_read")
     def read(self, is_resynthesis=False):
         """
         Reads a JSON file and returns its content as a dictionary.
@@ -76,6 +79,30 @@ class SynthesisConfigFile(File):
 
         return data
 
+    def configure(self, data: dict, is_resynthesis=False):
+        """
+        Modifies the synthesis configurations with the given dictionary and returns them, without writing to the file.
+
+        :param data: dictionary
+        :param is_resynthesis: boolean
+        :return: dictionary
+        """
+        # Change the configuration for resynthesization purposes (changes prefix) if is_resynthesis is set
+        if is_resynthesis:
+            self.change_file()
+
+        # Modify the config_template
+        for key, val in data.items():
+            self.config_template[key] = val
+        synthesis_config = dict(self.config_template)
+
+        # Change the configurations (prefix) back to the original synthetic dataset
+        if is_resynthesis:
+            self.change_file(original=True)
+
+        return synthesis_config
+
+    @profiler.timed("config_write")
     def write(self, data: dict, is_resynthesis=False):
         """
         Writes a given dictionary onto an existing JSON file by overwriting existing data.
@@ -3,9 +3,12 @@ import pandas as pd
 from File.File import File
 from Utils.LoggerUtil import LoggerUtil
 from Utils.ConfigUtil import ConfigUtil
+from Utils.ProfilerUtil import ProfilerUtil
+from Utils.DtypeUtil import DtypeUtil
 
 logger = LoggerUtil.instance()
 config = ConfigUtil.instance()
+profiler = ProfilerUtil.instance()
 
 
 class SyntheticDatasetFile(File):
@@ -14,9 +17,10 @@ class SyntheticDatasetFile(File):
         handled as CSV files).
     """
 
-    def __init__(self):
+    def __init__(self, in_memory=False):
         """
         Initializes a SensitiveDatasetFile object using a TSV file extension.
+        If in_memory is set, synthetic datasets written to the object are held in memory and never written to the file.
         """
         path = config["GENERAL"]["root_dir"] + type(self).__name__.replace("File", "") + os.path.sep \
                + config["GENERAL"]["name"] + "_synthetic_microdata" + ".tsv"
@@ -25,12 +29,28 @@ class SyntheticDatasetFile(File):
         # Save a reference to the original filename
         self.original_filename = self._filename
 
+        self.in_memory = in_memory
+
+        # The data types the synthetic datasets are read with (e.g. the compact data types of the sensitive dataset), if
+        # set
+        self.schema = None
+
+        # The synthetic datasets written to the object, keyed by whether they are resynthesized
+        self.__dataframes = {}
+
+    @profiler.timed("synthetic_read")
     def read(self, is_resynthesis=False):
         """
-        Reads a SyntheticDatasetFile and returns its content as a pandas dataframe.
+        Reads a SyntheticDatasetFile and returns its content as a pandas dataframe, with the data types of the schema
+            if set.
 
         :return: dataframe
         """
+        # Return the synthetic dataset written to the object, if any
+        if is_resynthesis in self.__dataframes:
+            logger.debug("Performed read on synthetic dataset; in memory")
+            return self.__dataframes[is_resynthesis]
+
         # Read from the resynthezised synthetic dataset if is_resynthesis is set, by changing pointed to filename
         if is_resynthesis:
             self.change_file()
@@ -39,7 +59,9 @@ class SyntheticDatasetFile(File):
         self._exists()
 
         # Read the (resynthesized) synthetic dataset
-        dataframe = pd.read_csv(self.path)
+        dataframe = pd.read_csv(self.path, sep="\t")
+        if self.schema is not None:
+            dataframe = DtypeUtil.apply(dataframe, self.schema)
 
         logger.debug("Performed read on synthetic dataset; " + self.path)
 
@@ -49,8 +71,79 @@ class SyntheticDatasetFile(File):
 
         return dataframe
 
-    def write(self, data):
-        pass
+    def read_chunks(self, columns=None, is_resynthesis=False, chunk_size=None, memory_map=None, dtype=None):
+        """
+        Reads a SyntheticDatasetFile in chunks of chunk_size rows, parsing only the given columns (those of the file
+            among them, or all if None), and yields each chunk as a pandas dataframe with the data types of the schema
+            if set; such that the synthetic dataset need not be held as a whole (e.g. when scanning it for a row). A
+            synthetic dataset held in memory is yielded as a single chunk. The chunk_size, and whether the file is
+            memory-mapped rather than read, default to the [SYNTHETIC] configurations. The file is parsed with the
+            given data types per column, if any (before the schema is applied).
+
+        :param columns: list of strings
+        :param is_resynthesis: boolean
+        :param chunk_size: int
+        :param memory_map: boolean
+        :param dtype: dictionary mapping columns to data types
+        :return: generator of dataframes
+        """
+        if chunk_size is None:
+            chunk_size = config["SYNTHETIC"].getint("chunk_size")
+        if memory_map is None:
+            memory_map = config["SYNTHETIC"].getboolean("memory_map")
+
+        # Yield the synthetic dataset written to the object, if any
+        if is_resynthesis in self.__dataframes:
+            dataframe = self.__dataframes[is_resynthesis]
+            yield dataframe if columns is None else dataframe[[col for col in dataframe.columns if col in columns]]
+            return
+
+        # Determine the path of the (resynthesized) synthetic dataset, as the file is read lazily
+        if is_resynthesis:
+            self.change_file()
+        path = self.path
+        self._exists()
+        if is_resynthesis:
+            self.change_file(original=True)
+
+        usecols = None if columns is None else (lambda col: col in columns)
+        with pd.read_csv(path, sep="\t", usecols=usecols, dtype=dtype, chunksize=chunk_size,
+                         memory_map=memory_map) as reader:
+            for chunk in reader:
+                yield DtypeUtil.apply(chunk, self.schema) if self.schema is not None else chunk
+
+        logger.debug("Performed chunked read on synthetic dataset; " + path)
+
+    @profiler.timed("synthetic_write")
+    def write(self, dataframe: pd.DataFrame, is_resynthesis=False):
+        """
+        Writes a given (resynthesized) synthetic dataset, keeping it in memory for later reads and writing it to the
+            TSV file unless in_memory is set.
+
+        :param dataframe: pandas dataframe
+        :param is_resynthesis: boolean
+        """
+        self.__dataframes[is_resynthesis] = DtypeUtil.apply(dataframe, self.schema) if self.schema is not None \
+            else dataframe
+
+        if self.in_memory:
+            logger.debug("Performed write on synthetic dataset; in memory. Wrote " + str(dataframe.shape[0]) + " rows")
+            return
+
+        # Write to the resynthesized synthetic dataset if is_resynthesis is set, by changing pointed to filename
+        if is_resynthesis:
+            self.change_file()
+
+        # The directory is otherwise only created by the SDS pipeline
+        os.makedirs(self._directory, exist_ok=True)
+        dataframe.to_csv(self.path, sep="\t", index=False)
+
+        logger.debug("Performed write on synthetic dataset; " + self.path + ". Wrote " + str(dataframe.shape[0]) +
+                     " rows")
+
+        # Change back to the original filename if is_resynthesis is set
+        if is_resynthesis:
+            self.change_file(original=True)
 
     def change_file(self, original=False):
         """
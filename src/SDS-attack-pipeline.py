@@ -1,50 +1,146 @@
-from File.SensitiveDatasetFile import SensitiveDatasetFile
-from File.SynthesisConfigFile import SynthesisConfigFile
-from Utils.SamplerUtil import SamplerUtil
-from Analyzers.SensitiveAnalyzer import SensitiveAnalyzer
-from File.SyntheticDatasetFile import SyntheticDatasetFile
-from Synthesizers.SDSSynthesizerFacade import SDSSynthesizerFacade
-from Attackers.NaiveAttacker import NaiveAttacker
+import sys
+import json
+import hashlib
+import secrets
+import argparse
+from Utils.ConfigUtil import ConfigUtil
 
 
-def main(n, m, cols, k, sensitive_attribute, known_attributes):
-    # Create the file objects (generates directories and files at root)
-    sensitive_dataset_file = SensitiveDatasetFile()
-    synthetic_dataset_file = SyntheticDatasetFile()
+def main(n, m, cols, k, sensitive_attribute, known_attributes, targets=None, k_search=None, value_batch_size=None,
+         seed=None, resume=False, multi_target=None):
+    # Import the pipeline (and pandas) on first use, such that parsing the arguments (e.g. --help) stays fast
+    import pandas as pd
+    from Utils.SamplerUtil import SamplerUtil
+    from File.AttackStateFile import AttackStateFile
+    from Attackers.AttackPipeline import AttackPipeline
+    from Attackers.CampaignRunner import CampaignRunner
+
+    # Record the progress of a single target attack, resuming the recorded attack if requested
+    attack_state_file, state = None, None
+    if targets is None:
+        attack_state_file = AttackStateFile()
+        if resume and attack_state_file.exists():
+            state = attack_state_file.read()
+            if seed is None:
+                seed = state["parameters"]["seed"]
+        elif seed is None:
+            # Seed the sampling, such that the sample can be reproduced when resuming
+            seed = secrets.randbelow(2 ** 32)
 
     # Create sensitive dataset
-    sample = SamplerUtil().sample(n=n, m=m, cols=cols)
-    sensitive_dataset_file.write(sample)
+    sample = SamplerUtil().sample(n=n, m=m, cols=cols, seed=seed)
+
+    if attack_state_file is not None:
+        parameters = {"n": n, "m": m, "cols": cols, "k": k, "sensitive_attribute": sensitive_attribute,
+                      "known_attributes": known_attributes, "k_search": k_search, "value_batch_size": value_batch_size,
+                      "seed": seed}
+        fingerprint = hashlib.blake2b(pd.util.hash_pandas_object(sample).to_numpy().tobytes(),
+                                      digest_size=16).hexdigest()
+        if state is None:
+            attack_state_file.reset({"parameters": parameters, "sample": fingerprint, "rounds": []})
+        elif state["parameters"] != parameters or state["sample"] != fingerprint:
+            raise ValueError("Cannot resume the attack in " + attack_state_file.path + "; it was run with other "
+                             "parameters or on another sample (recorded parameters: " + str(state["parameters"]) + ")")
+
+    # Attack several targets in parallel if given ("all" attacks every record of the sample)
+    if targets is not None:
+        return CampaignRunner(k, sensitive_attribute, known_attributes, k_search=k_search,
+                              value_batch_size=value_batch_size, multi_target=multi_target).run(
+            sample, targets=None if targets == "all" else targets)
+
+    # Perform analysis, synthesis and the attack-loop to bruteforce k and the sensitive value by data poisoning
+    return AttackPipeline(k, sensitive_attribute, known_attributes).run(sample, k_search=k_search,
+                                                                        value_batch_size=value_batch_size,
+                                                                        attack_state_file=attack_state_file)
+
+
+def sweep(grid_path, workers=None, output=None):
+    from Utils.SweepUtil import SweepUtil
+
+    # Run every combination of the grid, printing a JSON row of results per combination as soon as it completes
+    sweep_util = SweepUtil(SweepUtil.read_grid(grid_path), workers=workers)
+    results = sweep_util.run(on_result=lambda row: print(json.dumps(row, default=str), flush=True))
+
+    if output is not None:
+        results.to_csv(output, index=False)
+    return results
 
-    # Perform analysis on the sensitive dataset to determine properties
-    sensitive_analysis = SensitiveAnalyzer(sensitive_dataset_file).analyze(sample)
 
-    # Create synthesis configuration
-    synthesis_config_file = SynthesisConfigFile(sensitive_dataset_file, synthetic_dataset_file)
-    synthesis_config_file.write({"reporting_resolution": k, "synthesis_mode": "row_seeded"})
+def parse_targets(targets):
+    # Parse the positions of the targeted records, or "all"
+    if targets is None or len(targets) < 1:
+        return None
+    if targets == ["all"]:
+        return "all"
+    return [int(target) for target in targets]
 
-    # Create synthetic dataset
-    synthesizer = SDSSynthesizerFacade(synthesis_config_file)
-    synthesizer.synthesize(aggregate=True, generate=True)
 
-    # Perform attack-loop to bruteforce k and the sensitive value by data poisoning
-    naive_attacker = NaiveAttacker(sensitive_dataset_file, synthetic_dataset_file, sensitive_analysis, synthesizer)
-    naive_attacker.attack_loop(sensitive_col=sensitive_attribute, known_cols=known_attributes)
+def parse_arguments(args):
+    parser = argparse.ArgumentParser(description="Analysis and attacks (data poisoning) on the SDS synthesis. "
+                                                 "Prompts for the inputs when no command is given.")
+    parser.add_argument("--config", help="path to the configurations (defaults to Config.ini next to this script)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="attack one or more targets of a single sample")
+    run_parser.add_argument("-n", type=int, required=True, help="number of rows to include in sample")
+    run_parser.add_argument("-m", type=int, default=-1, help="number of columns to include in sample")
+    run_parser.add_argument("--cols", nargs="+", help="name(s) of column(s) to include in sample")
+    run_parser.add_argument("-k", type=int, required=True, help="privacy resolution for synthesis")
+    run_parser.add_argument("--sensitive-attribute", required=True, help="name of sensitive attribute")
+    run_parser.add_argument("--known-attributes", nargs="+", help="name(s) of known attribute(s)")
+    run_parser.add_argument("--targets", nargs="+", help="position(s) of target record(s) in sample, or 'all'")
+    run_parser.add_argument("--k-search", choices=["linear", "binary", "aggregate"],
+                            help="search used to determine k")
+    run_parser.add_argument("--value-batch-size", type=int, help="number of potential values probed per synthesis")
+    run_parser.add_argument("--multi-target", action="store_true", default=None,
+                            help="attack the targets of each worker at once, sharing the syntheses between them")
+    run_parser.add_argument("--seed", type=int, help="seed of the sampling, for reproducibility")
+    run_parser.add_argument("--resume", action="store_true",
+                            help="resume the interrupted attack run with the same arguments, replaying its recorded "
+                                 "rounds instead of synthesizing them")
+
+    sweep_parser = commands.add_parser("sweep", help="run every combination of a grid of parameters")
+    sweep_parser.add_argument("grid", help="path to a JSON or YAML file mapping parameters to lists of values")
+    sweep_parser.add_argument("--workers", type=int, help="number of worker processes (defaults to the cores)")
+    sweep_parser.add_argument("--output", help="path to a CSV file for the results")
+
+    return parser.parse_args(args)
 
 
 if __name__ == '__main__':
-    # Take input
-    n_input = int(input("Enter number of rows to include in sample:"))
-    m_input = int(input("Enter number of columns to include in sample:"))
-    cols_input = input("Enter name(s) of column(s) to include in sample separated by spaces (optional):")
-    cols_list = cols_input.split()
-    k_input = int(input("Enter number for the privacy resolution (k):"))
-    sensitive_attribute_input = input("Enter name of sensitive attribute:")
-    known_attributes_input = input("Enter name(s) of known attribute(s) separated by spaces (optional):")
-    known_attributes_list = known_attributes_input.split()
-
-    # Set optional values to None if not given
-    if len(cols_list) < 1: cols_list = None
-    if len(known_attributes_list) < 1: known_attributes_list = None
-
-    main(n_input, m_input, cols_list, k_input, sensitive_attribute_input, known_attributes_list)
+    if len(sys.argv) > 1:
+        arguments = parse_arguments(sys.argv[1:])
+        if arguments.config is not None:
+            ConfigUtil.load(arguments.config)
+
+        if arguments.command == "sweep":
+            sweep(arguments.grid, arguments.workers, arguments.output)
+        else:
+            result = main(arguments.n, arguments.m, arguments.cols, arguments.k, arguments.sensitive_attribute,
+                          arguments.known_attributes, parse_targets(arguments.targets), arguments.k_search,
+                          arguments.value_batch_size, arguments.seed, arguments.resume, arguments.multi_target)
+
+            # Print the results as JSON (a row per target for campaigns)
+            if arguments.targets is not None:
+                print(result.to_json(orient="records"))
+            else:
+                print(json.dumps(result, default=str))
+    else:
+        # Take input
+        n_input = int(input("Enter number of rows to include in sample:"))
+        m_input = int(input("Enter number of columns to include in sample:"))
+        cols_input = input("Enter name(s) of column(s) to include in sample separated by spaces (optional):")
+        cols_list = cols_input.split()
+        k_input = int(input("Enter number for the privacy resolution (k):"))
+        sensitive_attribute_input = input("Enter name of sensitive attribute:")
+        known_attributes_input = input("Enter name(s) of known attribute(s) separated by spaces (optional):")
+        known_attributes_list = known_attributes_input.split()
+        targets_input = input("Enter position(s) of target record(s) separated by spaces, or 'all' (optional):")
+        targets_list = targets_input.split()
+
+        # Set optional values to None if not given
+        if len(cols_list) < 1: cols_list = None
+        if len(known_attributes_list) < 1: known_attributes_list = None
+
+        main(n_input, m_input, cols_list, k_input, sensitive_attribute_input, known_attributes_list,
+             parse_targets(targets_list))
@@ -0,0 +1,191 @@
+import itertools
+import numpy as np
+import pandas as pd
+from Utils.LoggerUtil import LoggerUtil
+from Utils.ProfilerUtil import ProfilerUtil
+from File.SynthesisConfigFile import SynthesisConfigFile
+
+logger = LoggerUtil.instance()
+profiler = ProfilerUtil.instance()
+
+
+class IncrementalAggregator:
+    """
+    A class for maintaining the aggregates of the SDS synthesis incrementally; the counts of all combinations of
+        attribute values up to reporting_length in the sensitive dataset, thresholded by reporting_resolution.
+    The counts are computed once, after which only the contributions of injected or rolled back rows are added or
+        subtracted (e.g. by subscribing to a SensitiveDatasetStore), such that a round costs O(rows changed) rather than
+        O(rows) per combination of attributes.
+
+    Methods: fit(), add(), remove(), update(), count(), is_reportable(), counts(), aggregates()
+    """
+
+    def __init__(self, synthesis_config_file: SynthesisConfigFile):
+        """
+        Initializes an IncrementalAggregator using the columns, reporting_length and reporting_resolution of the current
+            configurations of the synthesis_config_file.
+        """
+        self.synthesis_config_file = synthesis_config_file
+
+        synthesis_config = synthesis_config_file.configure({})
+        self.columns = list(synthesis_config["use_columns"])
+        self.reporting_length = synthesis_config["reporting_length"]
+        self.reporting_resolution = synthesis_config["reporting_resolution"]
+
+        # The combinations of columns, and for each the counts keyed by the tuple of values (None until fitted)
+        self.combinations = [combination for length in range(1, self.reporting_length + 1)
+                             for combination in itertools.combinations(range(len(self.columns)), length)]
+        self.__counts = None
+
+    @profiler.timed("aggregate_fit")
+    def fit(self, dataset: pd.DataFrame = None):
+        """
+        Counts all combinations of attribute values up to reporting_length in the given dataset (the sensitive dataset
+            of the synthesis_config_file if None), discarding previous counts. Missing values are not counted.
+
+        :param dataset: dataframe
+        """
+        if dataset is None:
+            dataset = self.synthesis_config_file.sensitive_dataset_file.read()
+        dataset = dataset[self.columns]
+
+        self.__counts = {}
+        for combination in self.combinations:
+            columns = [self.columns[index] for index in combination]
+            sizes = dataset.groupby(columns, dropna=True).size()
+            keys = sizes.index if len(columns) > 1 else [(value,) for value in sizes.index]
+            self.__counts[combination] = dict(zip(keys, sizes.tolist()))
+
+        logger.debug("Fitted aggregates; " + str(sum(len(counts) for counts in self.__counts.values())) +
+                     " combinations of " + str(dataset.shape[0]) + " rows")
+
+    def __apply(self, dataframe: pd.DataFrame, sign: int):
+        """
+        Adds (sign 1) or subtracts (sign -1) the contributions of the rows of the dataframe to the counts; identical
+            rows are only visited once.
+
+        :param dataframe: dataframe
+        :param sign: int
+        """
+        if self.__counts is None:
+            raise ValueError("The aggregates must be fitted before they are updated")
+
+        rows = dataframe[self.columns].value_counts(dropna=False)
+        for values, multiplicity in zip(rows.index, rows.tolist()):
+            is_present = [not pd.isna(value) for value in values]
+            for combination in self.combinations:
+                if not all(is_present[index] for index in combination):
+                    continue
+                counts = self.__counts[combination]
+                key = tuple(values[index] for index in combination)
+                count = counts.get(key, 0) + sign * multiplicity
+                if count > 0:
+                    counts[key] = count
+                else:
+                    counts.pop(key, None)
+
+    def add(self, dataframe: pd.DataFrame):
+        """
+        Adds the contributions of the rows of the dataframe (e.g. injected rows) to the counts.
+
+        :param dataframe: dataframe
+        """
+        self.__apply(dataframe, 1)
+
+    def remove(self, dataframe: pd.DataFrame):
+        """
+        Subtracts the contributions of the rows of the dataframe (e.g. rolled back rows) from the counts.
+
+        :param dataframe: dataframe
+        """
+        self.__apply(dataframe, -1)
+
+    @profiler.timed("aggregate_update")
+    def update(self, added: list, removed: list):
+        """
+        Updates the counts given the dataframes added to and removed from the dataset (see
+            SensitiveDatasetStore.subscribe).
+
+        :param added: list of dataframes
+        :param removed: list of dataframes
+        """
+        for dataframe in removed:
+            self.remove(dataframe)
+        for dataframe in added:
+            self.add(dataframe)
+
+    def count(self, record: pd.Series, columns=None):
+        """
+        Returns the count of the combination of the record's values on the given columns (its non-missing columns if
+            None), which must not exceed reporting_length.
+
+        :param record: series
+        :param columns: list of strings
+        :return: int
+        """
+        if columns is None:
+            columns = [col for col in self.columns if not pd.isna(record[col])]
+        combination = tuple(sorted(self.columns.index(col) for col in columns))
+        if len(combination) > self.reporting_length:
+            raise ValueError("columns=" + str(columns) + " exceed the reporting_length=" + str(self.reporting_length))
+        return self.__counts[combination].get(tuple(record[self.columns[index]] for index in combination), 0)
+
+    def is_reportable(self, record: pd.Series):
+        """
+        Checks if every combination (up to reporting_length) of the record's non-missing values meets the
+            reporting_resolution; i.e. whether the record can be synthesized whole by the row-seeded synthesis.
+
+        :param record: series
+        :return: boolean
+        """
+        values = [record[col] for col in self.columns]
+        is_present = [not pd.isna(value) for value in values]
+        for combination in self.combinations:
+            if not all(is_present[index] for index in combination):
+                continue
+            key = tuple(values[index] for index in combination)
+            if self.__counts[combination].get(key, 0) < self.reporting_resolution:
+                return False
+        return True
+
+    def __selection(self, combination: tuple, key: tuple):
+        """
+        Formats the given key of values of the combination of columns as a selection, 'column:value;...' (as SDS does).
+
+        :param combination: tuple of column indices
+        :param key: tuple of objects
+        :return: string
+        """
+        return ";".join(self.columns[index] + ":" + str(value) for index, value in zip(combination, key))
+
+    def counts(self):
+        """
+        Returns the (exact) counts of all combinations of attribute values, reportable or not, with selections formatted
+            as in aggregates().
+
+        :return: dataframe
+        """
+        selections, counts = [], []
+        for combination, combination_counts in self.__counts.items():
+            for key, count in combination_counts.items():
+                selections.append(self.__selection(combination, key))
+                counts.append(count)
+        return pd.DataFrame({"selections": selections, "count": np.array(counts, dtype=np.int64)})
+
+    def aggregates(self):
+        """
+        Returns the reportable aggregates; the combinations whose count meets the reporting_resolution, with counts
+            rounded down to a multiple of it (as reported by SDS), and selections formatted as 'column:value;...'.
+
+        :return: dataframe
+        """
+        selections, counts = [], []
+        for combination, combination_counts in self.__counts.items():
+            for key, count in combination_counts.items():
+                if count >= self.reporting_resolution:
+                    selections.append(self.__selection(combination, key))
+                    counts.append(count)
+
+        counts = np.array(counts, dtype=np.int64)
+        return pd.DataFrame({"selections": selections,
+                             "count": counts - counts % self.reporting_resolution})
@@ -0,0 +1,107 @@
+import os
+import itertools
+import numpy as np
+import pandas as pd
+from Utils.LoggerUtil import LoggerUtil
+from Utils.ProfilerUtil import ProfilerUtil
+from Synthesizers.SDSInMemorySynthesizer import SDSInMemorySynthesizer
+from Synthesizers.IncrementalAggregator import IncrementalAggregator
+
+logger = LoggerUtil.instance()
+profiler = ProfilerUtil.instance()
+
+
+class KAnonymitySynthesizer(SDSInMemorySynthesizer):
+    """
+    A class for synthesizing sensitive datasets using a pure NumPy stand-in for SDS's row-seeded k-anonymity synthesis,
+        for use where Microsoft's SDS libraries are not installed (e.g. benchmarks).
+    Each synthetic record is seeded by a sensitive record, keeping the record's attributes (in column order) as long as
+        every combination of kept attributes, up to reporting_length, is shared by at least reporting_resolution
+        sensitive records; the remaining attributes are left empty. The reportable aggregates are computed as SDS
+        reports them (see IncrementalAggregator).
+    """
+
+    @staticmethod
+    def _encode(sensitive_dataset: pd.DataFrame):
+        """
+        Encodes each column of the given dataset into integer codes, with -1 for missing values.
+
+        :param sensitive_dataset: dataframe
+        :return: numpy array of shape (rows, columns)
+        """
+        codes = np.empty(sensitive_dataset.shape, dtype=np.int64)
+        for index, col in enumerate(sensitive_dataset.columns):
+            codes[:, index] = pd.factorize(sensitive_dataset[col])[0]
+        return codes
+
+    @staticmethod
+    def _count_combinations(codes: np.ndarray, columns: tuple):
+        """
+        Counts, for each row, the number of rows sharing its combination of values on the given columns (zero for rows
+            with a missing value on any of the columns).
+
+        :param codes: numpy array of shape (rows, columns)
+        :param columns: tuple of column indices
+        :return: numpy array
+        """
+        # Combine the codes of the columns into a single key per row, factorizing after each column to keep keys small
+        key = codes[:, columns[0]]
+        for column in columns[1:]:
+            key = pd.factorize(key * (codes[:, column].max() + 2) + codes[:, column] + 1)[0]
+
+        present = (codes[:, list(columns)] >= 0).all(axis=1)
+        inverse = pd.factorize(key)[0]
+        return np.where(present, np.bincount(inverse)[inverse], 0)
+
+    def _run_dataframe(self, sensitive_dataset: pd.DataFrame, synthesis_config: dict):
+        """
+        Synthesizes the given sensitive dataset and returns the synthetic microdata, writing it to the configured output
+            directory if persist_artifacts is set.
+
+        :param sensitive_dataset: dataframe
+        :param synthesis_config: dictionary
+        :return: dataframe
+        """
+        with profiler.stage("synthesis", round=self.rounds):
+            sensitive_dataset = sensitive_dataset[synthesis_config["use_columns"]]
+            resolution = synthesis_config["reporting_resolution"]
+            length = synthesis_config["reporting_length"]
+
+            codes = self._encode(sensitive_dataset)
+            kept = np.zeros(codes.shape, dtype=bool)
+
+            # Keep each attribute of a record if all combinations with its previously kept attributes are reportable
+            for column in range(codes.shape[1]):
+                keep = codes[:, column] >= 0
+                for size in range(0, min(length, column + 1)):
+                    for previous in itertools.combinations(range(column), size):
+                        is_applicable = kept[:, list(previous)].all(axis=1) & keep
+                        if not is_applicable.any():
+                            continue
+                        counts = self._count_combinations(codes, previous + (column,))
+                        keep &= ~is_applicable | (counts >= resolution)
+                kept[:, column] = keep
+
+            synthetic_dataset = sensitive_dataset.where(kept).reset_index(drop=True)
+
+        if self.persist_artifacts:
+            os.makedirs(synthesis_config["output_dir"], exist_ok=True)
+            synthetic_path = os.path.join(synthesis_config["output_dir"],
+                                          synthesis_config["prefix"] + "_synthetic_microdata.tsv")
+            synthetic_dataset.to_csv(synthetic_path, sep="\t", index=False)
+
+        logger.debug("Synthesized (stand-in) " + str(synthetic_dataset.shape[0]) + " rows; kept " +
+                     str(round(100 * kept.mean(), 2)) + "% of attributes")
+        return synthetic_dataset
+
+    def _aggregate(self, sensitive_dataset: pd.DataFrame, synthesis_config: dict):
+        """
+        Returns the reportable aggregates of the given sensitive dataset, as SDS reports them.
+
+        :param sensitive_dataset: dataframe
+        :param synthesis_config: dictionary
+        :return: dataframe
+        """
+        aggregator = IncrementalAggregator(self.synthesis_config_file)
+        aggregator.fit(sensitive_dataset)
+        return aggregator.aggregates()
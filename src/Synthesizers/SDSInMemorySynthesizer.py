@@ -0,0 +1,169 @@
+import os
+import hashlib
+import tempfile
+import pandas as pd
+from Utils.LoggerUtil import LoggerUtil
+from Utils.ProfilerUtil import ProfilerUtil
+from File.SynthesisConfigFile import SynthesisConfigFile
+from File.AggregatesFile import AggregatesFile
+from Synthesizers.SDSSynthesizerFacade import SDSSynthesizerFacade
+
+logger = LoggerUtil.instance()
+profiler = ProfilerUtil.instance()
+
+
+class SDSInMemorySynthesizer(SDSSynthesizerFacade):
+    """
+    A class for synthesizing sensitive datasets held in memory, taking and returning dataframes (or Arrow tables)
+        instead of communicating through the SensitiveDatasetFile, SynthesisConfigFile and SyntheticDatasetFile on disk.
+    The synthesis configuration and synthetic dataset are only written to disk as optional artifacts.
+    """
+
+    def __init__(self, synthesis_config_file: SynthesisConfigFile, persist_artifacts=False):
+        """
+        Initializes an instance of SDSInMemorySynthesizer using a synthesis_config_file, whose sensitive and synthetic
+            dataset files are used as the in memory input and output of syntheses.
+        """
+        super().__init__(synthesis_config_file, aggregates_file=AggregatesFile(in_memory=not persist_artifacts))
+        self.persist_artifacts = persist_artifacts
+
+        # The reportable aggregates of the last run of the SDS pipeline (read before its outputs are discarded)
+        self.__aggregates = None
+
+    def _run(self, flags: dict, is_resynthesis: bool):
+        """
+        Performs a single synthesis with the given flags on the sensitive dataset held by the SynthesisConfigFile,
+            writing the result to its SyntheticDatasetFile.
+
+        :param flags: dictionary
+        :param is_resynthesis: boolean
+        """
+        # Build the synthesis configurations in memory, only writing them to the file as an artifact
+        if self.persist_artifacts:
+            self.synthesis_config_file.write(flags, is_resynthesis=is_resynthesis)
+        synthesis_config = self.synthesis_config_file.configure(flags, is_resynthesis=is_resynthesis)
+
+        sensitive_dataset = self.synthesis_config_file.sensitive_dataset_file.read()
+        synthetic_dataset = self.synthesize_dataframe(sensitive_dataset, synthesis_config)
+        self.synthesis_config_file.synthetic_dataset_file.write(synthetic_dataset, is_resynthesis=is_resynthesis)
+
+        # Keep the reportable aggregates of the first synthesis (of the sensitive dataset before any injections)
+        if flags["aggregate"] and not is_resynthesis:
+            aggregates = self._aggregate(sensitive_dataset, synthesis_config)
+            if aggregates is not None:
+                self.aggregates_file.write(aggregates)
+
+        logger.debug("Successful synthesis (" + str(self.rounds) + "); created synthetic dataset in memory with " +
+                     str(synthetic_dataset.shape[0]) + " rows")
+
+    def _fingerprint(self):
+        """
+        Returns a fingerprint of the content of the sensitive dataset held in memory, keying cached syntheses.
+
+        :return: string
+        """
+        sensitive_dataset = self.synthesis_config_file.sensitive_dataset_file.read()
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str(list(zip(sensitive_dataset.columns, sensitive_dataset.dtypes))).encode())
+        digest.update(pd.util.hash_pandas_object(sensitive_dataset, index=False).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    def _store(self, directory: str, flags: dict, is_resynthesis: bool):
+        """
+        Stores the synthetic dataset of the last synthesis in the directory of a cache entry.
+
+        :param directory: string
+        :param flags: dictionary
+        :param is_resynthesis: boolean
+        """
+        synthetic_dataset = self.synthesis_config_file.synthetic_dataset_file.read(is_resynthesis=is_resynthesis)
+        synthetic_dataset.to_pickle(os.path.join(directory, "synthetic_microdata.pkl"))
+        if not is_resynthesis and self.aggregates_file.exists():
+            self.aggregates_file.read().to_pickle(os.path.join(directory, "reportable_aggregates.pkl"))
+
+    def _restore(self, entry: str, flags: dict, is_resynthesis: bool):
+        """
+        Restores the synthetic dataset of a cached synthesis from the directory of its entry, and returns whether it
+            succeeded (the entry may have been evicted concurrently).
+
+        :param entry: string
+        :param flags: dictionary
+        :param is_resynthesis: boolean
+        :return: boolean
+        """
+        try:
+            synthetic_dataset = pd.read_pickle(os.path.join(entry, "synthetic_microdata.pkl"))
+        except FileNotFoundError:
+            return False
+        self.synthesis_config_file.synthetic_dataset_file.write(synthetic_dataset, is_resynthesis=is_resynthesis)
+        if not is_resynthesis and os.path.isfile(os.path.join(entry, "reportable_aggregates.pkl")):
+            self.aggregates_file.write(pd.read_pickle(os.path.join(entry, "reportable_aggregates.pkl")))
+        return True
+
+    def synthesize_dataframe(self, sensitive_dataset, synthesis_config: dict = None, as_arrow=False):
+        """
+        Synthesizes the given sensitive dataset (dataframe or Arrow table) and returns the synthetic dataset, using the
+            given synthesis configurations or otherwise the current configurations of the SynthesisConfigFile.
+
+        :param sensitive_dataset: dataframe or Arrow table
+        :param synthesis_config: dictionary
+        :param as_arrow: boolean, whether to return an Arrow table (requires pyarrow)
+        :return: dataframe or Arrow table
+        """
+        # Convert Arrow tables into dataframes
+        if hasattr(sensitive_dataset, "to_pandas"):
+            sensitive_dataset = sensitive_dataset.to_pandas()
+
+        if synthesis_config is None:
+            synthesis_config = self.synthesis_config_file.configure({})
+
+        synthetic_dataset = self._run_dataframe(sensitive_dataset, synthesis_config)
+
+        if as_arrow:
+            import pyarrow
+            return pyarrow.Table.from_pandas(synthetic_dataset, preserve_index=False)
+        return synthetic_dataset
+
+    def _run_dataframe(self, sensitive_dataset: pd.DataFrame, synthesis_config: dict):
+        """
+        Runs the SDS pipeline on the given sensitive dataset and returns the synthetic microdata.
+        The SDS pipeline only reads sensitive microdata from a path, so the dataset is handed over through a scratch
+            directory (in shared memory, when available); its outputs are kept in the configured output directory if
+            persist_artifacts is set.
+
+        :param sensitive_dataset: dataframe
+        :param synthesis_config: dictionary
+        :return: dataframe
+        """
+        scratch_root = "/dev/shm" if os.path.isdir("/dev/shm") else None
+        with tempfile.TemporaryDirectory(dir=scratch_root) as directory:
+            synthesis_config = dict(synthesis_config)
+            synthesis_config["sensitive_microdata_path"] = os.path.join(directory, "sensitive_microdata.tsv")
+            synthesis_config["sensitive_microdata_delimiter"] = "\t"
+            if not self.persist_artifacts:
+                synthesis_config["output_dir"] = directory + os.path.sep
+
+            with profiler.stage("synthesis_handover"):
+                sensitive_dataset.to_csv(synthesis_config["sensitive_microdata_path"], sep="\t", index=False)
+            self._run_sds(synthesis_config)
+
+            synthetic_path = os.path.join(synthesis_config["output_dir"],
+                                          synthesis_config["prefix"] + "_synthetic_microdata.tsv")
+            aggregates_path = os.path.join(synthesis_config["output_dir"],
+                                           synthesis_config["prefix"] + "_reportable_aggregates.tsv")
+            with profiler.stage("synthesis_output_read"):
+                self.__aggregates = None
+                if os.path.isfile(aggregates_path):
+                    self.__aggregates = AggregatesFile(existing_path=aggregates_path).read()
+                return pd.read_csv(synthetic_path, sep="\t")
+
+    def _aggregate(self, sensitive_dataset: pd.DataFrame, synthesis_config: dict):
+        """
+        Returns the reportable aggregates of the last synthesis of the given sensitive dataset (None if the SDS pipeline
+            did not write them).
+
+        :param sensitive_dataset: dataframe
+        :param synthesis_config: dictionary
+        :return: dataframe
+        """
+        return self.__aggregates
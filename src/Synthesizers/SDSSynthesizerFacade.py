@@ -1,10 +1,16 @@
+import os
+import shutil
 from Utils.ConfigUtil import ConfigUtil
 from Utils.LoggerUtil import LoggerUtil
+from Utils.ProfilerUtil import ProfilerUtil
 from File.SynthesisConfigFile import SynthesisConfigFile
-from lib.python_pipeline.src.showcase import runForConfig
+from File.AggregatesFile import AggregatesFile
+from Synthesizers.SynthesisCache import SynthesisCache
+from Synthesizers.SynthesisService import SynthesisService, run_sds
 
 logger = LoggerUtil.instance()
 config = ConfigUtil.instance()
+profiler = ProfilerUtil.instance()
 
 
 class SDSSynthesizerFacade:
@@ -13,9 +19,10 @@ class SDSSynthesizerFacade:
     Data Showcase (SDS) python_pipeline (see /lib).
     """
 
-    def __init__(self, synthesis_config_file: SynthesisConfigFile):
+    def __init__(self, synthesis_config_file: SynthesisConfigFile, aggregates_file: AggregatesFile = None):
         """
-        Initializes an instance of SDSSynthesizerFacade using a synthetic_dataset_file.
+        Initializes an instance of SDSSynthesizerFacade using a synthetic_dataset_file, and the aggregates_file the
+            reportable aggregates of the first synthesis are read from (next to the synthetic dataset if None).
         """
         # Initialize a private member of type SyntheticConfig
         self.synthesis_config_file = synthesis_config_file
@@ -24,7 +31,46 @@ class SDSSynthesizerFacade:
         self.__flags = {"navigate": True, "evaluate": True, "generate": True, "aggregate": True}
         self.__round = 0
 
-    def synthesize(self, aggregate=False, generate=False, evaluate=False, navigate=False):
+        # The cache of synthesis results, if enabled
+        self.cache = SynthesisCache() if config["SYNTHESIS"].getboolean("cache") else None
+
+        # The synthesis service the SDS pipeline is run in, if enabled (otherwise it is run in this process)
+        self.service = SynthesisService.instance() if config["SYNTHESIS"].getboolean("service") else None
+
+        # The reportable aggregates of the first synthesis (written by SDS next to the synthetic dataset)
+        self.aggregates_file = aggregates_file if aggregates_file is not None else AggregatesFile()
+
+    @property
+    def rounds(self):
+        """
+        Getter for the number of syntheses performed so far (including the initial synthesis).
+
+        :return: integer
+        """
+        return self.__round
+
+    def resume(self, rounds: int):
+        """
+        Resumes the count of syntheses at the given number of rounds (if ahead), e.g. when the rounds of an interrupted
+            attack are replayed from its recorded state instead of being synthesized again.
+
+        :param rounds: integer
+        """
+        self.__round = max(self.__round, rounds)
+
+    def aggregates(self):
+        """
+        Returns the reportable aggregates of the first synthesis (see AggregatesFile), i.e. of the sensitive dataset
+            before any injections, or None if they are not available (e.g. the first synthesis did not aggregate).
+
+        :return: dataframe
+        """
+        if self.__round < 1 or not self.aggregates_file.exists():
+            return None
+        return self.aggregates_file.read()
+
+    def synthesize(self, aggregate=False, generate=False, evaluate=False, navigate=False,
+                   cache: SynthesisCache = None):
         """
         Performs synthesis using the SynthesisConfigFile and SyntheticDatasetFile and by using the flags:
             aggregate : whether to perform aggregate step during synthesis (aggregate counts),
@@ -32,11 +78,14 @@ class SDSSynthesizerFacade:
             evaluate : whether to perform evaluation step during synthesis (statistics),
             navigate : whether to perform navigation step during synthesis (PowerBI),
         all are assumed by default.
+        The results are restored from (and stored in) the given SynthesisCache if any, otherwise the cache of the facade
+            if enabled.
 
         :param aggregate: boolean
         :param generate: boolean
         :param evaluate: boolean
         :param navigate: boolean
+        :param cache: SynthesisCache
         """
         # Construct synthesis flags from arguments:
         # A current flag can only be set if all prior flags are also set, e.g.:
@@ -52,17 +101,113 @@ class SDSSynthesizerFacade:
 
         # Determine whether a resynthesis, if so writes the synthetic dataset to another file
         is_resynthesis = self.__round > 0
+        flags = dict(self.__flags)
+
+        # Restore the results of an identical previous synthesis if cached, otherwise synthesize (caching the results)
+        cache = cache if cache is not None else self.cache
+        key = None
+        if cache is not None:
+            synthesis_config = self.synthesis_config_file.configure(flags, is_resynthesis=is_resynthesis)
+            key = cache.key(type(self).__name__, self._fingerprint(), synthesis_config)
+
+        entry = cache.get(key) if key is not None else None
+        if entry is not None and self._restore(entry, flags, is_resynthesis):
+            logger.debug("Restored synthesis (" + str(self.__round) + ") from cache; " + entry)
+            profiler.count("synthesis_cache_hits")
+        else:
+            self._run(flags, is_resynthesis)
+            profiler.count("syntheses")
+            if key is not None:
+                cache.put(key, lambda directory: self._store(directory, flags, is_resynthesis))
+        self.__round += 1
+
+    def _fingerprint(self):
+        """
+        Returns a fingerprint of the content of the sensitive dataset, keying cached syntheses.
+
+        :return: string
+        """
+        return SynthesisCache.hash_file(self.synthesis_config_file.sensitive_dataset_file.path)
+
+    def __outputs(self, flags: dict, is_resynthesis: bool):
+        """
+        Returns the output directory and prefix of a synthesis, along with the names of its output files (without the
+            prefix).
+
+        :param flags: dictionary
+        :param is_resynthesis: boolean
+        :return: tuple of string, string and list of strings
+        """
+        synthesis_config = self.synthesis_config_file.configure(flags, is_resynthesis=is_resynthesis)
+        output_dir, prefix = synthesis_config["output_dir"], synthesis_config["prefix"] + "_"
+
+        # The outputs of a synthesis share its prefix (which prefixes the outputs of resyntheses as well)
+        names = [name[len(prefix):] for name in os.listdir(output_dir)
+                 if name.startswith(prefix) and (is_resynthesis or not name.startswith(prefix + "resynthesis_"))]
+        return output_dir, prefix, names
+
+    def _store(self, directory: str, flags: dict, is_resynthesis: bool):
+        """
+        Stores the outputs of the last synthesis in the directory of a cache entry.
+
+        :param directory: string
+        :param flags: dictionary
+        :param is_resynthesis: boolean
+        """
+        output_dir, prefix, names = self.__outputs(flags, is_resynthesis)
+        for name in names:
+            shutil.copyfile(os.path.join(output_dir, prefix + name), os.path.join(directory, name))
+
+    def _restore(self, entry: str, flags: dict, is_resynthesis: bool):
+        """
+        Restores the outputs of a cached synthesis from the directory of its entry, and returns whether it succeeded
+            (the entry may have been evicted concurrently).
+
+        :param entry: string
+        :param flags: dictionary
+        :param is_resynthesis: boolean
+        :return: boolean
+        """
+        synthesis_config = self.synthesis_config_file.configure(flags, is_resynthesis=is_resynthesis)
+        os.makedirs(synthesis_config["output_dir"], exist_ok=True)
+        try:
+            for name in os.listdir(entry):
+                shutil.copyfile(os.path.join(entry, name),
+                                os.path.join(synthesis_config["output_dir"], synthesis_config["prefix"] + "_" + name))
+        except FileNotFoundError:
+            return False
+        return True
 
+    def _run(self, flags: dict, is_resynthesis: bool):
+        """
+        Performs a single synthesis with the given flags, by writing them to the SynthesisConfigFile and running the SDS
+            pipeline on the resulting configurations.
+
+        :param flags: dictionary
+        :param is_resynthesis: boolean
+        """
         # Write the flags to the synthesis config
-        self.synthesis_config_file.write(self.__flags, is_resynthesis=is_resynthesis)
+        self.synthesis_config_file.write(flags, is_resynthesis=is_resynthesis)
 
         synthesis_config = self.synthesis_config_file.read(is_resynthesis=is_resynthesis)
         logger.debug("Successful synthesis (" + str(self.__round) + "); created synthetic dataset: " +
                      synthesis_config["output_dir"])
-        self.__round += 1
 
         # Perform synthesis with the synthesis_config_file
-        runForConfig(synthesis_config)
+        self._run_sds(synthesis_config)
+
+    def _run_sds(self, synthesis_config: dict):
+        """
+        Runs the SDS pipeline on the given synthesis configurations; in the synthesis service if enabled (with its
+            timeout and retries), and otherwise in this process.
+
+        :param synthesis_config: dictionary
+        """
+        with profiler.stage("synthesis", round=self.__round):
+            if self.service is not None:
+                self.service.run(synthesis_config)
+            else:
+                run_sds(synthesis_config)
 
     def resynthesize(self):
         """
@@ -0,0 +1,136 @@
+import os
+import json
+import shutil
+import hashlib
+from Utils.LoggerUtil import LoggerUtil
+from Utils.ConfigUtil import ConfigUtil
+from Utils.WorkspaceUtil import WorkspaceUtil
+
+logger = LoggerUtil.instance()
+config = ConfigUtil.instance()
+
+
+class SynthesisCache:
+    """
+    A class for caching the results of syntheses on disk, content-addressed by a fingerprint of the sensitive dataset
+        and the synthesis configurations, such that repeated syntheses (e.g. across sweeps, or re-runs) are not run
+        again. Each entry is a directory of result files; entries are evicted least recently used first, once the cache
+        exceeds its size budget. The cache can be shared by concurrent processes.
+
+    Methods: key(), get(), put()
+    """
+    # The synthesis configurations affecting the results of a synthesis (paths and names do not)
+    CONFIG_FIELDS = ("use_columns", "record_limit", "sensitive_zeros", "reporting_resolution", "reporting_length",
+                     "synthesis_mode", "oversampling_ratio", "oversampling_tries", "aggregate", "generate", "evaluate",
+                     "navigate")
+
+    def __init__(self, cache_dir=None, max_size_mb=None):
+        """
+        Initializes a SynthesisCache in cache_dir with a budget of max_size_mb; defaulting to the configured cache_dir
+            (or SynthesisCache in the original root_dir, shared by isolated workspaces) and cache_size_mb.
+        """
+        if cache_dir is None:
+            cache_dir = config["SYNTHESIS"]["cache_dir"] or os.path.join(WorkspaceUtil.root_dir(), "SynthesisCache")
+        if max_size_mb is None:
+            max_size_mb = config["SYNTHESIS"].getfloat("cache_size_mb")
+
+        self.cache_dir = cache_dir
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, synthesizer: str, sensitive_fingerprint: str, synthesis_config: dict):
+        """
+        Returns the key of a synthesis, given the name of the synthesizer, a fingerprint of the sensitive dataset and
+            the synthesis configurations.
+
+        :param synthesizer: string
+        :param sensitive_fingerprint: string
+        :param synthesis_config: dictionary
+        :return: string
+        """
+        fields = {field: synthesis_config.get(field) for field in self.CONFIG_FIELDS}
+        content = json.dumps([synthesizer, sensitive_fingerprint, fields], sort_keys=True, default=str)
+        return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+    def get(self, key: str):
+        """
+        Returns the directory of the entry of the given key (marking it as recently used), or None on a miss.
+
+        :param key: string
+        :return: string
+        """
+        entry = os.path.join(self.cache_dir, key)
+        try:
+            os.utime(entry)
+        except FileNotFoundError:
+            return None
+        return entry
+
+    def put(self, key: str, write):
+        """
+        Adds an entry for the given key, whose files are written by calling write with the directory of the entry, and
+            evicts entries if the cache exceeds its budget. The entry is only visible once fully written.
+
+        :param key: string
+        :param write: function taking a directory
+        """
+        entry = os.path.join(self.cache_dir, key)
+        temporary_entry = entry + "." + str(os.getpid()) + ".tmp"
+        os.makedirs(temporary_entry, exist_ok=True)
+        try:
+            write(temporary_entry)
+        except Exception:
+            shutil.rmtree(temporary_entry, ignore_errors=True)
+            raise
+
+        try:
+            os.rename(temporary_entry, entry)
+        except OSError:
+            # Another process added the entry concurrently
+            shutil.rmtree(temporary_entry, ignore_errors=True)
+
+        self.__evict()
+
+    @staticmethod
+    def __size(directory: str):
+        """
+        Returns the size of the files in a directory in bytes.
+
+        :param directory: string
+        :return: int
+        """
+        return sum(entry.stat().st_size for entry in os.scandir(directory) if entry.is_file())
+
+    def __evict(self):
+        """
+        Removes the least recently used entries until the cache is within its budget.
+        """
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_dir() and not entry.name.endswith(".tmp"):
+                try:
+                    entries.append((entry.stat().st_mtime, self.__size(entry.path), entry.path))
+                except FileNotFoundError:
+                    continue
+
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_size:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            size -= entry_size
+            logger.debug("Evicted synthesis cache entry; " + path)
+
+    @staticmethod
+    def hash_file(path: str):
+        """
+        Hashes the content of a file.
+
+        :param path: string
+        :return: string
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
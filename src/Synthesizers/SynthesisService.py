@@ -0,0 +1,203 @@
+import os
+import queue
+import atexit
+import signal
+import itertools
+import multiprocessing
+from Utils.LoggerUtil import LoggerUtil
+from Utils.ConfigUtil import ConfigUtil
+from Utils.ProfilerUtil import ProfilerUtil
+
+logger = LoggerUtil.instance()
+config = ConfigUtil.instance()
+profiler = ProfilerUtil.instance()
+
+
+def run_sds(synthesis_config: dict):
+    """
+    Runs the SDS pipeline on the given synthesis configurations; the default runner of a SynthesisService.
+
+    :param synthesis_config: dictionary
+    """
+    # Import the SDS pipeline on first use, such that other synthesizers can be used without it
+    from lib.python_pipeline.src.showcase import runForConfig
+    runForConfig(synthesis_config)
+
+
+class SynthesisService:
+    """
+    A class for a long-lived synthesis service; a warm worker process that keeps the SDS pipeline imported between
+        syntheses, and runs the synthesis configurations it is given over a local queue. Only the configurations are
+        handed over, as the SDS pipeline reads its input from and writes its outputs to the paths they name. A run that
+        fails is retried, and a run that does not complete within the timeout is killed (along with SDS's own parallel
+        jobs) and retried on a restarted worker.
+    The worker is not a daemon, such that SDS can run its pool of parallel jobs. instance() returns the service of the
+        current process, such that the synthesizers of a process share a single worker.
+
+    Methods: instance(), run(), close()
+    """
+    # The service of the current process, and the process it belongs to (forked processes start a service of their own)
+    _instance = None
+    _owner = None
+
+    # The interval in seconds at which the liveness of the worker (and of its parent, by the worker) is checked
+    POLL_INTERVAL = 1.0
+
+    def __init__(self, runner=run_sds, timeout=None, retries=None):
+        """
+        Initializes a SynthesisService running synthesis configurations with runner (a module-level function, run in the
+            worker), with the timeout in seconds and the number of retries of each run; defaulting to the
+            service_timeout and service_retries configurations. The worker is started by the first run.
+        """
+        self.runner = runner
+        self.timeout = timeout if timeout is not None else config["SYNTHESIS"].getfloat("service_timeout")
+        self.retries = retries if retries is not None else config["SYNTHESIS"].getint("service_retries")
+        if self.timeout <= 0:
+            raise ValueError("timeout=" + str(self.timeout) + " must be positive")
+        if self.retries < 0:
+            raise ValueError("retries=" + str(self.retries) + " must not be negative")
+
+        # The worker with its queues, and the identifiers of runs
+        self.__worker = None
+        self.__jobs = None
+        self.__results = None
+        self.__identifiers = itertools.count()
+
+    @classmethod
+    def instance(cls):
+        """
+        Returns the service of the current process, creating it on first use.
+
+        :return: SynthesisService
+        """
+        if cls._instance is None or cls._owner != os.getpid():
+            cls._instance = cls()
+            cls._owner = os.getpid()
+        return cls._instance
+
+    @staticmethod
+    def _serve(runner, jobs, results):
+        """
+        Serves runs in the worker process until it receives None, or its parent process exits. The worker leads a
+            process group of its own, such that a run can be killed along with the processes it started.
+
+        :param runner: function
+        :param jobs: queue of tuples of an identifier and a dictionary
+        :param results: queue of tuples of an identifier and an error message (None if the run succeeded)
+        """
+        if hasattr(os, "setpgrp"):
+            os.setpgrp()
+        parent = os.getppid()
+
+        while True:
+            try:
+                job = jobs.get(timeout=SynthesisService.POLL_INTERVAL)
+            except queue.Empty:
+                if os.getppid() != parent:
+                    return
+                continue
+            if job is None:
+                return
+
+            identifier, synthesis_config = job
+            try:
+                runner(synthesis_config)
+                results.put((identifier, None))
+            except Exception as exception:
+                results.put((identifier, repr(exception)))
+
+    def __start(self):
+        """
+        Starts the worker process with fresh queues.
+        """
+        self.__jobs = multiprocessing.Queue()
+        self.__results = multiprocessing.Queue()
+        self.__worker = multiprocessing.Process(target=SynthesisService._serve, daemon=False,
+                                                args=(self.runner, self.__jobs, self.__results))
+        self.__worker.start()
+        atexit.register(self.close)
+
+        logger.debug("Started synthesis service; worker " + str(self.__worker.pid))
+
+    def __stop(self, kill=False):
+        """
+        Stops the worker process; asking it to exit, or killing its process group if kill is set (or it does not exit
+            in time).
+
+        :param kill: boolean
+        """
+        if not kill and self.__worker.is_alive():
+            self.__jobs.put(None)
+            self.__worker.join(timeout=self.POLL_INTERVAL)
+        if self.__worker.is_alive():
+            try:
+                os.killpg(self.__worker.pid, signal.SIGKILL)
+            except (AttributeError, ProcessLookupError):
+                self.__worker.kill()
+            self.__worker.join()
+        self.__jobs.close()
+        self.__results.close()
+        self.__worker = None
+        atexit.unregister(self.close)
+
+    def __await(self, identifier: int):
+        """
+        Waits for the result of the run with the given identifier, until the timeout or the worker exits. Returns the
+            error message of the run (None if it succeeded), or False if it did not complete.
+
+        :param identifier: int
+        :return: string
+        """
+        waited = 0.0
+        while waited < self.timeout:
+            interval = min(self.POLL_INTERVAL, self.timeout - waited)
+            try:
+                returned, error = self.__results.get(timeout=interval)
+            except queue.Empty:
+                waited += interval
+                if not self.__worker.is_alive():
+                    return False
+                continue
+            if returned == identifier:
+                return error
+        return False
+
+    def run(self, synthesis_config: dict):
+        """
+        Runs the given synthesis configurations in the worker, starting (or restarting) it if needed, and retrying up
+            to the configured number of retries.
+        Throws: RuntimeError, if the run failed (or timed out) on every attempt.
+
+        :param synthesis_config: dictionary
+        """
+        error = None
+        for attempt in range(self.retries + 1):
+            if attempt > 0:
+                profiler.count("synthesis_retries")
+            if self.__worker is None:
+                self.__start()
+
+            identifier = next(self.__identifiers)
+            self.__jobs.put((identifier, synthesis_config))
+            error = self.__await(identifier)
+            if error is None:
+                return
+
+            # Kill the worker if it did not complete the run (e.g. it hung or crashed), such that it is restarted
+            if error is False:
+                error = "did not complete within " + str(self.timeout) + " seconds"
+                self.__stop(kill=True)
+            logger.warning("Failed synthesis run " + str(identifier) + " (attempt " + str(attempt + 1) + " of " +
+                           str(self.retries + 1) + "); " + error)
+
+        raise RuntimeError("Failed synthesis run on all " + str(self.retries + 1) + " attempts; " + error)
+
+    def close(self):
+        """
+        Closes the service, stopping its worker (if started).
+        """
+        if self.__worker is None:
+            return
+        self.__stop()
+
+        logger.debug("Closed synthesis service")
@@ -1,13 +1,26 @@
+import os
 import configparser
 
 
 class ConfigUtil:
     """
+    A class for the configurations of the pipeline (see Config.ini). instance() returns a proxy of the configurations
+        that reads them on first use, such that importing a module has no side effects and the configurations can be
+        loaded explicitly (e.g. from another path) before they are used. The configurations are read from the path in
+        the SDS_ATTACK_CONFIG environment variable if set, and from the Config.ini next to the sources otherwise,
+        regardless of the working directory.
 
+    Methods: instance(), load(), is_loaded()
     """
     _instance = None
     _config = None
 
+    # The environment variable holding the path of the configurations (inherited by worker processes)
+    ENVIRONMENT_VARIABLE = "SDS_ATTACK_CONFIG"
+
+    # The default path of the configurations; Config.ini in the src directory
+    DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Config.ini")
+
     def __init__(self):
         raise RuntimeError("Must be instantiated using instance()")
 
@@ -15,6 +28,57 @@ class ConfigUtil:
     def instance(cls):
         if cls._instance is None:
             cls._instance = cls.__new__(cls)
-            cls._config = configparser.ConfigParser(interpolation=None)
-            cls._config.read("Config.ini")
+        return cls._instance
+
+    @classmethod
+    def load(cls, path=None):
+        """
+        Reads the configurations from the given path (see the class otherwise), replacing any read before, and exports
+            the path to the environment such that worker processes read the same configurations.
+        Throws: FileNotFoundError, if the file does not exist.
+
+        :param path: string
+        :return: ConfigParser
+        """
+        if path is None:
+            path = os.environ.get(cls.ENVIRONMENT_VARIABLE) or cls.DEFAULT_PATH
+        if not os.path.isfile(path):
+            raise FileNotFoundError("The configurations " + path + " do not exist")
+
+        config = configparser.ConfigParser(interpolation=None)
+        config.read(path)
+        cls._config = config
+        os.environ[cls.ENVIRONMENT_VARIABLE] = os.path.abspath(path)
+        return config
+
+    @classmethod
+    def is_loaded(cls):
+        """
+        Checks if the configurations have been read.
+
+        :return: boolean
+        """
+        return cls._config is not None
+
+    @classmethod
+    def __parser(cls):
+        """
+        Returns the configurations, reading them on first use.
+
+        :return: ConfigParser
+        """
+        if cls._config is None:
+            cls.load()
         return cls._config
+
+    def __getitem__(self, section):
+        return self.__parser()[section]
+
+    def __setitem__(self, section, options):
+        self.__parser()[section] = options
+
+    def __contains__(self, section):
+        return section in self.__parser()
+
+    def __getattr__(self, name):
+        return getattr(self.__parser(), name)
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+from Utils.LoggerUtil import LoggerUtil
+
+logger = LoggerUtil.instance()
+
+
+class DtypeUtil:
+    """
+    A class for compacting the data types of datasets; picking the narrowest lossless data type per column (the
+        smallest integer type holding its range, nullable integers for columns with missing values, float32 if
+        lossless, and categoricals for low-cardinality strings), and applying such a schema to datasets read later.
+
+    Methods: compact_dtype(), compact_schema(), compact(), apply()
+    """
+    # The candidate integer types, narrowest first
+    INTEGER_TYPES = (np.int8, np.int16, np.int32, np.int64)
+
+    # The maximum ratio of distinct values to rows for which strings are considered low-cardinality
+    CATEGORY_RATIO = 0.5
+
+    @classmethod
+    def compact_dtype(cls, column: pd.Series, headroom=1):
+        """
+        Returns the narrowest lossless data type of the given column. Integer types are chosen such that they also hold
+            the values headroom outside the column's range (e.g. the out-of-domain values probed by the attacker).
+
+        :param column: series
+        :param headroom: integer
+        :return: data type
+        """
+        if pd.api.types.is_bool_dtype(column.dtype):
+            return column.dtype
+
+        values = column.dropna()
+        if pd.api.types.is_numeric_dtype(column.dtype):
+            if values.empty:
+                return column.dtype
+            values = values.to_numpy(dtype=np.float64)
+
+            if not np.array_equal(values, np.floor(values)):
+                # Non-integer values are kept as floats; float32 if they round-trip exactly
+                is_lossless = np.array_equal(values.astype(np.float32).astype(np.float64), values)
+                return np.dtype(np.float32) if is_lossless else np.dtype(np.float64)
+
+            # The narrowest integer type holding the range (and its headroom), nullable if values are missing
+            low, high = values.min() - headroom, values.max() + headroom
+            integer_type = next((integer_type for integer_type in cls.INTEGER_TYPES
+                                 if np.iinfo(integer_type).min <= low and high <= np.iinfo(integer_type).max), None)
+            if integer_type is None:
+                return column.dtype
+            if values.shape[0] < column.shape[0]:
+                return pd.api.types.pandas_dtype(np.dtype(integer_type).name.capitalize())
+            return np.dtype(integer_type)
+
+        if pd.api.types.is_object_dtype(column.dtype) and values.nunique() <= cls.CATEGORY_RATIO * column.shape[0]:
+            return pd.CategoricalDtype()
+        return column.dtype
+
+    @classmethod
+    def compact_schema(cls, dataset: pd.DataFrame, headroom=1):
+        """
+        Returns the narrowest lossless data type of each column of the given dataset (see compact_dtype).
+
+        :param dataset: dataframe
+        :param headroom: integer
+        :return: dictionary
+        """
+        return {col: cls.compact_dtype(dataset[col], headroom) for col in dataset.columns}
+
+    @classmethod
+    def compact(cls, dataset: pd.DataFrame, headroom=1):
+        """
+        Returns the given dataset with the narrowest lossless data type per column (see compact_dtype).
+
+        :param dataset: dataframe
+        :param headroom: integer
+        :return: dataframe
+        """
+        compacted = dataset.astype(cls.compact_schema(dataset, headroom))
+
+        logger.debug("Compacted dataset; " + str(dataset.memory_usage(deep=True).sum()) + " to " +
+                     str(compacted.memory_usage(deep=True).sum()) + " bytes")
+        return compacted
+
+    @staticmethod
+    def __is_lossless(column: pd.Series, cast: pd.Series):
+        """
+        Checks if a column was cast without changing its values (e.g. by integer wraparound).
+
+        :param column: series
+        :param cast: series
+        :return: boolean
+        """
+        if not pd.api.types.is_numeric_dtype(cast.dtype):
+            return True
+        original = pd.to_numeric(column, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        return np.array_equal(original, cast.to_numpy(dtype=np.float64, na_value=np.nan), equal_nan=True)
+
+    @staticmethod
+    def apply(dataset: pd.DataFrame, schema: dict):
+        """
+        Returns the given dataset with the data types of the schema applied to the columns it contains. Columns whose
+            values cannot be cast (e.g. values outside the range of a compact integer type) keep their data type.
+
+        :param dataset: dataframe
+        :param schema: dictionary mapping columns to data types
+        :return: dataframe
+        """
+        columns = {}
+        for col, dtype in schema.items():
+            if col not in dataset.columns or dataset[col].dtype == dtype:
+                continue
+            try:
+                column = dataset[col].astype(dtype)
+            except (ValueError, TypeError, OverflowError):
+                column = None
+
+            if column is not None and DtypeUtil.__is_lossless(dataset[col], column):
+                columns[col] = column
+            else:
+                logger.debug("Kept data type of column; " + col + " cannot be cast to " + str(dtype))
+
+        if len(columns) < 1:
+            return dataset
+        return dataset.assign(**columns)
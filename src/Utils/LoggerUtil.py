@@ -4,7 +4,8 @@ from Utils.ConfigUtil import ConfigUtil
 
 class LoggerUtil:
     """
-
+    A class for the logger of the pipeline. instance() returns a proxy of the logger that sets up logging (see the
+        LOGGING configurations) on first use rather than on import.
     """
     _instance = None
     _logger = None
@@ -16,15 +17,27 @@ class LoggerUtil:
     def instance(cls):
         if cls._instance is None:
             cls._instance = cls.__new__(cls)
+        return cls._instance
+
+    @classmethod
+    def __logger(cls):
+        """
+        Returns the logger, setting up logging on first use.
 
+        :return: Logger
+        """
+        if cls._logger is None:
             # Create logging instance depending on verbose flag; root logger if set (includes library's' logs)
             # Otherwise a non-root logger; SDS-logger, which only logs from SDS-Attack-Pipeline.
             config = ConfigUtil.instance()
             logging.basicConfig(format=config["LOGGING"]["format"], datefmt=config["LOGGING"]["date_format"])
             if config["LOGGING"]["verbose"] == "False":
-                cls._logger = logging.getLogger("SDS-logger")
-                cls._logger.setLevel(config["LOGGING"]["level"])
+                logger = logging.getLogger("SDS-logger")
             else:
-                cls._logger = logging.getLogger()
-                cls._logger.setLevel(config["LOGGING"]["level"])
+                logger = logging.getLogger()
+            logger.setLevel(config["LOGGING"]["level"])
+            cls._logger = logger
         return cls._logger
+
+    def __getattr__(self, name):
+        return getattr(self.__logger(), name)
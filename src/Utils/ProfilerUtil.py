@@ -0,0 +1,249 @@
+import os
+import io
+import time
+import json
+import pstats
+import cProfile
+import functools
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from Utils.ConfigUtil import ConfigUtil
+from Utils.LoggerUtil import LoggerUtil
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+class ProfilerUtil:
+    """
+    A class for instrumenting the stages of the pipeline with timers, counters and peak-memory tracking, exportable as
+        JSON or in the Chrome trace format. cProfile or tracemalloc can be enabled for a single stage through the
+        configurations. The events of the trace are only kept if it is exported (see export_format), up to MAX_EVENTS;
+        processes attacking several targets reset() the profiler before each.
+
+    Methods: stage(), timed(), count(), summary(), log_summary(), export(), reset()
+    """
+    _instance = None
+
+    # The settings of the profiler, read from the configurations on first use
+    SETTINGS = ("enabled", "track_memory", "profile_stage", "tracemalloc_stage", "keep_events")
+
+    # The maximum number of events kept for the trace, beyond which events are dropped (and counted)
+    MAX_EVENTS = 100000
+
+    def __init__(self):
+        raise RuntimeError("Must be instantiated using instance()")
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls.__new__(cls)
+            cls._instance.reset()
+        return cls._instance
+
+    def __getattr__(self, name: str):
+        """
+        Reads the settings of the profiler from the PROFILING configurations on first use (rather than on import),
+            keeping any setting overridden before.
+        """
+        if name not in self.SETTINGS:
+            raise AttributeError("'ProfilerUtil' object has no attribute '" + name + "'")
+
+        config = ConfigUtil.instance()
+        settings = {"enabled": config["PROFILING"].getboolean("enabled"),
+                    "track_memory": config["PROFILING"].getboolean("track_memory"),
+                    "profile_stage": config["PROFILING"]["profile_stage"],
+                    "tracemalloc_stage": config["PROFILING"]["tracemalloc_stage"],
+                    "keep_events": config["PROFILING"]["export_format"] != "none"}
+        for setting, value in settings.items():
+            self.__dict__.setdefault(setting, value)
+        return self.__dict__[name]
+
+    def reset(self):
+        """
+        Discards all recorded stages, events and counters.
+        """
+        self.__stages = {}
+        self.__counters = {}
+        self.__events = []
+        self.__origin = time.perf_counter()
+        self.__profile = None
+        self.__snapshots = []
+
+        # The peak traced memory of each active (nested) stage, recorded before nested stages reset the peak
+        self.__peaks = []
+
+    @staticmethod
+    def __peak_rss():
+        """
+        Returns the peak resident set size of the process in kilobytes, or None if it cannot be determined.
+
+        :return: integer
+        """
+        if resource is None:
+            return None
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    @contextmanager
+    def stage(self, name: str, **details):
+        """
+        A context manager recording the wall time (and peak memory, if track_memory is set) of a stage of the pipeline,
+            along with the given details. Profiles the stage using cProfile or tracemalloc if configured for it.
+
+        :param name: string
+        :param details: keyword arguments recorded with the event
+        """
+        if not self.enabled:
+            yield
+            return
+
+        # Start the profilers configured for this stage
+        profile = None
+        if name == self.profile_stage:
+            profile = self.__profile = self.__profile or cProfile.Profile()
+            profile.enable()
+        is_tracing = self.track_memory or name == self.tracemalloc_stage
+        started_tracing = is_tracing and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if is_tracing:
+            # Keep the peak of the enclosing stage before resetting it for this stage
+            if len(self.__peaks) > 0:
+                self.__peaks[-1] = max(self.__peaks[-1], tracemalloc.get_traced_memory()[1])
+            self.__peaks.append(0)
+            tracemalloc.reset_peak()
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+
+            if profile is not None:
+                profile.disable()
+            peak_memory = None
+            if is_tracing:
+                peak = max(tracemalloc.get_traced_memory()[1], self.__peaks.pop())
+                if len(self.__peaks) > 0:
+                    self.__peaks[-1] = max(self.__peaks[-1], peak)
+                peak_memory = peak // 1024
+
+                if name == self.tracemalloc_stage:
+                    self.__snapshots.append(tracemalloc.take_snapshot())
+                if started_tracing and len(self.__peaks) == 0:
+                    tracemalloc.stop()
+
+            # Aggregate the stage, and record the event for the trace
+            stage = self.__stages.setdefault(name, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0,
+                                                    "peak_memory_kb": None})
+            stage["count"] += 1
+            stage["total_seconds"] += duration
+            stage["max_seconds"] = max(stage["max_seconds"], duration)
+            if peak_memory is not None:
+                stage["peak_memory_kb"] = max(stage["peak_memory_kb"] or 0, peak_memory)
+
+            # Events are only kept if a trace is exported, up to MAX_EVENTS
+            if self.keep_events and len(self.__events) < self.MAX_EVENTS:
+                self.__events.append({"name": name, "start": start - self.__origin, "duration": duration,
+                                      "thread": threading.get_ident(), "peak_memory_kb": peak_memory, **details})
+            elif self.keep_events:
+                self.__counters["dropped_events"] = self.__counters.get("dropped_events", 0) + 1
+
+    def timed(self, name: str):
+        """
+        A decorator recording each call of the decorated function as a stage of the given name.
+
+        :param name: string
+        :return: function
+        """
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, name: str, value=1):
+        """
+        Increments the counter of the given name by value.
+
+        :param name: string
+        :param value: numerical
+        """
+        if self.enabled:
+            self.__counters[name] = self.__counters.get(name, 0) + value
+
+    def summary(self):
+        """
+        Returns a summary of the recorded stages and counters, along with the peak resident set size of the process.
+
+        :return: dictionary
+        """
+        stages = {name: {**stage, "mean_seconds": stage["total_seconds"] / stage["count"]}
+                  for name, stage in self.__stages.items()}
+        return {"stages": stages, "counters": dict(self.__counters), "peak_rss_kb": self.__peak_rss()}
+
+    def log_summary(self):
+        """
+        Logs a summary of the recorded stages (ordered by total time) and counters, along with the output of the
+            configured cProfile and tracemalloc profiles.
+        """
+        if not self.enabled:
+            return
+        logger = LoggerUtil.instance()
+
+        summary = self.summary()
+        lines = ["Profile summary; peak RSS " + str(summary["peak_rss_kb"]) + " KB"]
+        for name, stage in sorted(summary["stages"].items(), key=lambda item: -item[1]["total_seconds"]):
+            lines.append("  " + name + ": " + str(stage["count"]) + " calls, " +
+                         str(round(stage["total_seconds"], 4)) + "s total, " + str(round(stage["mean_seconds"], 4)) +
+                         "s mean, " + str(round(stage["max_seconds"], 4)) + "s max" +
+                         ("" if stage["peak_memory_kb"] is None else ", peak " + str(stage["peak_memory_kb"]) + " KB"))
+        for name, value in summary["counters"].items():
+            lines.append("  " + name + ": " + str(value))
+
+        if self.__profile is not None:
+            stream = io.StringIO()
+            pstats.Stats(self.__profile, stream=stream).sort_stats("cumulative").print_stats(20)
+            lines.append("cProfile of stage " + self.profile_stage + ":\n" + stream.getvalue())
+        if len(self.__snapshots) > 0:
+            statistics = self.__snapshots[-1].statistics("lineno")[:10]
+            lines.append("tracemalloc of stage " + self.tracemalloc_stage + ":\n" +
+                         "\n".join("  " + str(statistic) for statistic in statistics))
+
+        logger.info("\n".join(lines))
+
+    def export(self, path: str, trace_format="json"):
+        """
+        Exports the recorded stages, counters and events to a file; either as JSON (summary and events) or in the
+            Chrome trace format (for chrome://tracing or Perfetto).
+
+        :param path: string
+        :param trace_format: string, either 'json' or 'chrome'
+        """
+        if trace_format == "chrome":
+            process = os.getpid()
+            data = {"traceEvents": [
+                {"name": event["name"], "cat": "stage", "ph": "X", "pid": process, "tid": event["thread"],
+                 "ts": round(event["start"] * 1e6, 3), "dur": round(event["duration"] * 1e6, 3),
+                 "args": {key: value for key, value in event.items()
+                          if key not in ("name", "start", "duration", "thread")}}
+                for event in self.__events
+            ] + [
+                {"name": name, "cat": "counter", "ph": "C", "pid": process, "ts": 0, "args": {name: value}}
+                for name, value in self.__counters.items()
+            ]}
+        elif trace_format == "json":
+            data = {**self.summary(), "events": self.__events}
+        else:
+            raise ValueError("trace_format=" + str(trace_format) + " must be either 'json' or 'chrome'")
+
+        with open(path, "w") as file:
+            json.dump(data, file, default=str)
+
+        if self.__profile is not None:
+            self.__profile.dump_stats(os.path.splitext(path)[0] + ".prof")
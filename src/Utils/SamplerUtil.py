@@ -1,52 +1,246 @@
+import numpy as np
 import pandas as pd
 from Utils.ConfigUtil import ConfigUtil
 from Utils.LoggerUtil import LoggerUtil
+from Utils.ProfilerUtil import ProfilerUtil
+from Utils.DtypeUtil import DtypeUtil
+from File.DatasetCacheFile import DatasetCacheFile
 
 logger = LoggerUtil.instance()
 config = ConfigUtil.instance()
+profiler = ProfilerUtil.instance()
 
 
 class SamplerUtil:
     """
-    A class for sampling a dataset using pandas dataframes.
+    A class for sampling a dataset using pandas dataframes; either by reading the whole dataset, by streaming it in
+        chunks (parsing only the sampled columns) and reservoir sampling, such that memory is bounded by the sample, or
+        by reading only the sampled rows and columns from a columnar cache of the dataset (built on first use). Samples
+        can be compacted to the narrowest lossless data type per column.
 
-    Methods: sample(), insert_sample(), insert_samples()
+    Methods: sample()
     """
     def __init__(self):
         """
         Initializes an instance of SamplerUtil.
         """
         self.dataset_path = config["SENSITIVE"]["dataset_path"]
+        self.streaming = config["SENSITIVE"].getboolean("streaming")
+        self.chunk_size = config["SENSITIVE"].getint("chunk_size")
+        self.cache = config["SENSITIVE"].getboolean("cache")
+        self.compact = config["SENSITIVE"].getboolean("compact_dtypes")
 
-    def sample(self, n=1, m=-1, cols=None):
+    @staticmethod
+    def __determine_columns(header, m, cols):
         """
-        Creates CSV file given a pandas dataframe in the corresponding directory at root by overwriting.
+        Determines the columns to sample given the header of the dataset; the columns in cols if given, and otherwise
+            the first m columns (all if m is -1).
+
+        :param header: list of strings
+        :param m: integer
+        :param cols: list of strings
+        :return: list of strings
+        """
+        if cols is not None:
+            missing = [col for col in cols if col not in header]
+            if len(missing) > 0:
+                raise KeyError("Columns not in the dataset: " + str(missing))
+            return list(cols)
+        return header if m == -1 else header[:m]
+
+    def __determine_dtypes(self, columns):
+        """
+        Determines the data types the given columns are sampled as from the first chunk of the dataset; the narrowest
+            lossless data type of numerical columns (see DtypeUtil), such that the reservoir holds compact values, and
+            objects for other columns.
+
+        :param columns: list of strings
+        :return: dictionary
+        """
+        head = pd.read_csv(self.dataset_path, usecols=columns, na_values='N', nrows=self.chunk_size)
+        schema = DtypeUtil.compact_schema(head[columns])
+        return {col: object if isinstance(dtype, pd.CategoricalDtype) or dtype == object else dtype
+                for col, dtype in schema.items()}
+
+    @staticmethod
+    def __widen_dtype(dtype):
+        """
+        Returns the data type read_csv parses a column of the given compact data type as; 64-bit integers, and floats
+            for (nullable) integers with missing values and other numbers.
+
+        :param dtype: data type
+        :return: data type
+        """
+        if not pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+            return dtype
+        if pd.api.types.is_integer_dtype(dtype) and not isinstance(dtype, pd.api.extensions.ExtensionDtype):
+            return np.dtype(np.int64)
+        return np.dtype(np.float64)
+
+    @staticmethod
+    def __as_text(values):
+        """
+        Returns the given values as strings, keeping missing values.
+
+        :param values: numpy array
+        :return: numpy array of objects
+        """
+        values = pd.Series(values, dtype=object)
+        return values.where(values.isna(), values.astype(str)).to_numpy()
+
+    def __reservoir_sample(self, n, columns, rng, compact=False):
+        """
+        Samples n rows of the given columns uniformly (reservoir sampling; algorithm R) while reading the dataset in
+            chunks, holding at most n rows and a single chunk in memory. The reservoir holds the data types determined
+            from the first chunk; a column falls back to objects if a later chunk does not fit its data type. The
+            sample is returned with those data types if compact, and otherwise with the data types read_csv would parse.
+            The sampled rows keep their position in the dataset as index.
+
+        :param n: integer
+        :param columns: list of strings
+        :param rng: numpy random generator
+        :param compact: boolean
+        :return: dataframe
+        """
+        dtypes = self.__determine_dtypes(columns)
+        reservoir = {col: np.empty(n, dtype=dtype) if isinstance(dtype, np.dtype)
+                     else pd.array(np.zeros(n, dtype=np.int64), dtype=dtype) for col, dtype in dtypes.items()}
+        positions = np.empty(n, dtype=np.int64)
+
+        # Numerical columns are parsed as inferred, and cast to their data type per chunk
+        parse_dtypes = {col: object for col, dtype in dtypes.items() if dtype == object}
+        texts = set()
+
+        seen = 0
+        for chunk in pd.read_csv(self.dataset_path, usecols=columns, dtype=parse_dtypes, na_values='N',
+                                 chunksize=self.chunk_size):
+            chunk = DtypeUtil.apply(chunk, {col: dtype for col, dtype in dtypes.items() if dtype != object})
+            for col, dtype in dtypes.items():
+                if dtype != object and chunk[col].dtype != dtype:
+                    logger.debug("Sampling column as objects; " + col + " does not fit " + str(dtype) +
+                                 " after row " + str(seen))
+                    dtypes[col] = object
+                    reservoir[col] = pd.Series(reservoir[col]).to_numpy(dtype=object, na_value=np.nan)
+                if col not in parse_dtypes and col not in texts and not pd.api.types.is_numeric_dtype(chunk[col].dtype):
+                    # Text in a numerical column; the column is text throughout (as read_csv would parse it)
+                    texts.add(col)
+                    reservoir[col] = self.__as_text(reservoir[col])
+
+            chunk_positions = np.arange(seen, seen + chunk.shape[0])
+
+            # Fill the reservoir with the first n rows
+            filling = chunk_positions < n
+            slots = chunk_positions[filling]
+            rows = np.flatnonzero(filling)
+
+            # Replace a random slot with the row at position j with probability n / (j + 1)
+            replacing = np.flatnonzero(~filling)
+            draws = rng.integers(0, chunk_positions[replacing] + 1)
+            is_replaced = draws < n
+
+            # Only the last row replacing a slot within the chunk is kept
+            replaced_slots = draws[is_replaced][::-1]
+            replaced_rows = replacing[is_replaced][::-1]
+            replaced_slots, last = np.unique(replaced_slots, return_index=True)
+
+            slots = np.concatenate([slots, replaced_slots])
+            rows = np.concatenate([rows, replaced_rows[last]])
+            for col in columns:
+                if col in texts:
+                    reservoir[col][slots] = self.__as_text(chunk[col].to_numpy(dtype=object, na_value=np.nan)[rows])
+                elif dtypes[col] == object:
+                    reservoir[col][slots] = chunk[col].to_numpy(dtype=object, na_value=np.nan)[rows]
+                else:
+                    reservoir[col][slots] = chunk[col].array[rows]
+            positions[slots] = chunk_positions[rows]
+
+            seen += chunk.shape[0]
+
+        if seen < n:
+            raise ValueError("n=" + str(n) + " must not exceed the number of rows in the dataset=" + str(seen))
+
+        # Shuffle the reservoir (as it is ordered by slot), and infer the data types of columns that fell back to
+        # objects
+        order = rng.permutation(n)
+        sample = pd.DataFrame({col: values[order] for col, values in reservoir.items()},
+                              index=pd.Index(positions[order], name="ID"))
+        sample = sample.infer_objects()
+        if not compact:
+            sample = sample.astype({col: self.__widen_dtype(sample[col].dtype) for col in columns})
+        logger.debug("Reservoir sampled " + str(n) + " of " + str(seen) + " rows in chunks of " +
+                     str(self.chunk_size))
+        return sample
+
+    def __cache_sample(self, n, m, cols, rng):
+        """
+        Samples n rows uniformly from the columnar cache of the dataset, (re)building the cache if it is missing or the
+            dataset has changed. The sampled rows keep their position in the dataset as index.
 
         :param n: integer
         :param m: integer
         :param cols: list of strings
+        :param rng: numpy random generator
+        :return: dataframe
+        """
+        cache = DatasetCacheFile(self.dataset_path, chunk_size=self.chunk_size)
+        cache.load()
+        if cache.rows < n:
+            raise ValueError("n=" + str(n) + " must not exceed the number of rows in the dataset=" + str(cache.rows))
+
+        columns = self.__determine_columns(cache.columns, m, cols)
+        return cache.read(columns, rng.choice(cache.rows, size=n, replace=False))
+
+    @profiler.timed("sample")
+    def sample(self, n=1, m=-1, cols=None, seed=None, streaming=None, cache=None, compact=None):
+        """
+        Samples n rows of the sensitive dataset on the first m columns, or on the columns in cols if given.
+
+        :param n: integer
+        :param m: integer
+        :param cols: list of strings
+        :param seed: integer, the seed of the sampling for reproducibility (random if None)
+        :param streaming: boolean, whether to stream the dataset in chunks (configured if None)
+        :param cache: boolean, whether to sample from the columnar cache of the dataset (configured if None)
+        :param compact: boolean, whether to compact the data types of the sample (configured if None)
+        :return: dataframe
         """
         # If m and cols are both given the number of columns in cols must match m
         if m != -1 and cols is not None and m != len(cols):
             raise ValueError("m=" + str(m) + " must match the number of columns in cols=" + str(len(cols)))
         if n < 1 or not isinstance(n, int):
             raise ValueError("n=" + str(n) + " must be a positive integer")
+        streaming = streaming if streaming is not None else self.streaming
+        cache = cache if cache is not None else self.cache
+        compact = compact if compact is not None else self.compact
+
+        if cache:
+            # Read only the sampled rows and columns from the cache
+            sample = self.__cache_sample(n, m, cols, np.random.default_rng(seed))
+        elif streaming:
+            # Parse only the sampled columns, sampling while reading the dataset in chunks
+            columns = self.__determine_columns(list(pd.read_csv(self.dataset_path, nrows=0).columns), m, cols)
+            sample = self.__reservoir_sample(n, columns, np.random.default_rng(seed), compact)
+        else:
+            # Read the sensitive dataset
+            sensitive_dataset = pd.read_csv(self.dataset_path, na_values='N')
+            sensitive_dataset.index.name = "ID"
+
+            # Drop columns not in within 0 to m, if cols is not given
+            if m != -1 and cols is None:
+                # Drop columns with indices not in [0, m]
+                sensitive_dataset = sensitive_dataset.drop(
+                    sensitive_dataset.iloc[:, m:len(sensitive_dataset.columns)],
+                    axis=1
+                )
+            elif cols is not None:
+                # Include only columns that appear in cols
+                sensitive_dataset = sensitive_dataset[cols]
+
+            sample = sensitive_dataset.sample(n, random_state=seed)
 
-        # Read the sensitive dataset
-        sensitive_dataset = pd.read_csv(self.dataset_path, na_values='N')
-        sensitive_dataset.index.name = "ID"
-
-        # Drop columns not in within 0 to m, if cols is not given
-        if m != -1 and cols is None:
-            # Drop columns with indices not in [0, m]
-            sensitive_dataset = sensitive_dataset.drop(
-                sensitive_dataset.iloc[:, m:len(sensitive_dataset.columns)],
-                axis=1
-            )
-        elif cols is not None:
-            # Include only columns that appear in cols
-            sensitive_dataset = sensitive_dataset[cols]
+        if compact:
+            sample = DtypeUtil.compact(sample)
 
         logger.debug("Created sample; n = " + str(n) + " by m = " + str(m) + ", columns: " +
-                     str(list(sensitive_dataset.columns)))
-        return sensitive_dataset.sample(n)
+                     str(list(sample.columns)))
+        return sample
@@ -0,0 +1,136 @@
+import os
+import json
+import time
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+from Utils.ConfigUtil import ConfigUtil
+from Utils.LoggerUtil import LoggerUtil
+from Utils.ProfilerUtil import ProfilerUtil
+from Utils.SamplerUtil import SamplerUtil
+from Utils.WorkspaceUtil import WorkspaceUtil
+from Attackers.AttackPipeline import AttackPipeline
+
+logger = LoggerUtil.instance()
+config = ConfigUtil.instance()
+profiler = ProfilerUtil.instance()
+
+
+class SweepUtil:
+    """
+    A class for parameter sweeps; running the pipeline for every combination of a grid of parameters, concurrently and
+        each in its own process and workspace, producing a row of results per combination.
+
+    Methods: read_grid(), expand(), run()
+    """
+    # The parameters of a combination, and their default values
+    PARAMETERS = {"n": None, "m": -1, "cols": None, "k": None, "sensitive_attribute": None, "known_attributes": None,
+                  "k_search": None, "value_batch_size": None, "seed": None}
+
+    # Parameters whose values are lists, such that a list of strings is a single value rather than several
+    LIST_PARAMETERS = ("cols", "known_attributes")
+
+    def __init__(self, grid: dict, workers=None):
+        """
+        Initializes a SweepUtil given a grid mapping parameters to a list of values (or a single value), and the number
+            of worker processes (the number of cores if None).
+        """
+        unknown = [parameter for parameter in grid if parameter not in self.PARAMETERS]
+        if len(unknown) > 0:
+            raise ValueError("Unknown parameter(s) in grid: " + str(unknown))
+        for parameter in ("n", "k", "sensitive_attribute"):
+            if grid.get(parameter) is None:
+                raise ValueError("The grid must give a value for " + parameter)
+
+        self.grid = grid
+        self.workers = workers if workers is not None else os.cpu_count()
+
+    @staticmethod
+    def read_grid(path: str):
+        """
+        Reads a grid from a JSON or YAML (requires PyYAML) file.
+
+        :param path: string
+        :return: dictionary
+        """
+        with open(path, "r") as file:
+            if path.endswith((".yaml", ".yml")):
+                import yaml
+                return yaml.safe_load(file)
+            return json.load(file)
+
+    def expand(self):
+        """
+        Expands the grid into the list of all combinations of its parameters.
+
+        :return: list of dictionaries
+        """
+        options = {}
+        for parameter, default in self.PARAMETERS.items():
+            value = self.grid.get(parameter, default)
+            is_single_list = parameter in self.LIST_PARAMETERS and isinstance(value, list) and \
+                all(isinstance(item, str) for item in value)
+            options[parameter] = value if isinstance(value, list) and not is_single_list else [value]
+
+        return [dict(zip(options.keys(), values)) for values in itertools.product(*options.values())]
+
+    @staticmethod
+    def _run_combination(index: int, combination: dict, synthesis_config=None):
+        """
+        Runs the pipeline for a single combination in a workspace of its own, overriding the given synthesis
+            configurations (e.g. parallel_jobs), and returns its row of results.
+
+        :param index: int
+        :param combination: dictionary
+        :param synthesis_config: dictionary
+        :return: dictionary
+        """
+        profiler.reset()
+        start = time.perf_counter()
+        WorkspaceUtil.isolate("Sweep_" + config["GENERAL"]["name"], "combination_" + str(index))
+
+        sample = SamplerUtil().sample(n=combination["n"], m=combination["m"], cols=combination["cols"],
+                                     seed=combination["seed"])
+        pipeline = AttackPipeline(combination["k"], combination["sensitive_attribute"],
+                                  combination["known_attributes"], synthesis_config=synthesis_config)
+        result = pipeline.run(sample, k_search=combination["k_search"],
+                              value_batch_size=combination["value_batch_size"])
+
+        return {"combination": index, **combination, "k_found": result["k"],
+                "sensitive_values": result["sensitive_values"], "true_value": result["true_value"],
+                "is_vulnerable": result["is_vulnerable"], "syntheses": result["syntheses"],
+                "seconds": round(time.perf_counter() - start, 3)}
+
+    def run(self, on_result=None):
+        """
+        Runs every combination of the grid using a pool of worker processes, and returns the rows of results (ordered
+            by combination). on_result is called with each row as soon as its combination completes.
+
+        :param on_result: function
+        :return: dataframe
+        """
+        combinations = self.expand()
+        logger.info("Starting sweep; running " + str(len(combinations)) + " combinations using " +
+                    str(self.workers) + " workers")
+
+        # Divide the cores between the workers, such that SDS's own parallel jobs do not oversubscribe them
+        synthesis_config = {"parallel_jobs": max(1, (os.cpu_count() or 1) // self.workers)}
+
+        rows = []
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(SweepUtil._run_combination, index, combination, synthesis_config): index
+                       for index, combination in enumerate(combinations)}
+
+            for future in as_completed(futures):
+                try:
+                    row = future.result()
+                except Exception as exception:
+                    logger.error("Failed to run combination " + str(futures[future]) + "; " + repr(exception))
+                    row = {"combination": futures[future], **combinations[futures[future]], "error": repr(exception)}
+
+                rows.append(row)
+                if on_result is not None:
+                    on_result(row)
+
+        logger.info("Completed sweep; ran " + str(len(combinations)) + " combinations")
+        return pd.DataFrame(rows).sort_values("combination").reset_index(drop=True)
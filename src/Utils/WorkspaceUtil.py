@@ -0,0 +1,45 @@
+import os
+from Utils.ConfigUtil import ConfigUtil
+from Utils.LoggerUtil import LoggerUtil
+
+logger = LoggerUtil.instance()
+config = ConfigUtil.instance()
+
+
+class WorkspaceUtil:
+    """
+    A class for isolating the files generated by a process (e.g. a worker of a pool) in a directory of its own.
+
+    Methods: isolate(), root_dir()
+    """
+    # The configured root_dir before any isolation
+    _root_dir = None
+
+    @classmethod
+    def isolate(cls, *names):
+        """
+        Points the configured root_dir of the current process to a subdirectory of the original root_dir (created if
+            missing), such that Files created afterwards do not collide with those of other processes. Returns the
+            new root_dir.
+
+        :param names: strings, the path of the subdirectory relative to the original root_dir
+        :return: string
+        """
+        if cls._root_dir is None:
+            cls._root_dir = config["GENERAL"]["root_dir"]
+
+        root_dir = os.path.join(cls._root_dir, *[str(name) for name in names]) + os.path.sep
+        os.makedirs(root_dir, exist_ok=True)
+        config["GENERAL"]["root_dir"] = root_dir
+
+        logger.debug("Isolated workspace; " + root_dir)
+        return root_dir
+
+    @classmethod
+    def root_dir(cls):
+        """
+        Returns the configured root_dir before any isolation, e.g. for files shared by the isolated workspaces.
+
+        :return: string
+        """
+        return cls._root_dir if cls._root_dir is not None else config["GENERAL"]["root_dir"]
@@ -0,0 +1,12 @@
+import os
+import sys
+import runpy
+
+# The module entry point of the pipeline; `python -m src` from the project root, or `python .` from the src folder, runs
+# SDS-attack-pipeline.py (whose name cannot be imported) with the same arguments
+if __name__ == '__main__':
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    if src_dir not in sys.path:
+        sys.path.insert(0, src_dir)
+    sys.argv[0] = os.path.join(src_dir, "SDS-attack-pipeline.py")
+    runpy.run_path(sys.argv[0], run_name="__main__")
@@ -0,0 +1,56 @@
+import os
+import sys
+import pytest
+
+# The modules of the pipeline are imported relative to the src folder, as when running SDS-attack-pipeline.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from Utils.ConfigUtil import ConfigUtil
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    """
+    Points the configured root_dir to a temporary directory, such that the Files created by a test are discarded.
+    """
+    config = ConfigUtil.instance()
+    root_dir = config["GENERAL"]["root_dir"]
+    config["GENERAL"]["root_dir"] = str(tmp_path) + os.path.sep
+    yield tmp_path
+    config["GENERAL"]["root_dir"] = root_dir
+
+
+@pytest.fixture
+def make_attacker(workspace):
+    """
+    Returns a function creating a NaiveAttacker (or the given attacker_type) on a sample held in memory, synthesized
+        using the KAnonymitySynthesizer (a stand-in for SDS) with the given privacy resolution k; as in BenchmarkSuite.
+    """
+    from File.SensitiveDatasetFile import SensitiveDatasetFile
+    from File.SyntheticDatasetFile import SyntheticDatasetFile
+    from File.SynthesisConfigFile import SynthesisConfigFile
+    from Analyzers.SensitiveAnalyzer import SensitiveAnalyzer
+    from Attackers.NaiveAttacker import NaiveAttacker
+    from Synthesizers.KAnonymitySynthesizer import KAnonymitySynthesizer
+
+    def make_attacker(sample, k, attacker_type=NaiveAttacker, **kwargs):
+        sensitive_dataset_file = SensitiveDatasetFile(in_memory=True)
+        synthetic_dataset_file = SyntheticDatasetFile(in_memory=True)
+        sensitive_dataset_file.write(sample)
+        sensitive_analysis = SensitiveAnalyzer(sensitive_dataset_file).analyze(sample)
+
+        synthesizer = KAnonymitySynthesizer(SynthesisConfigFile(sensitive_dataset_file, synthetic_dataset_file))
+        synthesizer.synthesis_config_file.write({"reporting_resolution": k, "synthesis_mode": "row_seeded"})
+        synthesizer.synthesize(aggregate=True, generate=True)
+        return attacker_type(sensitive_dataset_file, synthetic_dataset_file, sensitive_analysis, synthesizer, **kwargs)
+
+    return make_attacker
+
+
+@pytest.fixture
+def sample():
+    """
+    A sample of 300 rows of generated NIST-shaped data, on its first 5 columns.
+    """
+    from Benchmarks.NISTDataGenerator import NISTDataGenerator
+    return NISTDataGenerator(seed=0).generate(300).iloc[:, :5]
@@ -0,0 +1,53 @@
+import pytest
+from Utils.ProfilerUtil import ProfilerUtil
+
+TARGETS = [1, 2, 3, 4]
+
+
+def attack(make_attacker, sample, target_index, **kwargs):
+    # The result of the attack and the number of syntheses it used, profiled from after the first synthesis
+    attacker = make_attacker(sample, 4, **kwargs)
+    ProfilerUtil.instance().reset()
+    initial_rounds = attacker.synthesizer.rounds
+    result = attacker.attack_loop(sensitive_col="MSP", k_search="linear", target_index=target_index)
+    return result, attacker.synthesizer.rounds - initial_rounds
+
+
+@pytest.mark.parametrize("target_index", TARGETS)
+def test_predicted_leaks_agree_with_confirmed_leaks(make_attacker, sample, target_index):
+    profiler = ProfilerUtil.instance()
+
+    # Every round is predicted, and confirmed by a synthesis
+    attack(make_attacker, sample, target_index, leak_prediction=True, confirm_leaks=True, confirm_negatives=1)
+    counters = profiler.summary()["counters"]
+
+    assert counters["predicted_rounds"] == counters["syntheses"] > 0
+    assert counters["confirmed_negative_rounds"] > 0
+    assert "mispredicted_rounds" not in counters
+
+
+@pytest.mark.parametrize("target_index", TARGETS)
+def test_predicted_attack_matches_the_synthesized_attack(make_attacker, sample, target_index):
+    synthesized, synthesized_rounds = attack(make_attacker, sample, target_index, leak_prediction=False)
+    predicted, predicted_rounds = attack(make_attacker, sample, target_index, leak_prediction=True,
+                                         confirm_leaks=True, confirm_negatives=0)
+
+    # Only the rounds with a predicted leak are synthesized
+    assert predicted == synthesized
+    assert predicted_rounds < synthesized_rounds
+
+
+def test_confirm_negatives_confirms_a_fraction_of_the_negative_rounds(make_attacker, sample):
+    profiler = ProfilerUtil.instance()
+    confirmed = {}
+    for confirm_negatives in (0, 0.5, 1):
+        attack(make_attacker, sample, 1, leak_prediction=True, confirm_leaks=True, confirm_negatives=confirm_negatives)
+        confirmed[confirm_negatives] = profiler.summary()["counters"].get("confirmed_negative_rounds", 0)
+
+    assert confirmed[0] == 0 and confirmed[1] > 1
+    assert confirmed[1] // 2 <= confirmed[0.5] <= (confirmed[1] + 1) // 2
+
+
+def test_confirm_negatives_must_be_a_fraction(make_attacker, sample):
+    with pytest.raises(ValueError):
+        make_attacker(sample, 4, leak_prediction=True, confirm_negatives=1.5)
@@ -0,0 +1,60 @@
+import copy
+import pytest
+from Utils.ProfilerUtil import ProfilerUtil
+from File.AttackStateFile import AttackStateFile
+
+
+class SnapshotAttackStateFile(AttackStateFile):
+    # An AttackStateFile keeping a copy of each state written, i.e. the state an attack interrupted after it leaves
+    def __init__(self):
+        super().__init__()
+        self.snapshots = []
+
+    def write(self, state: dict):
+        self.snapshots.append(copy.deepcopy(state))
+        super().write(state)
+
+
+def attack(make_attacker, sample, attack_state_file):
+    attacker = make_attacker(sample, 4, leak_prediction=False, attack_state_file=attack_state_file)
+    ProfilerUtil.instance().reset()
+    result = attacker.attack_loop(sensitive_col="MSP", k_search="linear", target_index=1)
+    return result, attacker.synthesizer.rounds
+
+
+@pytest.fixture
+def completed_attack(make_attacker, sample):
+    attack_state_file = SnapshotAttackStateFile()
+    result, rounds = attack(make_attacker, sample, attack_state_file)
+    assert attack_state_file.read()["completed"]
+    return result, rounds, attack_state_file.snapshots
+
+
+@pytest.mark.parametrize("interrupted_after", [1, 4, 5, 8])
+def test_resumed_attack_matches_the_uninterrupted_attack(make_attacker, sample, completed_attack, interrupted_after):
+    result, rounds, snapshots = completed_attack
+    interrupted_state = snapshots[interrupted_after - 1]
+    assert "completed" not in interrupted_state
+
+    attack_state_file = AttackStateFile()
+    attack_state_file.write(interrupted_state)
+    resumed_result, resumed_rounds = attack(make_attacker, sample, attack_state_file)
+
+    # The recorded rounds are replayed rather than synthesized, continuing the count of syntheses
+    counters = ProfilerUtil.instance().summary()["counters"]
+    assert resumed_result == result
+    assert resumed_rounds == rounds
+    assert counters["replayed_rounds"] == len(interrupted_state["rounds"])
+    assert counters["syntheses"] == len(snapshots[-1]["rounds"]) - len(interrupted_state["rounds"])
+
+    state = attack_state_file.read()
+    assert state["completed"] and state["k"] == result[1] and state["rounds"] == snapshots[-1]["rounds"]
+
+
+def test_completed_attack_is_replayed_without_synthesizing(make_attacker, sample, completed_attack):
+    result, rounds, snapshots = completed_attack
+    attack_state_file = AttackStateFile()
+    attack_state_file.write(snapshots[-1])
+
+    assert attack(make_attacker, sample, attack_state_file) == (result, rounds)
+    assert "syntheses" not in ProfilerUtil.instance().summary()["counters"]
@@ -0,0 +1,47 @@
+import numpy as np
+from Attackers.CandidateDomain import CandidateDomain
+
+
+def bucket_weights(weights, buckets):
+    return [float(np.sum(np.asarray(weights)[start:stop])) for start, stop in buckets]
+
+
+def test_quantiles_split_uniform_weights_into_equal_buckets():
+    buckets = CandidateDomain.quantiles(np.ones(12), 4)
+
+    assert buckets == [(0, 3), (3, 6), (6, 9), (9, 12)]
+
+
+def test_quantiles_cover_all_positions_contiguously():
+    weights = np.random.default_rng(0).random(50)
+    for parts in (2, 3, 7, 50, 80):
+        buckets = CandidateDomain.quantiles(weights, parts)
+
+        assert buckets[0][0] == 0 and buckets[-1][1] == 50
+        assert all(stop == start for (_, stop), (start, _) in zip(buckets[:-1], buckets[1:]))
+        assert all(stop > start for start, stop in buckets)
+        assert len(buckets) <= min(parts, 50)
+
+
+def test_quantiles_balance_skewed_weights():
+    weights = [8, 4, 2, 1, 1]
+    buckets = CandidateDomain.quantiles(weights, 2)
+
+    # The heaviest value holds half the weight, and is probed alone
+    assert buckets == [(0, 1), (1, 5)]
+    assert bucket_weights(weights, buckets) == [8.0, 8.0]
+
+    weights = [1, 1, 1, 1, 12]
+    assert CandidateDomain.quantiles(weights, 2) == [(0, 4), (4, 5)]
+
+
+def test_quantiles_split_concentrated_weights_by_size():
+    # Weights concentrated on the first position would not be split at all, and are split into equal sizes instead
+    assert CandidateDomain.quantiles([10, 0, 0, 0], 2) == [(0, 2), (2, 4)]
+    assert CandidateDomain.quantiles([0, 0, 0, 0], 2) == [(0, 2), (2, 4)]
+
+
+def test_quantiles_of_few_positions():
+    assert CandidateDomain.quantiles([], 3) == []
+    assert CandidateDomain.quantiles([5], 3) == [(0, 1)]
+    assert CandidateDomain.quantiles([1, 2, 3], 5) == [(0, 1), (1, 2), (2, 3)]
@@ -0,0 +1,25 @@
+import os
+import pandas as pd
+from Utils.ConfigUtil import ConfigUtil
+from File.DatasetCacheFile import DatasetCacheFile
+
+
+def test_sources_of_the_same_name_do_not_share_a_cache(workspace, monkeypatch):
+    config = ConfigUtil.instance()
+    monkeypatch.setitem(config["SENSITIVE"], "cache_dir", str(workspace / "cache"))
+
+    datasets = {}
+    for directory, offset in (("a", 0), ("b", 100)):
+        os.makedirs(workspace / directory)
+        datasets[directory] = pd.DataFrame({"AGEP": [offset + i for i in range(5)], "PUMA": list("vwxyz")})
+        datasets[directory].to_csv(workspace / directory / "dataset.csv", index=False)
+
+    caches = {directory: DatasetCacheFile(str(workspace / directory / "dataset.csv")) for directory in datasets}
+    for cache in caches.values():
+        cache.load()
+
+    # Each cache stays valid for its own source, and holds its content
+    for directory, cache in caches.items():
+        assert DatasetCacheFile(str(workspace / directory / "dataset.csv")).is_valid()
+        pd.testing.assert_frame_equal(cache.read().reset_index(drop=True), datasets[directory])
+    assert caches["a"].path != caches["b"].path
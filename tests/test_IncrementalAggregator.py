@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+from File.SensitiveDatasetFile import SensitiveDatasetFile
+from File.SyntheticDatasetFile import SyntheticDatasetFile
+from File.SynthesisConfigFile import SynthesisConfigFile
+from Synthesizers.IncrementalAggregator import IncrementalAggregator
+
+
+def synthesis_config_file(dataset: pd.DataFrame):
+    sensitive_dataset_file = SensitiveDatasetFile(in_memory=True)
+    sensitive_dataset_file.write(dataset)
+    synthesis_config_file = SynthesisConfigFile(sensitive_dataset_file, SyntheticDatasetFile(in_memory=True))
+    synthesis_config_file.configure({"reporting_resolution": 4, "reporting_length": 3})
+    return synthesis_config_file
+
+
+def sorted_counts(aggregator: IncrementalAggregator):
+    counts = aggregator.counts()
+    return counts[counts["count"] > 0].sort_values("selections").reset_index(drop=True)
+
+
+def sorted_aggregates(aggregator: IncrementalAggregator):
+    return aggregator.aggregates().sort_values("selections").reset_index(drop=True)
+
+
+def test_add_and_remove_match_a_full_fit(workspace, sample):
+    config_file = synthesis_config_file(sample)
+    aggregator = IncrementalAggregator(config_file)
+    aggregator.fit(sample)
+
+    # Payloads of repeated rows with missing values, as injected by the attacker, and a rolled back share of the sample
+    payload = sample.iloc[[1] * 5].assign(MSP=np.nan)
+    other_payload = sample.iloc[[2] * 3]
+    aggregator.add(payload)
+    aggregator.add(other_payload)
+    aggregator.remove(sample.iloc[:50])
+    aggregator.update(added=[sample.iloc[:20]], removed=[other_payload])
+
+    dataset = pd.concat([sample.iloc[:20], sample.iloc[50:], payload]).reset_index(drop=True)
+    fitted = IncrementalAggregator(config_file)
+    fitted.fit(dataset)
+
+    pd.testing.assert_frame_equal(sorted_counts(aggregator), sorted_counts(fitted))
+    pd.testing.assert_frame_equal(sorted_aggregates(aggregator), sorted_aggregates(fitted))
+    columns = ["PUMA", "AGEP", "SEX"]
+    assert aggregator.count(payload.iloc[0], columns) == fitted.count(payload.iloc[0], columns) > 5
@@ -0,0 +1,81 @@
+import pandas as pd
+import pytest
+from File.SensitiveDatasetFile import SensitiveDatasetFile
+from File.SyntheticDatasetFile import SyntheticDatasetFile
+from File.SynthesisConfigFile import SynthesisConfigFile
+from Synthesizers.IncrementalAggregator import IncrementalAggregator
+from Attackers.KEstimator import KEstimator
+
+
+def synthesis_config_file(dataset: pd.DataFrame, k: int, reporting_length: int):
+    sensitive_dataset_file = SensitiveDatasetFile(in_memory=True)
+    sensitive_dataset_file.write(dataset)
+    synthesis_config_file = SynthesisConfigFile(sensitive_dataset_file, SyntheticDatasetFile(in_memory=True))
+    synthesis_config_file.configure({"reporting_resolution": k, "reporting_length": reporting_length})
+    return synthesis_config_file
+
+
+def reported_aggregates(synthesis_config_file: SynthesisConfigFile):
+    aggregator = IncrementalAggregator(synthesis_config_file)
+    aggregator.fit()
+    return aggregator.aggregates()
+
+
+def test_candidates_divide_the_reported_counts(workspace):
+    dataset = pd.DataFrame({"A": ["a"] * 12 + ["b"] * 18})
+    estimator = KEstimator(synthesis_config_file(dataset, 6, 1))
+    aggregates = pd.DataFrame({"selections": ["A:a", "A:b", "A:c"], "count": [12, 18, 0]})
+
+    # Without the exact counts, every divisor of gcd(12, 18) = 6 is consistent
+    assert estimator.estimate(aggregates) == [1, 2, 3, 6]
+
+
+def test_unreported_combinations_bound_k(workspace):
+    # Only A:a (4 rows) meets k = 4, reported as 4; A:b (2 rows) is unreported, such that k > 2
+    dataset = pd.DataFrame({"A": ["a"] * 4 + ["b"] * 2})
+    config_file = synthesis_config_file(dataset, 4, 1)
+    aggregates = reported_aggregates(config_file)
+
+    assert aggregates.to_dict("list") == {"selections": ["A:a"], "count": [4]}
+    assert KEstimator(config_file).estimate(aggregates) == [1, 2, 4]
+    assert KEstimator(config_file).estimate(aggregates, dataset) == [4]
+
+
+def test_reported_counts_are_rounded_down_to_k(workspace):
+    # The reported counts 6 and 3 only imply that k divides 3, yet 7 is only rounded down to 6 by k = 3
+    dataset = pd.DataFrame({"A": ["a"] * 7 + ["b"] * 5})
+    config_file = synthesis_config_file(dataset, 3, 1)
+    aggregates = reported_aggregates(config_file)
+
+    assert sorted(aggregates["count"].tolist()) == [3, 6]
+    assert KEstimator(config_file).estimate(aggregates) == [1, 3]
+    assert KEstimator(config_file).estimate(aggregates, dataset) == [3]
+
+
+@pytest.mark.parametrize("k", [2, 3, 5, 8])
+def test_estimates_k_from_combinations(workspace, k):
+    dataset = pd.DataFrame({"A": [i % 5 for i in range(40)], "B": [i % 3 for i in range(40)],
+                            "C": [i % 7 for i in range(40)]})
+    config_file = synthesis_config_file(dataset, k, 2)
+
+    assert KEstimator(config_file).estimate(reported_aggregates(config_file), dataset) == [k]
+
+
+def test_inconsistent_aggregates_fall_back_to_none(workspace):
+    dataset = pd.DataFrame({"A": ["a"] * 4 + ["b"] * 4})
+    estimator = KEstimator(synthesis_config_file(dataset, 2, 1))
+
+    # No k rounds the exact count 4 down to 2 (e.g. noisy aggregates)
+    assert estimator.estimate(pd.DataFrame({"selections": ["A:a", "A:b"], "count": [2, 4]}), dataset) is None
+
+    # Nothing is reported
+    assert estimator.estimate(pd.DataFrame({"selections": ["A:a"], "count": [0]})) is None
+
+
+def test_unmatched_selections_estimate_from_the_counts_only(workspace):
+    dataset = pd.DataFrame({"A": ["a"] * 4 + ["b"] * 2})
+    estimator = KEstimator(synthesis_config_file(dataset, 4, 1))
+
+    # Selections formatted differently than the sensitive dataset's values are not matched to its exact counts
+    aggregates = pd.DataFrame({"selections": ["A:x"], "count": [4]})
+    assert estimator.estimate(aggregates, dataset) == [1, 2, 4]
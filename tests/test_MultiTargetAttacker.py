@@ -0,0 +1,22 @@
+import pytest
+from Attackers.MultiTargetAttacker import MultiTargetAttacker
+
+TARGETS = [1, 2, 3, 4, 5, 7, 8]
+
+
+@pytest.mark.parametrize("known_cols", [None, ["PUMA", "AGEP"], ["SEX"]])
+def test_multi_target_attack_matches_single_target_attacks(make_attacker, sample, known_cols):
+    expected, rounds = [], 0
+    for target_index in TARGETS:
+        attacker = make_attacker(sample, 4, leak_prediction=False)
+        initial_rounds = attacker.synthesizer.rounds
+        expected.append(attacker.attack_loop(sensitive_col="MSP", known_cols=known_cols, k_search="linear",
+                                             target_index=target_index))
+        rounds += attacker.synthesizer.rounds - initial_rounds
+
+    attacker = make_attacker(sample, 4, attacker_type=MultiTargetAttacker, leak_prediction=False)
+    initial_rounds = attacker.synthesizer.rounds
+    values, k = attacker.attack_targets("MSP", TARGETS, known_cols=known_cols, k_search="linear")
+
+    assert [(target_values, k) for target_values in values] == expected
+    assert attacker.synthesizer.rounds - initial_rounds < rounds
@@ -0,0 +1,37 @@
+import pytest
+from Attackers.NaiveAttacker import NaiveAttacker
+
+
+def determine_k(make_attacker, sample, k, search):
+    # The k found for the second record, and the number of syntheses used
+    attacker = make_attacker(sample, k, leak_prediction=False)
+    known_data = NaiveAttacker.known_data(attacker.sensitive_dataset_file.read().iloc[1], "MSP")
+    initial_rounds = attacker.synthesizer.rounds
+    found = attacker.determine_k("MSP", known_data, search=search)
+    return found, attacker.synthesizer.rounds - initial_rounds
+
+
+@pytest.mark.parametrize("k", [2, 3, 6, 10, 16, 25])
+def test_binary_search_finds_the_k_of_the_linear_search(make_attacker, sample, k):
+    assert determine_k(make_attacker, sample, k, "binary")[0] == determine_k(make_attacker, sample, k, "linear")[0] == k
+
+
+@pytest.mark.parametrize("k", [10, 16, 25])
+def test_binary_search_uses_fewer_syntheses(make_attacker, sample, k):
+    assert determine_k(make_attacker, sample, k, "binary")[1] < determine_k(make_attacker, sample, k, "linear")[1]
+
+
+@pytest.mark.parametrize("batch_size", [4, 8])
+def test_group_testing_isolates_the_leaking_candidate(make_attacker, sample, batch_size):
+    attacker = make_attacker(sample, 4, leak_prediction=False)
+    known_data = NaiveAttacker.known_data(attacker.sensitive_dataset_file.read().iloc[1], "MSP")
+    k = attacker.determine_k("MSP", known_data, search="linear")
+
+    # A batch of candidates of which only the target's value (2) leaks
+    values = [2.0] + [float(value) for value in range(10, 10 + batch_size - 1)]
+    initial_rounds = attacker.synthesizer.rounds
+    leaked_values = attacker.probe_candidates("MSP", known_data, values, k, batch_size=batch_size)
+
+    # A single leak in the batch is attributed without splitting it
+    assert leaked_values == [2.0]
+    assert attacker.synthesizer.rounds - initial_rounds == 1
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+from Attackers.PayloadBuilder import PayloadBuilder
+
+SENSITIVE_ANALYSIS = pd.DataFrame({"AGEP": [np.dtype("int64")], "SEX": [np.dtype("int64")],
+                                   "PUMA": [np.dtype("object")], "INCP": [np.dtype("float64")]}, index=["type"])
+
+
+def payload_builder():
+    known_data = pd.Series({"AGEP": 42, "SEX": 2, "PUMA": "N", "INCP": 1200}, dtype=object)
+    return PayloadBuilder(SENSITIVE_ANALYSIS, known_data, "AGEP")
+
+
+def test_build_lays_out_repeated_payloads_per_value():
+    block = payload_builder().build([30, 31, 32], 2)
+
+    assert list(block.columns) == ["AGEP", "SEX", "PUMA", "INCP"]
+    assert block["AGEP"].tolist() == [30, 30, 31, 31, 32, 32]
+    assert block.index.tolist() == ["i0", "i1"] * 3
+
+    # Known values are copied with the data types of their columns, unknown values and the sensitive value are not
+    assert block["SEX"].tolist() == [2] * 6
+    assert block["INCP"].tolist() == [1200.0] * 6
+    assert block["PUMA"].isna().all()
+
+
+def test_build_without_values():
+    block = payload_builder().build([], 3)
+
+    assert block.shape == (0, 4)
+
+
+def test_split_yields_a_payload_per_value():
+    block = payload_builder().build([30, 31, 32], 3)
+    payloads = PayloadBuilder.split(block, 3)
+
+    assert len(payloads) == 3
+    for value, payload in zip([30, 31, 32], payloads):
+        assert payload.index.tolist() == ["i0", "i1", "i2"]
+        assert payload["AGEP"].tolist() == [value] * 3
+
+
+def test_blocks_hold_whole_batches(monkeypatch):
+    monkeypatch.setattr(PayloadBuilder, "BLOCK_ROWS", 12)
+    blocks = list(payload_builder().blocks(range(10), 2, multiple=4))
+
+    # At most 12 rows of payloads repeated twice, rounded down to whole batches of 4 values
+    assert [values.tolist() for values, _ in blocks] == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    for values, block in blocks:
+        assert block["AGEP"].tolist() == np.repeat(values, 2).tolist()
+        assert block.index.tolist() == ["i0", "i1"] * len(values)
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+from Utils.ConfigUtil import ConfigUtil
+from Utils.SamplerUtil import SamplerUtil
+
+ROWS = 1000
+
+
+@pytest.fixture
+def sampler(workspace, monkeypatch):
+    """
+    A SamplerUtil streaming chunks of 100 rows from a dataset whose later chunks do not fit the data types of the first;
+        a column outgrowing its range, missing values and text appearing in numerical columns.
+    """
+    positions = np.arange(ROWS)
+    dataset = pd.DataFrame({"AGEP": positions % 50,
+                            "PINCP": np.where(positions < 500, positions % 100, positions * 1000),
+                            "NOC": (positions % 7).astype(object), "DENSITY": positions / 4,
+                            "PUMA": (positions % 3).astype(object), "SEX": np.array(["M", "F"])[positions % 2]})
+    dataset.loc[700, "NOC"] = "N"
+    dataset.loc[800, "PUMA"] = "x"
+    dataset.to_csv(workspace / "dataset.csv", index=False)
+
+    config = ConfigUtil.instance()
+    monkeypatch.setitem(config["SENSITIVE"], "dataset_path", str(workspace / "dataset.csv"))
+    monkeypatch.setitem(config["SENSITIVE"], "chunk_size", "100")
+    return SamplerUtil()
+
+
+def test_streaming_matches_reading_the_whole_dataset(sampler):
+    expected = sampler.sample(n=ROWS, streaming=False, cache=False, seed=0).sort_index()
+    sample = sampler.sample(n=ROWS, streaming=True, cache=False, seed=0).sort_index()
+
+    pd.testing.assert_frame_equal(sample, expected, check_index_type=False)
+
+
+def test_streaming_compact_sample(sampler):
+    sample = sampler.sample(n=ROWS, streaming=True, cache=False, compact=True, seed=0)
+
+    assert sample["AGEP"].dtype == np.int8
+    assert sample["DENSITY"].dtype == np.float32
+    assert isinstance(sample["SEX"].dtype, pd.CategoricalDtype)
+    assert sample["NOC"].isna().sum() == 1
+    assert (sample["PUMA"] == "x").sum() == 1
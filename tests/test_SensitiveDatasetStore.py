@@ -0,0 +1,61 @@
+import pandas as pd
+import pytest
+from File.SensitiveDatasetFile import SensitiveDatasetFile
+from File.SensitiveDatasetStore import SensitiveDatasetStore
+
+
+def dataset(ages, sex):
+    return pd.DataFrame({"AGEP": ages, "SEX": [sex] * len(ages)}, index=pd.RangeIndex(len(ages), name="ID"))
+
+
+def expected(*datasets):
+    return pd.concat(datasets).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("in_memory", [True, False])
+def test_rollback_restores_the_exact_version(workspace, in_memory):
+    base = dataset([20, 30, 40], "M")
+    sensitive_dataset_file = SensitiveDatasetFile(in_memory=in_memory)
+    sensitive_dataset_file.write(base)
+    store = SensitiveDatasetStore(sensitive_dataset_file)
+
+    # Keep a running total of the rows the subscriber is told about
+    rows = [base.shape[0]]
+    store.subscribe(lambda added, removed: rows.append(rows[-1] + sum(map(len, added)) - sum(map(len, removed))))
+
+    deltas = [dataset([50 + i, 60 + i], "F") for i in range(3)]
+    base_checkpoint = store.checkpoint()
+    store.apply(deltas[0])
+    store.materialize()
+    checkpoint = store.checkpoint()
+    store.apply(deltas[1])
+    store.apply(deltas[2])
+
+    # Deltas are only written on materialization, which matches the concatenation of the base and the deltas
+    pd.testing.assert_frame_equal(sensitive_dataset_file.read(), expected(base, deltas[0]))
+    store.materialize()
+    pd.testing.assert_frame_equal(sensitive_dataset_file.read(), expected(base, *deltas))
+    assert store.rows == 6 and rows[-1] == 9
+
+    store.rollback(checkpoint)
+    store.materialize()
+    pd.testing.assert_frame_equal(sensitive_dataset_file.read(), expected(base, deltas[0]))
+
+    # A delta applied after a rollback replaces the rolled back ones
+    store.apply(deltas[2])
+    store.materialize()
+    pd.testing.assert_frame_equal(sensitive_dataset_file.read(), expected(base, deltas[0], deltas[2]))
+
+    store.rollback(base_checkpoint)
+    store.materialize()
+    pd.testing.assert_frame_equal(sensitive_dataset_file.read(), expected(base))
+    assert store.rows == 0 and rows[-1] == 3
+
+
+def test_rollback_ahead_of_the_current_version_raises(workspace):
+    sensitive_dataset_file = SensitiveDatasetFile(in_memory=True)
+    sensitive_dataset_file.write(dataset([20], "M"))
+    store = SensitiveDatasetStore(sensitive_dataset_file)
+
+    with pytest.raises(ValueError):
+        store.rollback(1)
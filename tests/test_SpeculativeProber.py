@@ -0,0 +1,26 @@
+import os
+from Utils.ProfilerUtil import ProfilerUtil
+from Utils.WorkspaceUtil import WorkspaceUtil
+from Attackers.SpeculativeProber import SpeculativeProber
+
+
+def test_speculative_probing_counts_every_synthesis(make_attacker, sample):
+    profiler = ProfilerUtil.instance()
+    expected = make_attacker(sample, 4, speculative_workers=1, leak_prediction=False).attack_loop(
+        sensitive_col="MSP", k_search="linear", target_index=1)
+
+    attacker = make_attacker(sample, 4, speculative_workers=2, leak_prediction=False)
+    initial_rounds = attacker.synthesizer.rounds
+    profiler.reset()
+    result = attacker.attack_loop(sensitive_col="MSP", k_search="linear", target_index=1)
+
+    assert result == expected == ([2.0], 4)
+
+    # The syntheses of the workers, including the initial synthesis of each worker given a task, are counted
+    workers = os.listdir(os.path.join(WorkspaceUtil.root_dir(), "Speculation_test"))
+    counters = profiler.summary()["counters"]
+    assert counters["speculative_syntheses"] >= len(workers) > 0
+    assert attacker.synthesizer.rounds - initial_rounds == counters["syntheses"] + counters["speculative_syntheses"]
+
+    # The sensitive dataset handed to the workers is removed once probing is done
+    assert SpeculativeProber.SENSITIVE_DATASET_FILENAME not in workers
@@ -0,0 +1,68 @@
+import os
+import pandas as pd
+from Utils.ProfilerUtil import ProfilerUtil
+from File.SensitiveDatasetFile import SensitiveDatasetFile
+from File.SyntheticDatasetFile import SyntheticDatasetFile
+from File.SynthesisConfigFile import SynthesisConfigFile
+from Synthesizers.KAnonymitySynthesizer import KAnonymitySynthesizer
+from Synthesizers.SynthesisCache import SynthesisCache
+
+
+def write_entry(size):
+    def write(directory):
+        with open(os.path.join(directory, "synthetic_microdata.tsv"), "wb") as file:
+            file.write(b"0" * size)
+    return write
+
+
+def test_keys_ignore_paths(tmp_path):
+    cache = SynthesisCache(cache_dir=str(tmp_path))
+    synthesis_config = {"reporting_resolution": 4, "synthesis_mode": "row_seeded", "output_dir": "/a", "prefix": "a"}
+
+    key = cache.key("KAnonymitySynthesizer", "fingerprint", synthesis_config)
+    assert key == cache.key("KAnonymitySynthesizer", "fingerprint", dict(synthesis_config, output_dir="/b", prefix="b"))
+    assert key != cache.key("KAnonymitySynthesizer", "fingerprint", dict(synthesis_config, reporting_resolution=5))
+    assert key != cache.key("KAnonymitySynthesizer", "other", synthesis_config)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    # A budget of 2.5 entries of 1 KiB
+    cache = SynthesisCache(cache_dir=str(tmp_path), max_size_mb=2.5 / 1024)
+    assert cache.get("a") is None
+
+    cache.put("a", write_entry(1024))
+    cache.put("b", write_entry(1024))
+    for time, key in enumerate(["a", "b"]):
+        os.utime(os.path.join(str(tmp_path), key), (time, time))
+
+    # Using a makes b the least recently used entry
+    assert os.listdir(cache.get("a")) == ["synthetic_microdata.tsv"]
+    cache.put("c", write_entry(1024))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+
+def synthesize(sample, cache):
+    sensitive_dataset_file = SensitiveDatasetFile(in_memory=True)
+    synthetic_dataset_file = SyntheticDatasetFile(in_memory=True)
+    sensitive_dataset_file.write(sample)
+    synthesizer = KAnonymitySynthesizer(SynthesisConfigFile(sensitive_dataset_file, synthetic_dataset_file))
+    synthesizer.synthesis_config_file.write({"reporting_resolution": 4, "synthesis_mode": "row_seeded"})
+    synthesizer.synthesize(aggregate=True, generate=True, cache=cache)
+    return synthetic_dataset_file.read(), synthesizer.aggregates()
+
+
+def test_identical_syntheses_are_restored(workspace, sample):
+    profiler = ProfilerUtil.instance()
+    cache = SynthesisCache(cache_dir=str(workspace / "cache"))
+    profiler.reset()
+
+    synthetic_dataset, aggregates = synthesize(sample, cache)
+    cached_synthetic_dataset, cached_aggregates = synthesize(sample, cache)
+    synthesize(sample.iloc[1:], cache)
+
+    counters = profiler.summary()["counters"]
+    assert counters["syntheses"] == 2 and counters["synthesis_cache_hits"] == 1
+    pd.testing.assert_frame_equal(cached_synthetic_dataset, synthetic_dataset)
+    pd.testing.assert_frame_equal(cached_aggregates, aggregates)
@@ -0,0 +1,64 @@
+import os
+import time
+import pytest
+from Synthesizers.SynthesisService import SynthesisService
+
+
+def write_pid(synthesis_config):
+    with open(os.path.join(synthesis_config["output_dir"], "pid"), "a") as file:
+        file.write(str(os.getpid()) + "\n")
+
+
+def hang_once(synthesis_config):
+    started = os.path.join(synthesis_config["output_dir"], "started")
+    if not os.path.exists(started):
+        open(started, "w").close()
+        time.sleep(60)
+    write_pid(synthesis_config)
+
+
+def fail(synthesis_config):
+    raise ValueError("unknown synthesis_mode")
+
+
+@pytest.fixture
+def synthesis_config(tmp_path):
+    return {"output_dir": str(tmp_path)}
+
+
+def read_pids(synthesis_config):
+    with open(os.path.join(synthesis_config["output_dir"], "pid")) as file:
+        return [int(pid) for pid in file.read().split()]
+
+
+def test_runs_reuse_the_worker(synthesis_config):
+    service = SynthesisService(write_pid, timeout=10, retries=0)
+    try:
+        service.run(synthesis_config)
+        service.run(synthesis_config)
+    finally:
+        service.close()
+
+    pids = read_pids(synthesis_config)
+    assert len(pids) == 2 and pids[0] == pids[1] != os.getpid()
+
+
+def test_run_exceeding_the_timeout_is_retried_on_a_restarted_worker(synthesis_config):
+    service = SynthesisService(hang_once, timeout=0.5, retries=1)
+    start = time.perf_counter()
+    try:
+        service.run(synthesis_config)
+    finally:
+        service.close()
+
+    assert time.perf_counter() - start < 30
+    assert len(read_pids(synthesis_config)) == 1
+
+
+def test_failing_run_raises_after_every_retry(synthesis_config):
+    service = SynthesisService(fail, timeout=10, retries=2)
+    try:
+        with pytest.raises(RuntimeError, match="all 3 attempts; ValueError"):
+            service.run(synthesis_config)
+    finally:
+        service.close()
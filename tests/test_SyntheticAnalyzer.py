@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+from Utils.ConfigUtil import ConfigUtil
+from Utils.ProfilerUtil import ProfilerUtil
+from File.SyntheticDatasetFile import SyntheticDatasetFile
+from Analyzers.SyntheticAnalyzer import SyntheticAnalyzer
+
+
+@pytest.fixture
+def payloads(workspace):
+    # A resynthesized synthetic dataset of 100 rows, with missing values as SDS leaves them (empty in the TSV)
+    positions = np.arange(100)
+    synthetic_dataset = pd.DataFrame({"PUMA": positions % 10, "AGEP": positions,
+                                      "MSP": np.where(positions % 3 == 0, np.nan, positions % 5 + 1.0),
+                                      "SEX": np.where(positions % 4 == 0, None, np.array(["M", "F"])[positions % 2])})
+    SyntheticDatasetFile().write(synthetic_dataset, is_resynthesis=True)
+
+    # Rows of the first and last chunks, rows with missing values, and rows absent from the synthetic dataset
+    present = synthetic_dataset.iloc[[0, 1, 3, 4, 50, 99]]
+    absent = pd.concat([synthetic_dataset.iloc[[1]].assign(MSP=np.nan), synthetic_dataset.iloc[[3]].assign(MSP=2.0),
+                        synthetic_dataset.iloc[[4]].assign(SEX="F"), synthetic_dataset.iloc[[5]].assign(AGEP=100)])
+    rows = pd.concat([present, absent])
+    return [rows.iloc[[index]] for index in range(rows.shape[0])], [True] * present.shape[0] + [False] * 4
+
+
+@pytest.mark.parametrize("memory_map", [False, True])
+def test_chunked_scan_matches_the_index(payloads, monkeypatch, memory_map):
+    payloads, expected = payloads
+    config = ConfigUtil.instance()
+    monkeypatch.setitem(config["SYNTHETIC"], "chunk_size", "7")
+    monkeypatch.setitem(config["SYNTHETIC"], "memory_map", str(memory_map))
+    profiler = ProfilerUtil.instance()
+    profiler.reset()
+
+    # A fresh file, such that the synthetic dataset is read from the TSV rather than from memory
+    indexed = SyntheticAnalyzer(SyntheticDatasetFile(), streaming=False).analyze_batch(payloads)
+    scanned = SyntheticAnalyzer(SyntheticDatasetFile(), streaming=True).analyze_batch(payloads)
+
+    assert scanned == indexed == expected
+    assert profiler.summary()["counters"]["leak_scan_chunks"] == 15
+
+
+def test_chunked_scan_stops_once_every_payload_is_found(payloads, monkeypatch):
+    payloads, _ = payloads
+    monkeypatch.setitem(ConfigUtil.instance()["SYNTHETIC"], "chunk_size", "7")
+    profiler = ProfilerUtil.instance()
+    profiler.reset()
+
+    # The payloads of the first chunk are found without reading further chunks
+    assert SyntheticAnalyzer(SyntheticDatasetFile(), streaming=True).analyze_batch(payloads[:4]) == [True] * 4
+    assert profiler.summary()["counters"]["leak_scan_chunks"] == 1